@@ -0,0 +1,362 @@
+"""
+Benchmarks for how type resolution and interface rendering scale with the
+size and depth of schemas.
+
+Results are printed, and can be saved as JSON for comparing commits:
+
+    python benchmarks/run_benchmarks.py --output results.json
+    python benchmarks/run_benchmarks.py --compare results.json
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals  # isort:skip # noqa
+
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Optional, Tuple, Union
+
+ROOT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+sys.path.insert(0, ROOT_DIRECTORY)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'settings')
+
+from python_to_typescript.base import generate_interfaces, type_name  # noqa # isort:skip
+
+# The sizes each benchmark is run with by default.
+DEFAULT_SIZES = (10, 100, 1000)
+
+# Modules to measure the time for importing in a new interpreter.
+IMPORT_MODULES = (
+    'python_to_typescript.base',
+    'python_to_typescript.cli',
+    'python_to_typescript.drf',
+)
+
+
+def deep_type(depth):
+    """
+    Build a type nested `depth` levels deep, mixing every generic type.
+    """
+    some_type = int
+
+    for level in range(depth):
+        kind = level % 4
+
+        if kind == 0:
+            some_type = List[some_type]
+        elif kind == 1:
+            some_type = Optional[some_type]
+        elif kind == 2:
+            some_type = Union[some_type, str, Tuple[int, str]]
+        else:
+            some_type = Dict[str, some_type]
+
+    return some_type
+
+
+FIELD_TYPES = (
+    int,
+    str,
+    bool,
+    float,
+    Optional[str],
+    List[int],
+    Dict[str, List[Optional[int]]],
+    Union[int, str, None],
+    Tuple[int, str],
+    'SomeInterface',
+)
+
+
+def wide_interfaces(size):
+    """
+    Build `size` interfaces with `size` fields each.
+    """
+    return [
+        ('Interface{}'.format(index), {
+            'field_{}'.format(field_index): FIELD_TYPES[
+                (index + field_index) % len(FIELD_TYPES)
+            ]
+            for field_index in range(size)
+        })
+        for index in range(size)
+    ]
+
+
+def serializer_classes(size):
+    """
+    Build `size` DRF serializer classes, each nesting the one before it.
+    """
+    import django
+    from rest_framework import serializers
+
+    django.setup()
+
+    classes = []
+
+    for index in range(size):
+        attributes = {
+            'name': serializers.CharField(),
+            'count': serializers.IntegerField(allow_null=True),
+            'ratio': serializers.FloatField(),
+            'tags': serializers.ListField(child=serializers.CharField()),
+            'flag': serializers.BooleanField(),
+        }
+
+        if classes:
+            attributes['parent'] = classes[-1](allow_null=True)
+
+        classes.append(type(
+            str('Generated{}Serializer'.format(index)),
+            (serializers.Serializer,),
+            attributes,
+        ))
+
+    return classes
+
+
+def _clear_caches():
+    type_name.cache_clear()
+
+    if 'python_to_typescript.drf' in sys.modules:
+        sys.modules['python_to_typescript.drf'].clear_serializer_cache()
+
+
+def measure(func, repeat):
+    """
+    Run a function several times with cold caches, and return the fastest
+    time in seconds and the peak memory allocated in bytes.
+    """
+    times = []
+
+    for _ in range(repeat):
+        _clear_caches()
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    _clear_caches()
+    tracemalloc.start()
+
+    try:
+        func()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return min(times), peak_bytes
+
+
+def _benchmark_type_name(size):
+    some_type = deep_type(size // 10 or 1)
+
+    return lambda: type_name(some_type)
+
+
+def _benchmark_type_name_warm(size):
+    types = [FIELD_TYPES[index % len(FIELD_TYPES)] for index in range(size)]
+
+    def run():
+        for _ in range(10):
+            for some_type in types:
+                type_name(some_type)
+
+    return run
+
+
+def _benchmark_generate_interfaces(size):
+    python_types = wide_interfaces(size // 10 or 1)
+
+    return lambda: generate_interfaces(python_types)
+
+
+def _benchmark_deep_interfaces(size):
+    python_types = [
+        ('Deep{}'.format(depth), {'value': deep_type(depth)})
+        for depth in range(1, size // 10 + 2)
+    ]
+
+    return lambda: generate_interfaces(python_types)
+
+
+def _benchmark_serializers(size):
+    from python_to_typescript.drf import generate_interfaces_from_serializers
+
+    classes = serializer_classes(size)
+
+    return lambda: generate_interfaces_from_serializers(classes)
+
+
+BENCHMARKS = [
+    ('type_name_deep', _benchmark_type_name),
+    ('type_name_warm', _benchmark_type_name_warm),
+    ('generate_interfaces_wide', _benchmark_generate_interfaces),
+    ('generate_interfaces_deep', _benchmark_deep_interfaces),
+    ('generate_interfaces_from_serializers', _benchmark_serializers),
+]
+
+
+def import_time(module_name, repeat):
+    """
+    Import a module in a new interpreter several times, and return the
+    fastest time in seconds for the import, as reported by
+    `python -X importtime`.
+    """
+    times = []
+
+    for _ in range(repeat):
+        output = subprocess.run(
+            [
+                sys.executable,
+                '-X',
+                'importtime',
+                '-c',
+                'import ' + module_name,
+            ],
+            cwd=ROOT_DIRECTORY,
+            stderr=subprocess.PIPE,
+            check=True,
+        ).stderr.decode('utf-8')
+
+        # Lines look like "import time: self | cumulative | name", in
+        # microseconds.
+        for line in output.splitlines():
+            _, cumulative, name = line.rsplit('|', 2)
+
+            if name.strip() == module_name:
+                times.append(int(cumulative) / 1000000)
+
+    return min(times)
+
+
+def run_import_benchmarks(repeat):
+    results = []
+
+    for module_name in IMPORT_MODULES:
+        seconds = import_time(module_name, repeat)
+        results.append({
+            'name': 'import ' + module_name,
+            'size': 0,
+            'seconds': seconds,
+            'peak_bytes': 0,
+        })
+        print('{:<40} {:>6} {:>12.6f}s'.format(
+            'import ' + module_name,
+            0,
+            seconds,
+        ))
+
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'],
+            cwd=ROOT_DIRECTORY,
+        ).decode('utf-8').strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(sizes, repeat, names=None):
+    results = []
+
+    for name, make_benchmark in BENCHMARKS:
+        if names and name not in names:
+            continue
+
+        for size in sizes:
+            seconds, peak_bytes = measure(make_benchmark(size), repeat)
+            results.append({
+                'name': name,
+                'size': size,
+                'seconds': seconds,
+                'peak_bytes': peak_bytes,
+            })
+            print('{:<40} {:>6} {:>12.6f}s {:>12} bytes'.format(
+                name,
+                size,
+                seconds,
+                peak_bytes,
+            ))
+
+    return results
+
+
+def compare(results, old_results):
+    old_by_key = {
+        (result['name'], result['size']): result
+        for result in old_results
+    }
+
+    print('\n{:<40} {:>6} {:>10} {:>10}'.format(
+        'benchmark',
+        'size',
+        'time',
+        'memory',
+    ))
+
+    for result in results:
+        old_result = old_by_key.get((result['name'], result['size']))
+
+        if old_result:
+            print('{:<40} {:>6} {:>9.2f}x {:>9.2f}x'.format(
+                result['name'],
+                result['size'],
+                result['seconds'] / max(old_result['seconds'], 1e-9),
+                result['peak_bytes'] / max(old_result['peak_bytes'], 1),
+            ))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument(
+        '--sizes',
+        default=','.join(str(size) for size in DEFAULT_SIZES),
+        help='Comma separated schema sizes to run each benchmark with.',
+    )
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument(
+        '--benchmark',
+        action='append',
+        dest='names',
+        choices=[name for name, _ in BENCHMARKS],
+        help='Run only the named benchmarks.',
+    )
+    parser.add_argument(
+        '--imports',
+        action='store_true',
+        help='Also measure the time for importing modules.',
+    )
+    parser.add_argument('--output', help='Save the results as JSON.')
+    parser.add_argument('--compare', help='A JSON file to compare with.')
+    options = parser.parse_args(argv)
+
+    sizes = [int(size) for size in options.sizes.split(',')]
+    results = run_benchmarks(sizes, options.repeat, options.names)
+
+    if options.imports:
+        results += run_import_benchmarks(options.repeat)
+
+    if options.compare:
+        with open(options.compare) as old_file:
+            compare(results, json.load(old_file)['results'])
+
+    if options.output:
+        with open(options.output, 'w') as output_file:
+            json.dump({
+                'commit': _git_commit(),
+                'python': platform.python_version(),
+                'results': results,
+            }, output_file, indent=2, sort_keys=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+"""
+An asyncio API for generating TypeScript interfaces without blocking an
+event loop, for serving generated types from ASGI apps.
+
+For example:
+>>> service = InterfaceService()
+>>> result = await service.generate([SomeSerializer])
+>>> if result.matches(request.headers.get('if-none-match')):
+...     # Respond with 304 Not Modified
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals  # isort:skip # noqa
+
+import functools
+import hashlib
+from collections import namedtuple
+
+from .cache import MISSING, LRUCache
+
+try:
+    import asyncio
+except ImportError:  # pragma: no cover
+    asyncio = None
+
+_GeneratedTypesBase = namedtuple('GeneratedTypes', ['text', 'etag'])
+
+
+class GeneratedTypes(_GeneratedTypesBase):
+    """
+    The text of generated TypeScript, and a strong ETag for it.
+    """
+    __slots__ = ()
+
+    def matches(self, if_none_match):
+        """
+        Check if the value of an If-None-Match header matches the ETag, so
+        a 304 Not Modified response can be sent instead of the text.
+        """
+        if not if_none_match:
+            return False
+
+        tags = [tag.strip() for tag in if_none_match.split(',')]
+
+        # Weak comparison is used for If-None-Match.
+        return '*' in tags or any(
+            (tag[2:] if tag.startswith('W/') else tag) == self.etag
+            for tag in tags
+        )
+
+
+def etag(text):
+    """
+    Return a strong ETag for some text.
+    """
+    return '"' + hashlib.sha1(text.encode('utf-8')).hexdigest() + '"'
+
+
+def _generate_interfaces_from_serializers(serializer_classes, options):
+    from .drf import generate_interfaces_from_serializers
+
+    return generate_interfaces_from_serializers(
+        serializer_classes,
+        options=options,
+    )
+
+
+class InterfaceService(object):
+    """
+    Generate interfaces in an executor, returning futures which can be
+    awaited in an event loop.
+
+    Concurrent requests for the same serializer classes and options are
+    coalesced into one computation, and results are cached, so many
+    requests at once cost one generation. Cancelling one request doesn't
+    cancel the computation for the others.
+
+    `generate(serializer_classes, options)` returns text, and defaults to
+    drf.generate_interfaces_from_serializers. `executor` is passed to
+    loop.run_in_executor, where None means the default executor.
+    """
+    def __init__(self, executor=None, generate=None, maxsize=128):
+        self.executor = executor
+        self._generate = generate or _generate_interfaces_from_serializers
+        self._pending = {}
+        self._results = LRUCache(maxsize)
+
+    def _compute(self, serializer_classes, options):
+        text = self._generate(serializer_classes, options)
+
+        return GeneratedTypes(text, etag(text))
+
+    def _finished(self, key, future):
+        del self._pending[key]
+
+        if not future.cancelled() and future.exception() is None:
+            self._results.set(key, future.result())
+
+    def generate(self, serializer_classes, options=None, loop=None):
+        """
+        Return a future for GeneratedTypes for serializer classes, and
+        every serializer nested inside of them.
+        """
+        if loop is None:
+            loop = asyncio.get_event_loop()
+
+        key = (tuple(serializer_classes), options)
+        result = self._results.get(key)
+
+        if result is not MISSING:
+            future = loop.create_future()
+            future.set_result(result)
+
+            return future
+
+        future = self._pending.get(key)
+
+        if future is None:
+            future = self._pending[key] = loop.run_in_executor(
+                self.executor,
+                self._compute,
+                key[0],
+                options,
+            )
+            future.add_done_callback(functools.partial(self._finished, key))
+
+        return asyncio.shield(future)
+
+    def clear(self):
+        """
+        Forget every cached result, such as after serializers change.
+        """
+        self._results.clear()
+
+
+# The service used by generate_interfaces_from_serializers_async.
+default_service = InterfaceService()
+
+
+def generate_interfaces_from_serializers_async(serializer_classes,
+                                               options=None):
+    """
+    Return a future for GeneratedTypes for serializer classes, generated
+    in the default executor with the default InterfaceService.
+    """
+    return default_service.generate(serializer_classes, options)
@@ -4,9 +4,33 @@ Basic functions for generating TypeScript interfaces from Python types.
 from __future__ import absolute_import, division, print_function, unicode_literals  # isort:skip # noqa
 
 import itertools
-from typing import Mapping, Sequence, Set, Tuple, Union
+import re
+import types
+import typing
+from collections import namedtuple
+from typing import Tuple, Union
 
 import six
+from six.moves import copyreg
+
+try:
+    from typing import ForwardRef
+except ImportError:  # pragma: no cover
+    from typing import _ForwardRef as ForwardRef
+
+try:
+    from collections.abc import Mapping, Sequence, Set
+except ImportError:  # pragma: no cover
+    from collections import Mapping, Sequence, Set
+
+try:
+    import enum
+except ImportError:  # pragma: no cover
+    enum = None
+
+from . import ir, profiling
+from .cache import MISSING, LRUCache, memoize
+from .registry import TypeRegistry
 
 NUMBER_TYPES = (int, float)
 
@@ -14,6 +38,15 @@ if six.PY2:  # pragma: no cover
     NUMBER_TYPES += (long,)  # noqa
 
 
+def _reduce_forward_ref(forward_ref):
+    return (ForwardRef, (forward_ref.__forward_arg__,))
+
+
+# Schemas contain names like List['Tag'], and ForwardRef objects hold
+# compiled code which cannot be pickled, so pickle them by name instead.
+copyreg.pickle(ForwardRef, _reduce_forward_ref)
+
+
 class JSONTypeClass(object):
     pass
 
@@ -22,6 +55,37 @@ class JSONTypeClass(object):
 JSON_TYPE = JSONTypeClass()
 
 
+class OptionalMember(object):
+    """
+    A wrapper for the type of a member which can be left out of an object.
+    Optional members are rendered as `name?: type` when enabled in
+    RenderOptions, and the type is otherwise used as it is.
+    """
+    __slots__ = ('type',)
+
+    def __init__(self, type_or_tuple):
+        self.type = type_or_tuple
+
+    def __eq__(self, other):
+        return isinstance(other, OptionalMember) and self.type == other.type
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((OptionalMember, self.type))
+
+    def __repr__(self):
+        return 'OptionalMember({!r})'.format(self.type)
+
+    def __reduce__(self):
+        return (OptionalMember, (self.type,))
+
+
+# The maximum number of types remembered by type_node.
+TYPE_NAME_CACHE_SIZE = 4096
+
+
 def uniq(iterable, key=None):
     """
     Generate items where subsequent duplicates are eliminated.
@@ -40,75 +104,533 @@ def group_type(type_string):
     )
 
 
-def _get_type_name_list(type_or_tuple):
-    name_list = []
+if hasattr(typing, 'get_origin'):
+    get_origin = typing.get_origin
+    get_args = typing.get_args
+else:  # pragma: no cover
+    def get_origin(some_type):
+        return getattr(some_type, '__origin__', None)
+
+    def get_args(some_type):
+        return getattr(some_type, '__args__', None) or ()
+
+
+def _type_node_for_arg(args, index):
+    return type_node(args[index]) if len(args) > index else ir.ANY
+
+
+def _nodes_for_union(some_type):
+    return [
+        node
+        for union_type in get_args(some_type)
+        for node in _type_nodes(union_type)
+    ]
+
+
+def _node_for_tuple(some_type):
+    args = get_args(some_type)
+
+    # Tuple[int, ...] is a tuple of any length.
+    if len(args) == 2 and args[1] is Ellipsis:
+        return [ir.Array(type_node(args[0]))]
+
+    return [ir.Tuple(*(type_node(x) for x in args))]
+
+
+def _node_for_sequence(some_type):
+    return [ir.Array(_type_node_for_arg(get_args(some_type), 0))]
+
+
+def _node_for_mapping(some_type):
+    # The key type always has to be a number or string for JS.
+    # Serialized as JSON, we'll only ever have strings as keys.
+    return [ir.Map(_type_node_for_arg(get_args(some_type), 1))]
+
+
+def _nodes_for_literal(some_type):
+    return [
+        ir.literal(value.value if isinstance(value, enum.Enum) else value)
+        for value in get_args(some_type)
+    ]
+
+
+def _nodes_for_annotated(some_type):
+    return _type_nodes(get_args(some_type)[0])
+
+
+def _constant_node(node):
+    return lambda some_type: [node]
+
+
+_node_for_any = _constant_node(ir.ANY)
+
+# Handlers for generic types like List[int], looked up by their origin.
+_generic_handlers = TypeRegistry()
+_generic_handlers.register(Union, _nodes_for_union)
+_generic_handlers.register(Tuple, _node_for_tuple)
+_generic_handlers.register(tuple, _node_for_tuple)
+_generic_handlers.register(list, _node_for_sequence)
+_generic_handlers.register(set, _node_for_sequence)
+_generic_handlers.register(frozenset, _node_for_sequence)
+_generic_handlers.register(dict, _node_for_mapping)
+_generic_handlers.register(Sequence, _node_for_sequence)
+_generic_handlers.register(Set, _node_for_sequence)
+_generic_handlers.register(Mapping, _node_for_mapping)
+
+# X | Y unions, from PEP 604.
+if hasattr(types, 'UnionType'):  # pragma: no branch
+    _generic_handlers.register(types.UnionType, _nodes_for_union)
+
+if hasattr(typing, 'Literal'):  # pragma: no branch
+    _generic_handlers.register(typing.Literal, _nodes_for_literal)
+
+if hasattr(typing, 'Annotated'):  # pragma: no branch
+    _generic_handlers.register(typing.Annotated, _nodes_for_annotated)
+
+
+def _is_typed_dict(some_type):
+    return issubclass(some_type, dict) and hasattr(some_type, '__total__')
+
+
+def _is_dataclass(some_type):
+    # This is what dataclasses.is_dataclass checks, without importing
+    # dataclasses, which is slow to import, for code which doesn't use it.
+    return hasattr(some_type, '__dataclass_fields__')
+
+
+def _is_attrs_class(some_type):
+    # attrs doesn't need to be imported to recognise attrs classes.
+    return hasattr(some_type, '__attrs_attrs__')
+
+
+def _is_enum(some_type):
+    return enum is not None and issubclass(some_type, enum.Enum)
+
+
+def _node_for_class_reference(some_type):
+    return [ir.Reference(some_type.__name__)]
+
+
+def _nodes_for_enum(some_type):
+    return [ir.literal(member.value) for member in some_type]
+
+
+def _node_for_tuple_class(some_type):
+    field_names = getattr(some_type, '_fields', None)
+
+    if field_names is None:
+        return [ir.ANY]
+
+    # NamedTuples are serialized as JSON arrays.
+    try:
+        hints = typing.get_type_hints(some_type)
+    except (NameError, TypeError):
+        hints = getattr(some_type, '__annotations__', {})
+
+    return [ir.Tuple(*(
+        type_node(hints[name]) if name in hints else ir.ANY
+        for name in field_names
+    ))]
+
+
+# Handlers for classes, like int or str.
+_type_handlers = TypeRegistry()
+# Classes like TypedDicts and dataclasses become interfaces, and their
+# interfaces are referenced by name.
+_type_handlers.register_predicate(_is_typed_dict, _node_for_class_reference)
+_type_handlers.register_predicate(_is_dataclass, _node_for_class_reference)
+_type_handlers.register_predicate(_is_attrs_class, _node_for_class_reference)
+_type_handlers.register_predicate(_is_enum, _nodes_for_enum)
+_type_handlers.register(type(None), _constant_node(ir.NULL))
+_type_handlers.register(six.binary_type, _constant_node(ir.STRING))
+_type_handlers.register(six.text_type, _constant_node(ir.STRING))
+_type_handlers.register(bool, _constant_node(ir.BOOLEAN))
+
+for _number_type in NUMBER_TYPES:
+    _type_handlers.register(_number_type, _constant_node(ir.NUMBER))
+
+_type_handlers.register(list, _constant_node(ir.Array(ir.ANY)))
+_type_handlers.register(dict, _constant_node(ir.OBJECT))
+_type_handlers.register(tuple, _node_for_tuple_class)
+
+# Handlers for values which aren't types, like names for other interfaces.
+_value_handlers = TypeRegistry()
+_value_handlers.register(type(None), _constant_node(ir.NULL))
+_value_handlers.register(
+    six.binary_type,
+    lambda some_type: [ir.name_node(some_type.decode('utf-8'))],
+)
+_value_handlers.register(
+    six.text_type,
+    lambda some_type: [ir.name_node(some_type)],
+)
+_value_handlers.register(
+    OptionalMember,
+    lambda some_type: _type_nodes(some_type.type),
+)
+# ir nodes can be used as types directly, such as for types read from schemas.
+_value_handlers.register(ir.TypeNode, lambda some_type: [some_type])
+# Names used inside generic types, like List['SomeName'], become ForwardRefs.
+_value_handlers.register(
+    ForwardRef,
+    lambda some_type: [ir.name_node(some_type.__forward_arg__)],
+)
+
+
+def register_type_handler(python_type, handler):
+    """
+    Register a function for naming python_type and its subclasses in
+    TypeScript. handler(some_type) must return a list of ir nodes, or
+    strings naming types.
+
+    For example:
+    >>> register_type_handler(Decimal, lambda some_type: ['string'])
+    """
+    _type_handlers.register(python_type, handler)
+    type_node.cache_clear()
+
+
+def register_generic_handler(origin, handler):
+    """
+    Register a function for naming generic types with the given origin,
+    such as list for List[int]. handler(some_type) must return a list of
+    ir nodes or strings naming types, and can read the type arguments
+    with get_args(some_type).
+    """
+    _generic_handlers.register(origin, handler)
+    type_node.cache_clear()
+
+
+def _handler_for_type(some_type):
+    origin = get_origin(some_type)
+
+    if origin is not None:
+        return _generic_handlers.resolve(origin, _node_for_any)
+
+    if isinstance(some_type, type):
+        return _type_handlers.resolve(some_type, _node_for_any)
+
+    return _value_handlers.resolve(type(some_type), _node_for_any)
+
+
+def _type_nodes(type_or_tuple):
     field_types = (
         type_or_tuple
         if isinstance(type_or_tuple, tuple) else
         (type_or_tuple,)
     )
 
-    for some_type in field_types:
-        if some_type is None or some_type is type(None): # noqa
-            name_list.append('null')
-        elif getattr(some_type, '__origin__', None) is Union:
-            for union_type in some_type.__args__:
-                name_list.extend(_get_type_name_list(union_type))
-        elif issubclass(getattr(some_type, '__origin__', type), Tuple):
-            tuple_types = (type_name(x) for x in some_type.__args__)
-            name_list.append('[{}]'.format(', '.join(tuple_types)))
-        elif issubclass(getattr(some_type, '__origin__', type), Sequence):
-            name_list.append(
-                group_type(type_name(some_type.__args__[0])) + '[]'
+    return [
+        node if isinstance(node, ir.TypeNode) else ir.name_node(node)
+        for some_type in field_types
+        for node in _handler_for_type(some_type)(some_type)
+    ]
+
+
+@memoize(TYPE_NAME_CACHE_SIZE)
+def type_node(type_or_tuple):
+    """
+    Given some Python type or a string for naming another TypeScript
+    interface, return an ir node representing the type.
+
+    Results are kept in an LRU cache. Use `type_node.cache_info()` to
+    inspect it, `type_node.cache_clear()` to empty it, and
+    `type_node.cache_resize(maxsize)` to change its size.
+    """
+    return ir.union(_type_nodes(type_or_tuple))
+
+
+def type_name(type_or_tuple):
+    """
+    Given some Python type or a string for naming another TypeSscript
+    interface, return a string representing the type in TypeScript.
+    """
+    return ir.render(type_node(type_or_tuple))
+
+
+# The cache for type_node is the cache for type names.
+type_name.cache_info = type_node.cache_info
+type_name.cache_clear = type_node.cache_clear
+type_name.cache_resize = type_node.cache_resize
+
+profiling.register_cache('type_name', type_node.cache_info)
+
+
+_RenderOptionsBase = namedtuple('RenderOptions', [
+    'indentation',
+    'newline',
+    'export',
+    'readonly',
+    'optional_members',
+    'max_union_width',
+])
+
+
+class RenderOptions(_RenderOptionsBase):
+    """
+    Options for the format of generated TypeScript.
+
+    indentation - The number of spaces to indent members with.
+    newline - The text to end lines with.
+    export - Write `export interface` and `export type`.
+    readonly - Write every member as `readonly`.
+    optional_members - Write members with OptionalMember types as `name?:`.
+    max_union_width - Replace unions with more members than this, not
+        counting null, with type aliases written once after the
+        interfaces, and named after a hash of the union. The width must
+        be at least 2.
+    """
+    __slots__ = ()
+
+    def __new__(cls, indentation=2, newline='\n', export=False,
+                readonly=False, optional_members=False,
+                max_union_width=None):
+        # Every option can be given as an argument, as for a namedtuple.
+        # pylint: disable=too-many-arguments
+        if max_union_width is not None and max_union_width < 2:
+            raise ValueError('max_union_width must be at least 2.')
+
+        return super(RenderOptions, cls).__new__(
+            cls,
+            indentation,
+            newline,
+            export,
+            readonly,
+            optional_members,
+            max_union_width,
+        )
+
+
+def _render_options(indentation, newline, options):
+    return options if options is not None else RenderOptions(
+        indentation,
+        newline,
+    )
+
+
+def is_interface_fields(type_or_fields):
+    """
+    Check if the value for an interface is a mapping of field names to
+    types, rather than a single type, which is rendered as a type alias.
+    """
+    return isinstance(type_or_fields, Mapping)
+
+
+# Member names which aren't identifiers, like `content-type`, are quoted.
+_IDENTIFIER_RE = re.compile(r'[A-Za-z_$][A-Za-z0-9_$]*\Z')
+
+
+def _merge_aliases(aliases, alias_items):
+    # Names are made from hashes, so different unions can share a name.
+    for alias_name, alias_text in alias_items:
+        if aliases.setdefault(alias_name, alias_text) != alias_text:
+            raise ValueError(
+                'Two unions have the same alias name {}'.format(alias_name),
+            )
+
+
+@memoize(None)
+def compile_renderer(options):
+    """
+    Return a function for rendering the text of an interface or type
+    alias in the format described by RenderOptions, ending with a
+    newline. The text which is the same for every interface is worked out
+    here once, so only the names and types are filled in for each one.
+
+    render(name, field_dict) returns an interface, where the members are
+    sorted by name. render(name, some_type) returns a type alias.
+
+    With max_union_width, the text for the aliases for wide unions is
+    added to an `aliases` dictionary if one is given as a third argument,
+    keyed by the alias names, or written after the interface otherwise.
+    """
+    export = 'export ' if options.export else ''
+    interface_start = export + 'interface '
+    alias_start = export + 'type '
+    newline = options.newline
+    member_start = newline + ' ' * options.indentation + (
+        'readonly ' if options.readonly else ''
+    )
+    optional_separator = '?: ' if options.optional_members else ': '
+    interface_end = newline + '}' + newline
+    max_union_width = options.max_union_width
+    # (text, [(alias_name, alias_text), ...]) for each node.
+    collapsed_type_names = LRUCache(TYPE_NAME_CACHE_SIZE)
+
+    def render_alias(name, node):
+        return alias_start + name + ' = ' + ir.render(node) + newline
+
+    def collapsed_type_name(type_or_tuple, aliases):
+        node = type_node(type_or_tuple)
+        entry = collapsed_type_names.get(node)
+
+        if entry is MISSING:
+            alias_nodes = {}
+            text = ir.render(
+                ir.collapse_unions(node, max_union_width, alias_nodes),
+            )
+            entry = (text, [
+                (alias_name, render_alias(alias_name, alias_node))
+                for alias_name, alias_node in sorted(
+                    six.iteritems(alias_nodes),
+                )
+            ])
+            collapsed_type_names.set(node, entry)
+
+        _merge_aliases(aliases, entry[1])
+
+        return entry[0]
+
+    def render_member(field_name, type_or_tuple, get_type_name):
+        if not _IDENTIFIER_RE.match(field_name):
+            field_name = ir.render(ir.literal(field_name))
+
+        if isinstance(type_or_tuple, OptionalMember):
+            return (
+                member_start + field_name + optional_separator
+                + get_type_name(type_or_tuple.type)
             )
-        elif issubclass(getattr(some_type, '__origin__', type), Set):
-            name_list.append(
-                group_type(type_name(some_type.__args__[0])) + '[]'
+
+        return member_start + field_name + ': ' + get_type_name(type_or_tuple)
+
+    def render_interface(name, field_dict, get_type_name):
+        # Field names are unique, so only the names are ever compared.
+        return (
+            interface_start + name + ' {'
+            + ''.join([
+                render_member(field_name, type_or_tuple, get_type_name)
+                for field_name, type_or_tuple in sorted(
+                    six.iteritems(field_dict),
+                )
+            ])
+            + interface_end
+        )
+
+    def render(name, type_or_fields, aliases=None):
+        profile = profiling.current()
+        member_aliases = aliases if aliases is not None else {}
+
+        with profile.phase('rendering'):
+            # Type aliases are already named, so they are never collapsed.
+            if not is_interface_fields(type_or_fields):
+                return (
+                    alias_start + name + ' = '
+                    + profile.timed('type_resolution', type_name)(
+                        type_or_fields,
+                    )
+                    + newline
+                )
+
+            text = render_interface(
+                name,
+                type_or_fields,
+                profile.timed(
+                    'type_resolution',
+                    type_name
+                    if max_union_width is None else
+                    lambda type_or_tuple: collapsed_type_name(
+                        type_or_tuple,
+                        member_aliases,
+                    ),
+                ),
             )
-        elif issubclass(getattr(some_type, '__origin__', type), Mapping):
-            # The key type always has to be a number or string for JS.
-            # Serialized as JSON, we'll only ever have strings as keys.
-            name_list.append(
-                '{{[key: string]: {}}}'
-                .format(type_name(some_type.__args__[1]))
+
+        if aliases is None:
+            text += ''.join(
+                newline + alias_text
+                for _, alias_text in sorted(six.iteritems(member_aliases))
             )
-        elif isinstance(some_type, six.binary_type):
-            name_list.append(some_type.decode('utf-8'))
-        elif isinstance(some_type, six.text_type):
-            name_list.append(some_type)
-        # Check this first to avoid exceptions with issubclass
-        elif not issubclass(type(some_type), type):
-            name_list.append('any')
-        elif issubclass(some_type, six.binary_type):
-            name_list.append('string')
-        elif issubclass(some_type, six.text_type):
-            name_list.append('string')
-        elif issubclass(some_type, bool):
-            name_list.append('boolean')
-        elif issubclass(some_type, NUMBER_TYPES):
-            name_list.append('number')
-        elif issubclass(some_type, list):
-            name_list.append('any[]')
-        elif issubclass(some_type, dict):
-            name_list.append('object')
-        else:
-            name_list.append('any')
-
-    return list(
-        # Sort types, and put null last
-        uniq(sorted(name_list, key=lambda name: (name == 'null', name)))
+
+        return text
+
+    return render
+
+
+def generate_interface(interface_name, field_dict, indentation=2,
+                       newline='\n', options=None):
+    """
+    Generate the text for a single TypeScript interface, ending with a
+    newline. The members of the interface will be sorted by name.
+
+    If field_dict is a type instead of a dictionary, a type alias will be
+    generated instead. RenderOptions can be given as `options` to change
+    the format, and replace `indentation` and `newline`.
+    """
+    return compile_renderer(_render_options(indentation, newline, options))(
+        interface_name,
+        field_dict,
     )
 
 
-def type_name(type_or_tuple):
+def alias_texts(aliases):
     """
-    Given some Python type or a string for naming another TypeSscript
-    interface, return a string representing the type in TypeScript.
+    Generate the text for the aliases collected by a renderer from
+    compile_renderer, sorted by name. The dictionary is read only once the
+    first text is needed, so it can be filled in while rendering.
+    """
+    for _, text in sorted(six.iteritems(aliases)):
+        yield text
+
+
+def join_interfaces(interface_texts, newline='\n'):
     """
-    return ' | '.join(_get_type_name_list(type_or_tuple))
+    Generate chunks for joining the text of several interfaces together
+    with blank lines, in the same way generate_interfaces does.
+    """
+    empty = True
+
+    for text in interface_texts:
+        if not empty:
+            yield newline
+
+        empty = False
+
+        yield text
+
+    if empty:
+        yield newline
+
+
+def iter_interfaces(python_types, indentation=2, newline='\n',
+                    options=None, aliases=None):
+    """
+    Generate the text of generate_interfaces in chunks, one per interface,
+    so the whole output never has to be held in memory at once.
+    python_types can be any iterable, including a generator.
+
+    An `aliases` dictionary can be given to collect the aliases for wide
+    unions in, as for a renderer from compile_renderer, instead of
+    writing them after the interfaces.
+    """
+    options = _render_options(indentation, newline, options)
+    render = compile_renderer(options)
+    collect_aliases = aliases is not None
+    aliases = aliases if collect_aliases else {}
+
+    return join_interfaces(
+        itertools.chain(
+            (
+                render(interface_name, field_dict, aliases)
+                for interface_name, field_dict in python_types
+            ),
+            () if collect_aliases else alias_texts(aliases),
+        ),
+        options.newline,
+    )
+
+
+def write_interfaces(python_types, fp, indentation=2, newline='\n',
+                     options=None):
+    """
+    Write the output of generate_interfaces to a file-like object, one
+    interface at a time.
+    """
+    for chunk in iter_interfaces(python_types, indentation, newline, options):
+        fp.write(chunk)
 
 
-def generate_interfaces(python_types, indentation=2, newline='\n'):
+def generate_interfaces(python_types, indentation=2, newline='\n',
+                        options=None, aliases=None):
     """
     Generate TypeScript interfaces from python types. python_types must
     be in the format [(interface_name, type_mapping), ...]
@@ -120,28 +642,17 @@ def generate_interfaces(python_types, indentation=2, newline='\n'):
       b: string
     }
 
-    The members of the interface will be sorted by name.
+    The members of the interface will be sorted by name. Pairs where the
+    type mapping is a single type instead generate type aliases, such as
+    `type Status = "open" | "closed"`. RenderOptions can be given as
+    `options` to change the format, and replace `indentation` and
+    `newline`. An `aliases` dictionary can be given, as for
+    iter_interfaces.
     """
-    lines = []
-
-    indentation_text = ' ' * indentation
-
-    for index, (interface_name, field_dict) in enumerate(python_types):
-        if index > 0:
-            lines.append('')
-
-        lines.append('interface {} {{'.format(interface_name))
-
-        for field_name, type_or_tuple in sorted(
-            six.iteritems(field_dict),
-            key=lambda x: x[0]
-        ):
-            lines.append('{}{}: {}'.format(
-                indentation_text,
-                field_name,
-                type_name(type_or_tuple),
-            ))
-
-        lines.append('}')
-
-    return newline.join(lines) + newline
+    return ''.join(iter_interfaces(
+        python_types,
+        indentation,
+        newline,
+        options,
+        aliases,
+    ))
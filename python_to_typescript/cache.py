@@ -0,0 +1,150 @@
+"""
+Small caching utilities shared by the interface generators.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals  # isort:skip # noqa
+
+import functools
+import threading
+from collections import OrderedDict, namedtuple
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+# A sentinel for values missing from a cache.
+MISSING = object()
+
+
+def _is_hashable(key):
+    try:
+        hash(key)
+    except TypeError:
+        return False
+
+    return True
+
+
+class LRUCache(object):
+    """
+    A thread-safe mapping which discards the least recently used items
+    once it holds more than `maxsize` items.
+
+    A `maxsize` of `None` means the cache will grow without bound.
+    """
+    def __init__(self, maxsize=128):
+        self._maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def maxsize(self):
+        return self._maxsize
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=MISSING):
+        """
+        Get a value from the cache, or `default` if it isn't cached.
+        """
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+
+                return default
+
+            if self._maxsize is not None:
+                # Mark the key as the most recently used one.
+                del self._data[key]
+                self._data[key] = value
+
+            self.hits += 1
+
+            return value
+
+    def set(self, key, value):
+        """
+        Store a value in the cache, evicting old values as needed.
+        """
+        with self._lock:
+            if self._maxsize == 0:
+                return
+
+            self._data.pop(key, None)
+            self._data[key] = value
+
+            if self._maxsize is not None:
+                while len(self._data) > self._maxsize:
+                    self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        """
+        Remove a single value from the cache.
+        """
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def resize(self, maxsize):
+        """
+        Change the maximum size of the cache, evicting values as needed.
+        """
+        with self._lock:
+            self._maxsize = maxsize
+
+            if maxsize is not None:
+                while len(self._data) > maxsize:
+                    self._data.popitem(last=False)
+
+    def clear(self):
+        """
+        Remove every value from the cache and reset the statistics.
+        """
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        with self._lock:
+            return CacheInfo(
+                self.hits,
+                self.misses,
+                self._maxsize,
+                len(self._data),
+            )
+
+
+def memoize(maxsize=128):
+    """
+    Memoize a function of one argument with an LRUCache.
+
+    Arguments which cannot be hashed skip the cache entirely. The wrapper
+    exposes `cache_info()`, `cache_clear()` and `cache_resize(maxsize)`,
+    like functools.lru_cache.
+    """
+    def decorator(func):
+        cache = LRUCache(maxsize)
+
+        @functools.wraps(func)
+        def wrapper(argument):
+            if not _is_hashable(argument):
+                return func(argument)
+
+            value = cache.get(argument)
+
+            if value is MISSING:
+                value = func(argument)
+                cache.set(argument, value)
+
+            return value
+
+        wrapper.cache = cache
+        wrapper.cache_info = cache.info
+        wrapper.cache_clear = cache.clear
+        wrapper.cache_resize = cache.resize
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,211 @@
+"""
+Functions for generating TypeScript interfaces directly from dataclasses,
+TypedDicts and attrs classes.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals  # isort:skip # noqa
+
+import sys
+import typing
+
+from . import profiling
+from .base import (
+    OptionalMember,
+    _is_attrs_class,
+    _is_dataclass,
+    _is_typed_dict,
+    get_args,
+    iter_interfaces,
+)
+from .cache import MISSING, LRUCache
+
+# Field types for classes, so type hints are only resolved once per class.
+_field_types_cache = LRUCache(None)
+profiling.register_cache('class_field_types', _field_types_cache.info)
+
+
+def is_interface_class(cls):
+    """
+    Check if a class is a dataclass, TypedDict or attrs class.
+    """
+    return isinstance(cls, type) and (
+        _is_dataclass(cls)
+        or _is_typed_dict(cls)
+        or _is_attrs_class(cls)
+    )
+
+
+class _Annotations(object):
+    def __init__(self, annotations):
+        self.__annotations__ = annotations
+
+
+def _type_hint(annotation, global_namespace):
+    try:
+        return typing.get_type_hints(
+            _Annotations({'hint': annotation}),
+            global_namespace,
+        )['hint']
+    except (NameError, TypeError):
+        return annotation
+
+
+def _type_hints(cls):
+    # Resolving hints evaluates forward references, which is slow, and can
+    # fail for names which can't be found. If any name can't be found, the
+    # hints are resolved one at a time, and unresolved names are kept as
+    # strings, which are rendered as names of other interfaces.
+    try:
+        return typing.get_type_hints(cls)
+    except (NameError, TypeError):
+        hints = {}
+
+        for base in reversed(cls.__mro__):
+            module = sys.modules.get(base.__module__)
+            global_namespace = vars(module) if module is not None else {}
+
+            for name, annotation in getattr(
+                base,
+                '__annotations__',
+                {},
+            ).items():
+                hints[name] = _type_hint(annotation, global_namespace)
+
+        return hints
+
+
+def _field_type(hints, name, declared_type):
+    # Fields declared without a type, like attr.ib(), can hold anything.
+    field_type = hints.get(name, declared_type)
+
+    return typing.Any if field_type is None else field_type
+
+
+def class_field_types(cls):
+    """
+    Return a dictionary mapping field names to types for a dataclass,
+    TypedDict or attrs class. The dictionary is cached for each class, and
+    should not be modified.
+    """
+    field_types = _field_types_cache.get(cls)
+
+    if field_types is MISSING:
+        with profiling.current().phase('type_hints'):
+            hints = _type_hints(cls)
+
+        if _is_dataclass(cls):
+            import dataclasses
+
+            field_types = {
+                field.name: _field_type(hints, field.name, field.type)
+                for field in dataclasses.fields(cls)
+            }
+        elif _is_attrs_class(cls):
+            field_types = {
+                attribute.name: _field_type(
+                    hints,
+                    attribute.name,
+                    attribute.type,
+                )
+                for attribute in cls.__attrs_attrs__
+            }
+        else:
+            # Keys left out of a TypedDict with total=False are optional.
+            optional_keys = getattr(cls, '__optional_keys__', frozenset())
+            field_types = {
+                name: (
+                    OptionalMember(hint)
+                    if name in optional_keys else
+                    hint
+                )
+                for name, hint in hints.items()
+            }
+
+        _field_types_cache.set(cls, field_types)
+
+    return field_types
+
+
+def clear_class_cache(cls=None):
+    """
+    Forget the cached field types for a class, or for every class if none
+    is given.
+    """
+    if cls is None:
+        _field_types_cache.clear()
+    else:
+        _field_types_cache.pop(cls)
+
+
+def referenced_classes(type_or_tuple):
+    """
+    Generate the interface classes used anywhere inside of a type.
+    """
+    stack = [type_or_tuple]
+
+    while stack:
+        some_type = stack.pop()
+
+        if isinstance(some_type, tuple):
+            stack.extend(reversed(some_type))
+        elif isinstance(some_type, OptionalMember):
+            stack.append(some_type.type)
+        elif is_interface_class(some_type):
+            yield some_type
+        else:
+            stack.extend(reversed(get_args(some_type)))
+
+
+def walk_classes(classes):
+    """
+    Generate (interface_name, field_types) pairs for classes and every
+    interface class they reference, depth first. Each class is visited
+    exactly once, so classes can reference each other in cycles.
+
+    A ValueError will be raised if two different classes have the same
+    name.
+    """
+    visited = set()
+    classes_by_name = {}
+    stack = list(reversed(classes))
+
+    while stack:
+        cls = stack.pop()
+
+        if cls in visited:
+            continue
+
+        visited.add(cls)
+        other_class = classes_by_name.setdefault(cls.__name__, cls)
+
+        if other_class is not cls:
+            raise ValueError(
+                '{!r} and {!r} both produce the interface {}'.format(
+                    other_class,
+                    cls,
+                    cls.__name__,
+                )
+            )
+
+        field_types = class_field_types(cls)
+
+        yield cls.__name__, field_types
+
+        stack.extend(reversed([
+            referenced_class
+            for _, type_or_tuple in sorted(field_types.items())
+            for referenced_class in referenced_classes(type_or_tuple)
+        ]))
+
+
+def generate_interfaces_from_classes(classes, indentation=2, newline='\n',
+                                     options=None):
+    """
+    Generate TypeScript interfaces for dataclasses, TypedDicts and attrs
+    classes, and for every such class they reference, each exactly once.
+    """
+    return ''.join(iter_interfaces(
+        walk_classes(classes),
+        indentation,
+        newline,
+        options,
+    ))
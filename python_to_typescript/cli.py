@@ -0,0 +1,438 @@
+"""
+A command line tool for generating TypeScript files from Python modules.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals  # isort:skip # noqa
+
+import argparse
+import io
+import itertools
+import os
+import sys
+
+import six
+
+from . import profiling, schema_store
+from .base import (
+    RenderOptions,
+    alias_texts,
+    generate_interfaces,
+    join_interfaces,
+)
+from .discovery import (
+    app_module_name,
+    combined_python_types,
+    import_modules,
+    module_sources,
+)
+from .incremental import read_file, write_if_changed
+from .references import ReferenceGraph, tree_shake
+from .sharding import generate_shards
+
+
+# The file the aliases for wide unions are written to with --output-dir, as
+# the files are global scripts, and each alias can only be declared once.
+# Module names can't contain dashes, so no module has the same name.
+UNION_ALIASES_NAME = 'union-aliases'
+
+
+def _argument_parser():
+    parser = argparse.ArgumentParser(
+        prog='python-to-typescript',
+        description=(
+            'Generate TypeScript interfaces for the serializers and the '
+            'TYPESCRIPT_INTERFACES lists in Python modules.'
+        ),
+    )
+    parser.add_argument(
+        'modules',
+        nargs='*',
+        metavar='MODULE',
+        help='A dotted path for a module to generate interfaces for.',
+    )
+    parser.add_argument(
+        '--app',
+        action='append',
+        default=[],
+        dest='apps',
+        metavar='APP_LABEL',
+        help='A Django app to generate interfaces for serializers from.',
+    )
+    parser.add_argument(
+        '--openapi',
+        action='append',
+        default=[],
+        dest='openapi_files',
+        metavar='FILE',
+        help=(
+            'An OpenAPI or JSON Schema document to generate interfaces for '
+            'each schema in, written like a module named after the file.'
+        ),
+    )
+    parser.add_argument(
+        '--settings',
+        help='The Django settings module, if not set in the environment.',
+    )
+    output_group = parser.add_mutually_exclusive_group()
+    output_group.add_argument(
+        '-o',
+        '--output',
+        help='Write every interface to one file, instead of to stdout.',
+    )
+    output_group.add_argument(
+        '--output-dir',
+        help='Write one file named <module>.ts for each module.',
+    )
+    parser.add_argument(
+        '--shard-size',
+        type=int,
+        metavar='BYTES',
+        help=(
+            'With --output-dir, split the files for modules into files of '
+            'up to roughly BYTES each, which import types from each other.'
+        ),
+    )
+    parser.add_argument(
+        '--root',
+        action='append',
+        default=[],
+        dest='roots',
+        metavar='NAME',
+        help=(
+            'Only write the interface NAME and the interfaces it references. '
+            'Can be given more than once.'
+        ),
+    )
+    parser.add_argument(
+        '--indentation',
+        type=int,
+        default=2,
+        help='The number of spaces to indent members with.',
+    )
+    parser.add_argument(
+        '--export',
+        action='store_true',
+        help='Export every interface and type alias.',
+    )
+    parser.add_argument(
+        '--readonly',
+        action='store_true',
+        help='Make every member of every interface readonly.',
+    )
+    parser.add_argument(
+        '--optional-members',
+        action='store_true',
+        help='Write members which can be left out of objects with ?:.',
+    )
+    parser.add_argument(
+        '--max-union-width',
+        type=int,
+        metavar='WIDTH',
+        help=(
+            'Replace unions with more than WIDTH members with type aliases '
+            'written once, in {}.ts with --output-dir. WIDTH must be at '
+            'least 2.'.format(UNION_ALIASES_NAME)
+        ),
+    )
+    parser.add_argument(
+        '--check',
+        action='store_true',
+        help='Exit with status 1 if any output file is out of date.',
+    )
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        help='Keep running, and regenerate files when modules change.',
+    )
+    parser.add_argument(
+        '--interval',
+        type=float,
+        default=0.5,
+        help='The number of seconds between checks for changes to files.',
+    )
+    parser.add_argument(
+        '--schema-cache',
+        metavar='FILE',
+        help=(
+            'Save serializer schemas in FILE, and re-use them in later runs '
+            'for serializers whose source files have not changed.'
+        ),
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Print the time spent in each phase of generation to stderr.',
+    )
+
+    return parser
+
+
+def _setup_django(settings):
+    if settings:
+        os.environ['DJANGO_SETTINGS_MODULE'] = settings
+
+    if os.environ.get('DJANGO_SETTINGS_MODULE'):
+        import django
+
+        django.setup()
+
+
+def _module_names(options):
+    return options.modules + [app_module_name(label) for label in options.apps]
+
+
+def _openapi_python_types(options):
+    # Schema documents are treated like modules named after the files.
+    from .openapi import openapi_python_types
+
+    for path in options.openapi_files:
+        # io.open makes files with seekable() in Python 2 too.
+        with io.open(path, 'rb') as fp:
+            yield (
+                os.path.splitext(os.path.basename(path))[0],
+                openapi_python_types(fp),
+            )
+
+
+def _tree_shake_sources(sources, roots):
+    # Interfaces can be reached through references between files, and
+    # files left with no interfaces aren't written.
+    reachable = ReferenceGraph(itertools.chain.from_iterable(
+        source_python_types
+        for _, source_python_types in sources
+    )).reachable(roots)
+
+    for source_name, source_python_types in sources:
+        source_python_types = [
+            (name, type_or_fields)
+            for name, type_or_fields in source_python_types
+            if name in reachable
+        ]
+
+        if source_python_types:
+            yield source_name, source_python_types
+
+
+def _render_options(options):
+    return RenderOptions(
+        indentation=options.indentation,
+        export=options.export,
+        readonly=options.readonly,
+        optional_members=options.optional_members,
+        max_union_width=options.max_union_width,
+    )
+
+
+def _sources(options):
+    # Every module is read, so serializers nested from other modules are
+    # written with the first module using them.
+    return list(itertools.chain(
+        module_sources(import_modules(_module_names(options))),
+        _openapi_python_types(options),
+    ))
+
+
+def _render_shards(options):
+    python_types = []
+    module_for_name = {}
+
+    for source_name, source_python_types in _sources(options):
+        for name, type_or_fields in source_python_types:
+            python_types.append((name, type_or_fields))
+            module_for_name[name] = source_name
+
+    if options.roots:
+        python_types = tree_shake(python_types, options.roots)
+
+    return {
+        os.path.join(options.output_dir, file_name): content
+        for file_name, content in six.iteritems(generate_shards(
+            python_types,
+            module_for_name.__getitem__,
+            options.shard_size,
+            options=_render_options(options),
+        ))
+    }
+
+
+def render_outputs(options, module_names=None, manifest=None):
+    """
+    Render the output for parsed command line options, and return a
+    dictionary mapping paths to file contents. The path for stdout is None.
+
+    With --output-dir, the output can be limited to some module names.
+    An InterfaceManifest can be given to re-use the text of interfaces
+    which have not changed. With --shard-size, every file is rendered, as
+    files import from each other. With --max-union-width, every file is
+    rendered too, as the aliases for all of them are written to one file.
+    """
+    if options.output_dir and options.shard_size:
+        return _render_shards(options)
+
+    render_options = _render_options(options)
+
+    def generate(python_types, path, aliases=None):
+        if manifest is None:
+            return generate_interfaces(
+                python_types,
+                options=render_options,
+                aliases=aliases,
+            )
+
+        return manifest.generate_interfaces(
+            python_types,
+            options=render_options,
+            path=path,
+            aliases=aliases,
+        )
+
+    if options.output_dir:
+        sources = _sources(options)
+        aliases = None
+
+        if options.roots:
+            sources = _tree_shake_sources(sources, options.roots)
+
+        if options.max_union_width is not None:
+            aliases = {}
+        elif module_names is not None:
+            # Files for OpenAPI documents are always written.
+            skipped_names = set(_module_names(options)) - set(module_names)
+            sources = (
+                (source_name, source_python_types)
+                for source_name, source_python_types in sources
+                if source_name not in skipped_names
+            )
+
+        outputs = {}
+
+        for source_name, source_python_types in sources:
+            if source_name == UNION_ALIASES_NAME and aliases is not None:
+                raise ValueError(
+                    '{} is used for the aliases for wide unions.'.format(
+                        source_name,
+                    ),
+                )
+
+            path = os.path.join(options.output_dir, source_name + '.ts')
+            outputs[path] = generate(source_python_types, path, aliases)
+
+        if aliases is not None:
+            outputs[
+                os.path.join(options.output_dir, UNION_ALIASES_NAME + '.ts')
+            ] = ''.join(join_interfaces(
+                alias_texts(aliases),
+                render_options.newline,
+            ))
+
+        return outputs
+
+    python_types = combined_python_types(
+        import_modules(_module_names(options)),
+    )
+
+    for _, source_python_types in _openapi_python_types(options):
+        python_types.extend(source_python_types)
+
+    if options.roots:
+        python_types = tree_shake(python_types, options.roots)
+
+    return {
+        options.output: generate(python_types, options.output),
+    }
+
+
+def check_outputs(outputs):
+    """
+    Print the paths for outputs which are out of date, and return the
+    exit status for the check.
+    """
+    stale_paths = [
+        path
+        for path, content in sorted(outputs.items())
+        if read_file(path) != content
+    ]
+
+    for path in stale_paths:
+        print('{} is out of date'.format(path), file=sys.stderr)
+
+    return 1 if stale_paths else 0
+
+
+def write_outputs(outputs):
+    """
+    Write outputs to files or stdout, and return the paths of the files
+    which were changed.
+    """
+    written_paths = []
+
+    for path, content in sorted(outputs.items()):
+        if path is None:
+            sys.stdout.write(content)
+        elif write_if_changed(path, content):
+            written_paths.append(path)
+
+    return written_paths
+
+
+def main(argv=None):
+    parser = _argument_parser()
+    options = parser.parse_args(argv)
+
+    if not options.modules and not options.apps and not options.openapi_files:
+        parser.error('No modules, apps or OpenAPI files were given.')
+
+    if options.check and not (options.output or options.output_dir):
+        parser.error('--check requires --output or --output-dir.')
+
+    if options.watch and not (options.output or options.output_dir):
+        parser.error('--watch requires --output or --output-dir.')
+
+    if options.shard_size and not options.output_dir:
+        parser.error('--shard-size requires --output-dir.')
+
+    if options.max_union_width is not None and options.max_union_width < 2:
+        parser.error('--max-union-width must be at least 2.')
+
+    # Make modules in the current directory importable, like django-admin.
+    if os.getcwd() not in sys.path:
+        sys.path.insert(0, os.getcwd())
+
+    if options.profile:
+        profiling.enable()
+
+    if options.schema_cache:
+        schema_store.enable(options.schema_cache)
+
+    try:
+        return _run(options)
+    except ValueError as error:
+        # Errors for the types given, like --root names for interfaces
+        # which don't exist, or clashing interface names, are reported
+        # without a traceback.
+        parser.error(str(error))
+    finally:
+        if options.schema_cache:
+            schema_store.disable().close()
+
+        if options.profile:
+            sys.stderr.write(profiling.disable().report())
+
+
+def _run(options):
+    _setup_django(options.settings)
+
+    if options.watch:
+        from .watch import watch_outputs
+
+        watch_outputs(options, _module_names(options))
+
+        return 0
+
+    outputs = render_outputs(options)
+
+    if options.check:
+        return check_outputs(outputs)
+
+    write_outputs(outputs)
+
+    return 0
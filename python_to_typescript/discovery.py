@@ -0,0 +1,151 @@
+"""
+Functions for finding Python types to generate TypeScript interfaces for
+in modules. Only the modules asked for are imported.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals  # isort:skip # noqa
+
+import importlib
+import sys
+
+# Modules can list interfaces to generate in this attribute, in the format
+# generate_interfaces accepts.
+INTERFACES_ATTRIBUTE = 'TYPESCRIPT_INTERFACES'
+
+
+def app_module_name(app_label):
+    """
+    Get the name of the serializers module for a Django app.
+    """
+    from django.apps import apps
+
+    return apps.get_app_config(app_label).name + '.serializers'
+
+
+def import_modules(module_names):
+    return [importlib.import_module(name) for name in module_names]
+
+
+def _is_abstract_serializer(serializer_class):
+    # ModelSerializers without a model and ListSerializers are base classes
+    # for other serializers, and can't be introspected by themselves.
+    from rest_framework.serializers import ListSerializer, ModelSerializer
+
+    if issubclass(serializer_class, ListSerializer):
+        return True
+
+    return issubclass(serializer_class, ModelSerializer) and getattr(
+        getattr(serializer_class, 'Meta', None),
+        'model',
+        None,
+    ) is None
+
+
+def module_serializers(module):
+    """
+    Get the serializer classes defined in a module, sorted by name.
+    Abstract serializers, which are only used as base classes, are skipped.
+    """
+    # A module can only define serializers if DRF has been imported, so
+    # DRF is never imported just to look for serializers.
+    if 'rest_framework' not in sys.modules:
+        return []
+
+    from rest_framework.serializers import BaseSerializer
+
+    return sorted(
+        (
+            value for value in vars(module).values()
+            if isinstance(value, type)
+            and issubclass(value, BaseSerializer)
+            and value.__module__ == module.__name__
+            and not _is_abstract_serializer(value)
+        ),
+        key=lambda serializer_class: serializer_class.__name__,
+    )
+
+
+def module_interfaces(module):
+    """
+    Get the interfaces listed in a module with TYPESCRIPT_INTERFACES.
+    """
+    return list(getattr(module, INTERFACES_ATTRIBUTE, []))
+
+
+def _serializer_python_types(serializer_classes):
+    if not serializer_classes:
+        return []
+
+    from .drf import walk_serializers
+
+    return [
+        (schema.name, schema.field_types)
+        for schema in walk_serializers(serializer_classes)
+    ]
+
+
+def _module_schemas(serializer_classes, module_name, source_names, visited):
+    # Serializers from the other modules given are written with those
+    # modules, and aren't followed.
+    if not serializer_classes:
+        return
+
+    from .drf import _serializer_key, serializer_schema
+
+    stack = list(reversed(serializer_classes))
+
+    while stack:
+        serializer_class = stack.pop()
+        key = _serializer_key(serializer_class)
+
+        if key in visited or (
+            serializer_class.__module__ != module_name
+            and serializer_class.__module__ in source_names
+        ):
+            continue
+
+        visited.add(key)
+        schema = serializer_schema(serializer_class)
+
+        yield schema
+
+        stack.extend(reversed(schema.nested_serializers))
+
+
+def module_sources(modules):
+    """
+    Generate (module_name, python_types) pairs for the interfaces and
+    serializers in each module, for writing a file for each one.
+
+    Serializers nested from modules which aren't given, including the
+    serializers DRF builds for Meta.depth, are included once with the
+    first module which uses them, so every name written is defined.
+    """
+    modules = list(modules)
+    source_names = {module.__name__ for module in modules}
+    visited = set()
+
+    for module in modules:
+        yield module.__name__, module_interfaces(module) + [
+            (schema.name, schema.field_types)
+            for schema in _module_schemas(
+                module_serializers(module),
+                module.__name__,
+                source_names,
+                visited,
+            )
+        ]
+
+
+def combined_python_types(modules):
+    """
+    Get the python types for the interfaces and serializers in several
+    modules, including every serializer nested inside of them once.
+    """
+    python_types = []
+    serializer_classes = []
+
+    for module in modules:
+        python_types.extend(module_interfaces(module))
+        serializer_classes.extend(module_serializers(module))
+
+    return python_types + _serializer_python_types(serializer_classes)
@@ -1,47 +1,176 @@
 from __future__ import absolute_import, division, print_function, unicode_literals  # isort:skip # noqa
 
-from typing import Dict, List, Optional, Set
+import typing
+from collections import namedtuple
+from typing import Dict, List, Optional, Set, Union
 
 import six
-from rest_framework.serializers import (
-    BooleanField,
-    CharField,
-    ChoiceField,
-    DateField,
-    DateTimeField,
-    DecimalField,
-    DictField,
-    DurationField,
-    FileField,
-    FloatField,
-    IntegerField,
-    ListField,
-    MultipleChoiceField,
-    NullBooleanField,
-    TimeField,
-    UUIDField,
+
+from . import profiling, schema_store
+from .base import OptionalMember, iter_interfaces
+from .cache import MISSING, LRUCache
+from .registry import TypeRegistry
+
+# The interface name, a dictionary of field types, and a tuple of the
+# serializer classes nested inside of a serializer class.
+SerializerSchema = namedtuple(
+    'SerializerSchema',
+    ['name', 'field_types', 'nested_serializers'],
 )
 
-from .base import generate_interfaces
+# Schemas for serializer classes, so each class is introspected once.
+_schema_cache = LRUCache(None)
+profiling.register_cache('serializer_schema', _schema_cache.info)
+
+
+def _is_depth_serializer(serializer_class):
+    # ModelSerializers with Meta.depth build a new class named
+    # NestedSerializer for each relation they follow.
+    return (
+        serializer_class.__name__ == 'NestedSerializer'
+        and serializer_class.__module__ == 'rest_framework.serializers'
+    )
+
+
+def _serializer_key(serializer_class):
+    # Serializers built for Meta.depth for the same model and depth output
+    # the same fields, so they share one interface.
+    if _is_depth_serializer(serializer_class):
+        meta = serializer_class.Meta
+
+        return (meta.model, meta.depth)
+
+    return serializer_class
+
+
+def _depth_serializer(model, depth):
+    """
+    Build a serializer class like the one ModelSerializer.build_nested_field
+    builds for a model, for serializers which had to be sent between
+    processes by their keys, as local classes can't be pickled.
+    """
+    from rest_framework.serializers import ModelSerializer
+
+    meta = type(str('Meta'), (object,), {
+        'model': model,
+        'depth': depth,
+        'fields': '__all__',
+    })
+
+    return type(str('NestedSerializer'), (ModelSerializer,), {
+        '__module__': ModelSerializer.__module__,
+        'Meta': meta,
+    })
 
 
 def _serializer_name(serializer_class):
+    if _is_depth_serializer(serializer_class):
+        meta = serializer_class.Meta
+
+        return 'Nested{}{}'.format(
+            meta.model.__name__,
+            'Depth{}'.format(meta.depth) if meta.depth else '',
+        )
+
     return serializer_class.__name__.replace('Serializer', '')
 
 
-def _python_type_for_field_without_null_check(field):
+def _constant_type(python_type):
+    return lambda field, field_type: python_type
+
+
+_object_type = _constant_type(object)
+
+
+def _list_type(field, field_type):
+    return List[field_type(field.child)]
+
+
+def _nested_serializer_type(field, field_type):
+    # Nested serializers are referenced by the names of their interfaces.
+    field_type.nested.append(type(field))
+
+    return _serializer_name(type(field))
+
+
+def _many_related_type(field, field_type):
+    return List[field_type(field.child_relation)]
+
+
+def _primary_key_related_type(field, field_type):
+    return (
+        field_type(field.pk_field)
+        if field.pk_field is not None else
+        Union[int, six.text_type]
+    )
+
+
+def _serializer_method_type(field, field_type):  # noqa # pylint: disable=unused-argument
+    # The return annotation for the method says what the field outputs.
+    # Hints are resolved, so string annotations are read as types.
+    method = getattr(field.parent, field.method_name, None)
+
+    try:
+        return typing.get_type_hints(method).get('return', object)
+    except (NameError, TypeError):
+        return object
+
+
+def _is_char_mapping_field(field_class):
     # A string comparison is used so we don't require psycopg for people who
     # don't use Postgres.
-    if type(field).__name__ == 'CharMappingField':
-        return Dict[six.text_type, Optional[six.text_type]]
+    return field_class.__name__ == 'CharMappingField'
+
+
+def _default_field_handlers():  # pylint: disable=too-many-locals
+    # DRF is imported when serializers are first introspected, so importing
+    # this module stays fast, and DRF is only loaded when it's used.
+    from rest_framework.relations import (
+        HyperlinkedRelatedField,
+        ManyRelatedField,
+        PrimaryKeyRelatedField,
+        SlugRelatedField,
+        StringRelatedField,
+    )
+    from rest_framework.serializers import (
+        BaseSerializer,
+        BooleanField,
+        CharField,
+        ChoiceField,
+        DateField,
+        DateTimeField,
+        DecimalField,
+        DictField,
+        DurationField,
+        FileField,
+        FloatField,
+        IntegerField,
+        ListField,
+        ListSerializer,
+        MultipleChoiceField,
+        NullBooleanField,
+        SerializerMethodField,
+        TimeField,
+        UUIDField,
+    )
 
-    if isinstance(field, (BooleanField, NullBooleanField)):
-        return bool
+    try:
+        from rest_framework.serializers import HStoreField
+    except ImportError:  # pragma: no cover
+        HStoreField = None
 
-    if isinstance(field, MultipleChoiceField):
-        return Set[six.text_type]
+    field_handlers = TypeRegistry()
+    field_handlers.register_predicate(
+        _is_char_mapping_field,
+        _constant_type(Dict[six.text_type, Optional[six.text_type]]),
+    )
+    field_handlers.register(ListSerializer, _list_type)
+    field_handlers.register(BaseSerializer, _nested_serializer_type)
+    field_handlers.register(ManyRelatedField, _many_related_type)
+    field_handlers.register(PrimaryKeyRelatedField, _primary_key_related_type)
+    field_handlers.register(SerializerMethodField, _serializer_method_type)
 
-    if isinstance(field, (
+    for field_class in (
         CharField,
         ChoiceField,
         DateField,
@@ -49,45 +178,261 @@ def _python_type_for_field_without_null_check(field):
         DecimalField,
         DurationField,
         FileField,
+        HyperlinkedRelatedField,
+        SlugRelatedField,
+        StringRelatedField,
         TimeField,
         UUIDField,
-    )):
-        return six.text_type
+    ):
+        field_handlers.register(field_class, _constant_type(six.text_type))
+
+    field_handlers.register(BooleanField, _constant_type(bool))
+    field_handlers.register(NullBooleanField, _constant_type(bool))
+    field_handlers.register(
+        MultipleChoiceField,
+        _constant_type(Set[six.text_type]),
+    )
+    field_handlers.register(
+        DictField,
+        _constant_type(Dict[six.text_type, object]),
+    )
+    field_handlers.register(FloatField, _constant_type(float))
+    field_handlers.register(IntegerField, _constant_type(int))
+    field_handlers.register(ListField, _list_type)
+
+    if HStoreField is not None:  # pragma: no branch
+        field_handlers.register(
+            HStoreField,
+            _constant_type(Dict[six.text_type, Optional[six.text_type]]),
+        )
+
+    return field_handlers
+
+
+# The TypeRegistry of handlers for fields, created when first needed.
+_field_handlers = None
 
-    if isinstance(field, DictField):
-        return Dict[six.text_type, object]
 
-    if isinstance(field, FloatField):
-        return float
+def _get_field_handlers():
+    global _field_handlers  # pylint: disable=global-statement
 
-    if isinstance(field, IntegerField):
-        return int
+    if _field_handlers is None:
+        _field_handlers = _default_field_handlers()
 
-    if isinstance(field, ListField):
-        return List[_python_type_for_field(field.child)]
+    return _field_handlers
 
-    return object
 
+def register_field_handler(field_class, handler):
+    """
+    Register a function for the Python type for serializer fields of
+    field_class and its subclasses. handler(field, field_type) must return
+    a Python type, and can call field_type(child_field) for the type of a
+    field inside of the field.
 
-def _python_type_for_field(field):
-    field_type = _python_type_for_field_without_null_check(field)
+    For example:
+    >>> register_field_handler(MoneyField, lambda field, field_type: str)
+    """
+    _get_field_handlers().register(field_class, handler)
+    clear_serializer_cache()
 
+
+def _is_optional_field(field):
+    from rest_framework.fields import empty
+
+    # Fields which aren't required are left out of the output when objects
+    # have no value for them, unless the fields have defaults.
     return (
-        Optional[field_type]
-        if field.allow_null else
-        field_type
+        not field.required
+        and not field.read_only
+        and field.default is empty
+    )
+
+
+class _FieldType(object):
+    """
+    Return the Python types for fields, and collect the serializer classes
+    nested inside of them.
+    """
+    def __init__(self):
+        self.nested = []
+        self.field_handlers = _get_field_handlers()
+
+    def __call__(self, field):
+        handler = self.field_handlers.resolve(type(field), _object_type)
+        field_type = handler(field, self)
+
+        return (
+            Optional[field_type]
+            if field.allow_null else
+            field_type
+        )
+
+
+def _uniq_classes(classes):
+    """
+    Generate classes in order, skipping any which were already seen.
+    """
+    seen = set()
+
+    for cls in classes:
+        if cls not in seen:
+            seen.add(cls)
+
+            yield cls
+
+
+def _build_schema(serializer_class):
+    profile = profiling.current()
+
+    with profile.serializer(serializer_class):
+        with profile.phase('serializer_instantiation'):
+            fields = serializer_class().fields
+
+        with profile.phase('field_mapping'):
+            field_type = _FieldType()
+            field_types = {}
+
+            for field_name, field in six.iteritems(fields):
+                if not field.write_only:
+                    python_type = field_type(field)
+                    field_types[field_name] = (
+                        OptionalMember(python_type)
+                        if _is_optional_field(field) else
+                        python_type
+                    )
+
+    return SerializerSchema(
+        _serializer_name(serializer_class),
+        field_types,
+        tuple(_uniq_classes(field_type.nested)),
+    )
+
+
+def serializer_schema(serializer_class):
+    """
+    Return a SerializerSchema describing the fields a serializer outputs.
+    The schema is cached for each serializer class, and should not be
+    modified.
+
+    If a schema_store is enabled, schemas saved in earlier runs are used
+    for serializers which haven't changed, and new schemas are saved.
+    """
+    schema = _schema_cache.get(serializer_class)
+
+    if schema is MISSING:
+        # Classes built for Meta.depth all have the same qualified name, so
+        # their schemas can't be told apart in the store.
+        store = (
+            schema_store.active
+            if not _is_depth_serializer(serializer_class) else
+            None
+        )
+        schema = store.get(serializer_class) if store is not None else None
+
+        if schema is None:
+            schema = _build_schema(serializer_class)
+
+            if store is not None:
+                store.set(serializer_class, schema)
+
+        _schema_cache.set(serializer_class, schema)
+
+    return schema
+
+
+def serializer_field_types(serializer_class):
+    """
+    Return a dictionary mapping the names of fields a serializer outputs
+    to Python types. The dictionary is cached for each serializer class,
+    and should not be modified.
+    """
+    return serializer_schema(serializer_class).field_types
+
+
+def clear_serializer_cache(serializer_class=None):
+    """
+    Forget the cached schema for a serializer class, or for every class
+    if none is given, such as after a class is reloaded.
+    """
+    if serializer_class is None:
+        _schema_cache.clear()
+    else:
+        _schema_cache.pop(serializer_class)
+
+
+def walk_serializers(serializer_classes, get_schema=serializer_schema):
+    """
+    Generate schemas for serializer classes and every serializer nested
+    inside of them, depth first. Each class is visited exactly once, so
+    cycles between serializers are fine.
+
+    A ValueError will be raised if two different classes would produce
+    interfaces with the same name.
+    """
+    visited = set()
+    classes_by_name = {}
+    stack = list(reversed(serializer_classes))
+
+    while stack:
+        serializer_class = stack.pop()
+        key = _serializer_key(serializer_class)
+
+        if key in visited:
+            continue
+
+        visited.add(key)
+        schema = get_schema(serializer_class)
+        other_class = classes_by_name.setdefault(schema.name, serializer_class)
+
+        if _serializer_key(other_class) != key:
+            raise ValueError(
+                '{!r} and {!r} both produce the interface {}'.format(
+                    other_class,
+                    serializer_class,
+                    schema.name,
+                )
+            )
+
+        yield schema
+
+        stack.extend(reversed(schema.nested_serializers))
+
+
+def generate_interfaces_from_serializer(serializer_class, options=None):
+    """
+    Generate a TypeScript interface for a single serializer class, and
+    for every serializer nested inside of it, so the output can be
+    type checked by itself.
+    """
+    return generate_interfaces_from_serializers(
+        [serializer_class],
+        options=options,
     )
 
 
-def generate_interfaces_from_serializer(serializer_class):
-    serializer = serializer_class()
+def generate_interfaces_from_serializers(serializer_classes, options=None):
+    """
+    Generate TypeScript interfaces for serializer classes and every
+    serializer nested inside of them, with each interface generated
+    exactly once. RenderOptions can be given to change the format.
+    """
+    return ''.join(iter_interfaces(
+        (
+            (schema.name, schema.field_types)
+            for schema in walk_serializers(serializer_classes)
+        ),
+        options=options,
+    ))
 
-    python_types = []
-    attribute_dict = {}
-    python_types.append((_serializer_name(serializer_class), attribute_dict))
 
-    for field_name, field in six.iteritems(serializer.fields):
-        if not field.write_only:
-            attribute_dict[field_name] = _python_type_for_field(field)
+def compile_validators_from_serializers(serializer_classes):
+    """
+    Compile validators for the output of serializer classes, and every
+    serializer nested inside of them, with validation.compile_validators.
+    """
+    from .validation import compile_validators
 
-    return generate_interfaces(python_types)
+    return compile_validators(
+        (schema.name, schema.field_types)
+        for schema in walk_serializers(serializer_classes)
+    )
@@ -0,0 +1,281 @@
+"""
+Functions for regenerating TypeScript files incrementally, re-rendering
+only the interfaces whose Python types have changed.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals  # isort:skip # noqa
+
+import hashlib
+import io
+import itertools
+import json
+import os
+
+import six
+
+from . import __version__, ir
+from .base import (
+    OptionalMember,
+    _generic_handlers,
+    _merge_aliases,
+    _render_options,
+    _type_handlers,
+    _value_handlers,
+    alias_texts,
+    compile_renderer,
+    is_interface_fields,
+    join_interfaces,
+    type_node,
+)
+
+
+def _type_key(type_or_tuple):
+    # Types are hashed by the TypeScript they resolve to, so changes to
+    # enum members, NamedTuple fields, or registered handlers are seen,
+    # even when the reprs of the types stay the same.
+    return (
+        isinstance(type_or_tuple, OptionalMember),
+        ir.render(type_node(type_or_tuple)),
+    )
+
+
+def _input_hash(interface_name, field_dict, options):
+    key = repr((
+        __version__,
+        interface_name,
+        sorted(
+            (field_name, _type_key(type_or_tuple))
+            for field_name, type_or_tuple in six.iteritems(field_dict)
+        )
+        if is_interface_fields(field_dict) else
+        _type_key(field_dict),
+        tuple(options),
+    ))
+
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+def _handler_generation():
+    return (
+        _type_handlers.generation,
+        _generic_handlers.generation,
+        _value_handlers.generation,
+    )
+
+
+def _entry_key(path, interface_name):
+    # Interface names can't contain ':', so keys for files never clash.
+    if path is None:
+        return interface_name
+
+    return '{}:{}'.format(path, interface_name)
+
+
+def read_file(path):
+    """
+    Read the text of a file, or return None if it doesn't exist.
+    """
+    try:
+        with io.open(path, encoding='utf-8', newline='') as text_file:
+            return text_file.read()
+    except (IOError, OSError):
+        return None
+
+
+def write_if_changed(path, content):
+    """
+    Write text to a file, unless the file already contains the text.
+    Return True if the file was written.
+    """
+    if read_file(path) == content:
+        return False
+
+    directory = os.path.dirname(path)
+
+    if directory and not os.path.isdir(directory):
+        os.makedirs(directory)
+
+    with io.open(path, 'w', encoding='utf-8', newline='') as text_file:
+        text_file.write(content)
+
+    return True
+
+
+class InterfaceManifest(object):
+    """
+    A record of a hash of the Python types for each interface, and the
+    text rendered for them, so unchanged interfaces are never rendered
+    twice.
+
+    Entries are kept for each path interfaces are rendered for, so the
+    same name can be used in different files. The types given for each
+    entry are remembered, so when the same objects are given again with
+    the same options and handlers, they aren't hashed again. Types should
+    not be changed after they have been rendered.
+    """
+    def __init__(self, entries=None):
+        # {entry_key: {'hash': input_hash, 'text': rendered_text}}
+        # Entries also have {alias_name: alias_text} for 'aliases', for
+        # the aliases for wide unions used in the interface.
+        self.entries = entries if entries is not None else {}
+        # {entry_key: (field_dict, options, handler_generation)}
+        self._inputs = {}
+        # The names of the interfaces rendered since the manifest was made.
+        self.rendered = []
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a manifest from a JSON file, or create an empty manifest if
+        the file doesn't exist.
+        """
+        text = read_file(path)
+
+        return cls(json.loads(text) if text else None)
+
+    def save(self, path):
+        return write_if_changed(
+            path,
+            json.dumps(self.entries, indent=2, sort_keys=True) + '\n',
+        )
+
+    def prune(self, interface_names):
+        """
+        Remove every entry for interfaces not in the given names, or
+        (path, interface_name) pairs for interfaces rendered for a path.
+        """
+        entry_keys = set(
+            _entry_key(*name) if isinstance(name, tuple) else name
+            for name in interface_names
+        )
+
+        for entry_key in list(self.entries):
+            if entry_key not in entry_keys:
+                del self.entries[entry_key]
+                self._inputs.pop(entry_key, None)
+
+    def _entry(self, entry_key, interface_name, field_dict, options):
+        entry = self.entries.get(entry_key)
+        inputs = (field_dict, options, _handler_generation())
+        last_inputs = self._inputs.get(entry_key)
+
+        if (
+            entry is not None and
+            last_inputs is not None and
+            last_inputs[0] is field_dict and
+            last_inputs[1:] == inputs[1:]
+        ):
+            return entry
+
+        self._inputs[entry_key] = inputs
+        digest = _input_hash(interface_name, field_dict, options)
+
+        if entry is not None and entry['hash'] == digest:
+            return entry
+
+        interface_aliases = {}
+        entry = self.entries[entry_key] = {
+            'hash': digest,
+            'text': compile_renderer(options)(
+                interface_name,
+                field_dict,
+                interface_aliases,
+            ),
+            'aliases': interface_aliases,
+        }
+        self.rendered.append(interface_name)
+
+        return entry
+
+    def render_interface(self, interface_name, field_dict, indentation=2,
+                         newline='\n', options=None, aliases=None,
+                         path=None):
+        """
+        Return the same text as base.generate_interface, re-using the text
+        from the manifest if the types have not changed. An `aliases`
+        dictionary can be given to collect the aliases for wide unions in,
+        as for a renderer from base.compile_renderer. The `path` of the
+        file the interface is for keeps it apart from interfaces with the
+        same name in other files.
+        """
+        # pylint: disable=too-many-arguments
+        options = _render_options(indentation, newline, options)
+        entry = self._entry(
+            _entry_key(path, interface_name),
+            interface_name,
+            field_dict,
+            options,
+        )
+        entry_aliases = entry.get('aliases', {})
+
+        if aliases is not None:
+            _merge_aliases(aliases, six.iteritems(entry_aliases))
+
+            return entry['text']
+
+        return entry['text'] + ''.join(
+            options.newline + text
+            for text in alias_texts(entry_aliases)
+        )
+
+    def generate_interfaces(self, python_types, indentation=2, newline='\n',
+                            options=None, path=None, aliases=None):
+        """
+        Return the same text as base.generate_interfaces, re-using text
+        from the manifest for unchanged interfaces. The `path` of the file
+        the text is for can be given, as for render_interface, and an
+        `aliases` dictionary, as for base.iter_interfaces.
+        """
+        # pylint: disable=too-many-arguments
+        options = _render_options(indentation, newline, options)
+        collect_aliases = aliases is not None
+        aliases = aliases if collect_aliases else {}
+
+        return ''.join(join_interfaces(
+            itertools.chain(
+                (
+                    self.render_interface(
+                        interface_name,
+                        field_dict,
+                        options=options,
+                        aliases=aliases,
+                        path=path,
+                    )
+                    for interface_name, field_dict in python_types
+                ),
+                () if collect_aliases else alias_texts(aliases),
+            ),
+            options.newline,
+        ))
+
+
+def write_interface_files(files, manifest_path, indentation=2, newline='\n',
+                          options=None):
+    """
+    Write TypeScript files from a dictionary mapping file paths to python
+    types in the format generate_interfaces accepts.
+
+    Only interfaces with changed types are rendered, and only files with
+    changed content are written. Return a sorted list of written paths.
+    """
+    manifest = InterfaceManifest.load(manifest_path)
+    interface_names = set()
+    written_paths = []
+
+    for path, python_types in sorted(six.iteritems(files)):
+        python_types = list(python_types)
+        interface_names.update((path, name) for name, _ in python_types)
+        content = manifest.generate_interfaces(
+            python_types,
+            indentation,
+            newline,
+            options,
+            path,
+        )
+
+        if write_if_changed(path, content):
+            written_paths.append(path)
+
+    manifest.prune(interface_names)
+    manifest.save(manifest_path)
+
+    return written_paths
@@ -0,0 +1,416 @@
+"""
+An intermediate representation for TypeScript types.
+
+Python types are converted into trees of immutable nodes, which are then
+rendered to TypeScript at the end. Nodes are hash-consed, so building a
+node equal to an existing node returns the existing node. Identical
+subtrees are shared, nodes can be compared by identity, and the text for
+each distinct node is only ever rendered once.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals  # isort:skip # noqa
+
+import hashlib
+import json
+import weakref
+
+import six
+
+# Every node which currently exists, keyed by the class and arguments.
+_nodes = weakref.WeakValueDictionary()
+
+
+class TypeNode(object):
+    """
+    The base class for all nodes.
+    """
+    __slots__ = ('_args', '_text', '_contains_union', '__weakref__')
+
+    def __new__(cls, *args):
+        key = (cls,) + args
+        node = _nodes.get(key)
+
+        if node is None:
+            node = object.__new__(cls)
+            node._args = args
+            node._text = None
+            node._contains_union = False
+            node = _nodes.setdefault(key, node)
+
+        return node
+
+    def __reduce__(self):
+        return (type(self), self._args)
+
+    def __repr__(self):
+        return '{}({})'.format(
+            type(self).__name__,
+            ', '.join(repr(arg) for arg in self._args),
+        )
+
+    @property
+    def children(self):
+        """
+        The nodes directly inside of this node.
+        """
+        return ()
+
+    def with_children(self, children):  # pylint: disable=unused-argument
+        """
+        Create a node like this one, with different nodes inside of it.
+        """
+        return self
+
+    def _render(self):  # pragma: no cover
+        raise NotImplementedError
+
+
+class Primitive(TypeNode):
+    """
+    A built in type, like `string` or `null`.
+    """
+    __slots__ = ()
+
+    @property
+    def name(self):
+        return self._args[0]
+
+    def _render(self):
+        return self.name, False
+
+
+class Reference(TypeNode):
+    """
+    A reference to another type by name, like the name of an interface.
+    """
+    __slots__ = ()
+
+    @property
+    def name(self):
+        return self._args[0]
+
+    def _render(self):
+        # Names given by users can contain anything, including unions.
+        return self.name, '|' in self.name
+
+
+class Literal(TypeNode):
+    """
+    A literal value, like `"red"` or `3`. Create literals with `literal()`.
+    """
+    __slots__ = ()
+
+    @property
+    def text(self):
+        return self._args[0]
+
+    @property
+    def value(self):
+        return json.loads(self.text)
+
+    @property
+    def primitive(self):
+        """
+        The primitive type which includes this literal.
+        """
+        if self.text.startswith('"'):
+            return STRING
+
+        if self.text in ('true', 'false'):
+            return BOOLEAN
+
+        return NUMBER
+
+    def _render(self):
+        return self.text, False
+
+
+class Array(TypeNode):
+    """
+    An array of some type, like `string[]`.
+    """
+    __slots__ = ()
+
+    @property
+    def item(self):
+        return self._args[0]
+
+    @property
+    def children(self):
+        return self._args
+
+    def with_children(self, children):
+        return Array(*children)
+
+    def _render(self):
+        # pylint: disable=protected-access
+        item_text = render(self.item)
+
+        if self.item._contains_union:
+            return '(' + item_text + ')[]', True
+
+        return item_text + '[]', False
+
+
+class Tuple(TypeNode):
+    """
+    A tuple of types with a fixed length, like `[number, string]`.
+    """
+    __slots__ = ()
+
+    @property
+    def items(self):
+        return self._args
+
+    @property
+    def children(self):
+        return self._args
+
+    def with_children(self, children):
+        return Tuple(*children)
+
+    def _render(self):
+        # pylint: disable=protected-access
+        return (
+            '[' + ', '.join(render(item) for item in self.items) + ']',
+            any(item._contains_union for item in self.items),
+        )
+
+
+class Map(TypeNode):
+    """
+    An object with string keys and values of some type.
+    """
+    __slots__ = ()
+
+    @property
+    def value(self):
+        return self._args[0]
+
+    @property
+    def children(self):
+        return self._args
+
+    def with_children(self, children):
+        return Map(*children)
+
+    def _render(self):
+        # pylint: disable=protected-access
+        return (
+            '{[key: string]: ' + render(self.value) + '}',
+            self.value._contains_union,
+        )
+
+
+def _union_sort_key(text):
+    # Sort types, and put null last
+    return (text == 'null', text)
+
+
+class Union(TypeNode):
+    """
+    A union of two or more types. Create unions with `union()`.
+    """
+    __slots__ = ()
+
+    @property
+    def members(self):
+        return self._args[0]
+
+    @property
+    def children(self):
+        return tuple(self.members)
+
+    def with_children(self, children):
+        return union(children)
+
+    def _render(self):
+        texts = sorted(
+            set(render(member) for member in self.members),
+            key=_union_sort_key,
+        )
+
+        return ' | '.join(texts), len(texts) > 1
+
+
+ANY = Primitive('any')
+BOOLEAN = Primitive('boolean')
+NULL = Primitive('null')
+NUMBER = Primitive('number')
+OBJECT = Primitive('object')
+STRING = Primitive('string')
+
+PRIMITIVES = {node.name: node for node in (
+    ANY,
+    BOOLEAN,
+    NULL,
+    NUMBER,
+    OBJECT,
+    STRING,
+)}
+
+
+def name_node(name):
+    """
+    Create a node for a type name given as a string.
+    """
+    return PRIMITIVES.get(name) or Reference(name)
+
+
+# The types of values which can be written as TypeScript literals.
+LITERAL_TYPES = (bool, float, six.text_type) + six.integer_types
+
+
+def literal(value):
+    """
+    Create a node for a literal value. None is null, and values which
+    can't be written as literals are any.
+    """
+    if value is None:
+        return NULL
+
+    if not isinstance(value, LITERAL_TYPES):
+        return ANY
+
+    # Literals are keyed by their JSON text, so True and 1 are different.
+    return Literal(json.dumps(value))
+
+
+# Nodes for values which are always objects in TypeScript.
+_OBJECT_TYPES = (Array, Map, Tuple)
+
+
+def _subsumed(node, members):
+    if isinstance(node, Literal):
+        return node.primitive in members
+
+    return OBJECT in members and isinstance(node, _OBJECT_TYPES)
+
+
+def union(nodes):
+    """
+    Create a node for a union of nodes, flattening nested unions.
+    A union of one node is just that node.
+
+    Members which are included in other members are removed. `any`
+    includes everything, `object` includes arrays, tuples and maps, and
+    primitives like `string` include their literals.
+    """
+    members = set()
+
+    for node in nodes:
+        if isinstance(node, Union):
+            members.update(node.members)
+        else:
+            members.add(node)
+
+    if ANY in members:
+        return ANY
+
+    members = [node for node in members if not _subsumed(node, members)]
+
+    if len(members) == 1:
+        return members[0]
+
+    return Union(frozenset(members))
+
+
+def render(node):
+    """
+    Render the TypeScript text for a node.
+    """
+    # Rendering fills in the text cached on each node.
+    # pylint: disable=protected-access
+    text = node._text
+
+    if text is None:
+        text, node._contains_union = node._render()
+        node._text = text
+
+    return text
+
+
+def transform(node, func, cache=None):
+    """
+    Rebuild a node bottom up, replacing every node inside of it, and then
+    the node itself, with func(node). Results for nodes are stored in the
+    `cache` dictionary, if given, so shared subtrees are only visited once.
+    """
+    if cache is None:
+        cache = {}
+
+    try:
+        return cache[node]
+    except KeyError:
+        pass
+
+    children = node.children
+    new_children = tuple(transform(child, func, cache) for child in children)
+
+    result = func(
+        node.with_children(new_children)
+        if any(new is not old for new, old in zip(new_children, children)) else
+        node
+    )
+    cache[node] = result
+
+    return result
+
+
+def alias_name(node):
+    """
+    Return a name for a type alias for a node, based on the text for it,
+    which is the same every time.
+    """
+    digest = hashlib.sha1(render(node).encode('utf-8')).hexdigest()
+
+    return type(node).__name__ + digest[:8]
+
+
+def collapse_unions(node, max_width, aliases):
+    """
+    Replace unions with more than `max_width` members, not counting
+    `null`, with references to type aliases. `aliases` is updated with
+    {alias_name: union_node} for every alias used, including aliases used
+    inside other aliases. ValueError is raised if two unions are given the
+    same alias name.
+    """
+    def collapse(node):
+        if not isinstance(node, Union):
+            return node
+
+        members = [member for member in node.members if member is not NULL]
+
+        if len(members) <= max_width:
+            return node
+
+        alias_node = union(members)
+        name = alias_name(alias_node)
+
+        if aliases.setdefault(name, alias_node) != alias_node:
+            raise ValueError(
+                'Two unions have the same alias name {}'.format(name),
+            )
+
+        reference = Reference(name)
+
+        return union([reference, NULL]) if NULL in node.members else reference
+
+    return transform(node, collapse)
+
+
+def walk(node):
+    """
+    Generate a node and every node inside of it, each distinct node once.
+    """
+    seen = set()
+    stack = [node]
+
+    while stack:
+        node = stack.pop()
+
+        if node not in seen:
+            seen.add(node)
+
+            yield node
+
+            stack.extend(node.children)
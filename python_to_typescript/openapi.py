@@ -0,0 +1,441 @@
+"""
+Functions for generating TypeScript interfaces from the schemas in an
+exported OpenAPI or JSON Schema document, without Django.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals  # isort:skip # noqa
+
+import json
+import os
+import re
+from collections import OrderedDict
+
+import six
+
+from . import ir
+from .base import OptionalMember, generate_interfaces
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover
+    ijson = None
+
+# Where schemas are kept, for OpenAPI 3, OpenAPI 2 and JSON Schema.
+SCHEMA_PATHS = (
+    ('components', 'schemas'),
+    ('definitions',),
+    ('$defs',),
+)
+
+_PRIMITIVE_NODES = {
+    'boolean': ir.BOOLEAN,
+    'integer': ir.NUMBER,
+    'null': ir.NULL,
+    'number': ir.NUMBER,
+    'string': ir.STRING,
+}
+
+# The keys schemas are kept under, which aren't part of a root schema.
+_SCHEMA_CONTAINERS = frozenset(path[0] for path in SCHEMA_PATHS)
+
+# Keys which show a JSON Schema document is a schema itself.
+_SCHEMA_KEYWORDS = frozenset([
+    '$ref',
+    'allOf',
+    'anyOf',
+    'const',
+    'enum',
+    'items',
+    'oneOf',
+    'prefixItems',
+    'properties',
+    'type',
+])
+
+_WORD_RE = re.compile(r'[A-Za-z0-9]+')
+
+
+def _is_schema_document(keys):
+    return (
+        not keys & {'openapi', 'swagger'}
+        and bool(keys & _SCHEMA_KEYWORDS)
+    )
+
+
+def _read_schemas_with_ijson(fp):
+    schemas = OrderedDict()
+
+    for path in SCHEMA_PATHS:
+        fp.seek(0)
+        schemas = OrderedDict(
+            ijson.kvitems(fp, '.'.join(path), use_float=True),
+        )
+
+        if schemas:
+            break
+
+    # The keys are read first, so the rest of an OpenAPI document is
+    # never kept in memory.
+    fp.seek(0)
+    keys = set(
+        value
+        for prefix, event, value in ijson.parse(fp)
+        if prefix == '' and event == 'map_key'
+    )
+    root_schema = None
+
+    if _is_schema_document(keys):
+        fp.seek(0)
+        root_schema = OrderedDict(
+            (key, value)
+            for key, value in ijson.kvitems(fp, '', use_float=True)
+            if key not in _SCHEMA_CONTAINERS
+        )
+
+    return schemas, root_schema
+
+
+def _read_schemas_with_json(fp):
+    document = json.loads(
+        fp.read().decode('utf-8'),
+        object_pairs_hook=OrderedDict,
+    )
+    schemas = OrderedDict()
+
+    for path in SCHEMA_PATHS:
+        schemas = document
+
+        for key in path:
+            schemas = schemas.get(key, {})
+
+        if schemas:
+            break
+
+    root_schema = None
+
+    if _is_schema_document(set(document)):
+        root_schema = OrderedDict(
+            (key, value)
+            for key, value in six.iteritems(document)
+            if key not in _SCHEMA_CONTAINERS
+        )
+
+    return schemas, root_schema
+
+
+def _root_schema_name(root_schema, fp):
+    name = root_schema.get('title')
+
+    if not isinstance(name, six.string_types):
+        path = getattr(fp, 'name', None)
+        name = (
+            os.path.splitext(os.path.basename(path))[0]
+            if isinstance(path, six.string_types) else
+            ''
+        )
+
+    return _pascal_case(name) or 'Schema'
+
+
+def read_schemas(fp):
+    """
+    Read an OrderedDict mapping names to schemas from a binary file with
+    an OpenAPI or JSON Schema document, in the order they are defined.
+
+    A JSON Schema document which is a schema itself comes first, named
+    after its title, or the name of the file.
+
+    If ijson is installed, and the file can be seeked, the document is
+    parsed as a stream, and only the schemas are kept in memory.
+    """
+    if ijson is not None and fp.seekable():
+        schemas, root_schema = _read_schemas_with_ijson(fp)
+    else:
+        schemas, root_schema = _read_schemas_with_json(fp)
+
+    if root_schema is None:
+        return OrderedDict(schemas)
+
+    name = _root_schema_name(root_schema, fp)
+    unique_name = name
+    index = 1
+
+    while unique_name in schemas:
+        index += 1
+        unique_name = '{}{}'.format(name, index)
+
+    all_schemas = OrderedDict([(unique_name, root_schema)])
+    all_schemas.update(schemas)
+
+    return all_schemas
+
+
+def _pascal_case(text):
+    return ''.join(
+        word[:1].upper() + word[1:]
+        for word in _WORD_RE.findall(text)
+    )
+
+
+class SchemaConverter(object):
+    """
+    Convert schemas into python types in the format generate_interfaces
+    accepts, with ir nodes for types.
+
+    Schemas for objects become interfaces, and other schemas become type
+    aliases. Objects defined inside of other schemas are given their own
+    interfaces, named after where they are defined. Each `$ref` is only
+    resolved once.
+    """
+    def __init__(self, schemas):
+        self.schemas = schemas
+        self._ref_nodes = {}
+        self._names = set(schemas)
+        self._python_types = []
+        self._schemas_added = False
+
+    def _ref_schema(self, ref):
+        if not ref.startswith('#/'):
+            return None
+
+        parts = [
+            part.replace('~1', '/').replace('~0', '~')
+            for part in ref[2:].split('/')
+        ]
+
+        for path in SCHEMA_PATHS:
+            if tuple(parts[:len(path)]) == path:
+                parts = parts[len(path):]
+                break
+        else:
+            return None
+
+        schema = self.schemas
+
+        for part in parts:
+            if isinstance(schema, list) and part.isdigit():
+                schema = schema[int(part)]
+            elif isinstance(schema, dict) and part in schema:
+                schema = schema[part]
+            else:
+                return None
+
+        return parts, schema
+
+    def ref_node(self, ref):
+        """
+        Return the node for a `$ref`. References to named schemas become
+        references to their interfaces by name.
+        """
+        try:
+            return self._ref_nodes[ref]
+        except KeyError:
+            pass
+
+        # Schemas referencing themselves are typed as any where they recur.
+        self._ref_nodes[ref] = ir.ANY
+        found = self._ref_schema(ref)
+
+        if found is None:
+            node = ir.ANY
+        elif len(found[0]) == 1:
+            node = ir.Reference(found[0][0])
+        else:
+            node = self.node(found[1], _pascal_case(' '.join(found[0])))
+
+        self._ref_nodes[ref] = node
+
+        return node
+
+    def _is_object(self, schema):
+        if not isinstance(schema, dict):
+            return False
+
+        return 'properties' in schema or any(
+            self._is_object(self._resolve(item))
+            for item in schema.get('allOf', ())
+        )
+
+    def _resolve(self, schema):
+        if isinstance(schema, dict) and '$ref' in schema:
+            found = self._ref_schema(schema['$ref'])
+            schema = found[1] if found is not None else {}
+
+        # Boolean schemas have no properties.
+        return schema if isinstance(schema, dict) else {}
+
+    def _properties(self, schema, seen=()):
+        # Merge the properties for allOf, for inheritance.
+        properties = OrderedDict()
+        required = set(schema.get('required', ()))
+
+        for item in schema.get('allOf', ()):
+            if id(item) not in seen:
+                item_properties, item_required = self._properties(
+                    self._resolve(item),
+                    seen + (id(item),),
+                )
+                properties.update(item_properties)
+                required.update(item_required)
+
+        properties.update(schema.get('properties', {}))
+
+        return properties, required
+
+    def fields(self, schema, name):
+        """
+        Return a dictionary of field types for a schema for an object.
+        Fields which aren't required are wrapped in OptionalMember.
+        """
+        properties, required = self._properties(schema)
+        fields = {}
+
+        for property_name, property_schema in six.iteritems(properties):
+            # Properties with the schema `false` can never be set.
+            if property_schema is False or (
+                isinstance(property_schema, dict)
+                and property_schema.get('writeOnly')
+            ):
+                continue
+
+            node = self.node(
+                property_schema,
+                name + _pascal_case(property_name),
+            )
+            fields[property_name] = (
+                node
+                if property_name in required else
+                OptionalMember(node)
+            )
+
+        return fields
+
+    def _add_interface(self, name, schema):
+        # Interfaces are added before the interfaces for objects inside
+        # them, so the output follows the order of the document.
+        self._python_types.append((name, None))
+        index = len(self._python_types) - 1
+        self._python_types[index] = (name, self.fields(schema, name))
+
+    def _nested_interface(self, name, schema):
+        # Names for interfaces made for nested objects can clash with
+        # names for other schemas.
+        unique_name = name
+        index = 1
+
+        while unique_name in self._names:
+            index += 1
+            unique_name = '{}{}'.format(name, index)
+
+        self._names.add(unique_name)
+        self._add_interface(unique_name, schema)
+
+        return ir.Reference(unique_name)
+
+    def _type_nodes(self, schema, name):
+        schema_type = schema.get('type')
+
+        if 'enum' in schema:
+            return [ir.literal(value) for value in schema['enum']]
+
+        if 'const' in schema:
+            return [ir.literal(schema['const'])]
+
+        for key in ('oneOf', 'anyOf'):
+            if key in schema:
+                return [
+                    self.node(item, name + 'Option')
+                    for item in schema[key]
+                ]
+
+        if self._is_object(schema):
+            return [self._nested_interface(name, schema)]
+
+        if 'allOf' in schema:
+            return [self.node(item, name) for item in schema['allOf']]
+
+        if isinstance(schema_type, list):
+            return [
+                self.node(dict(schema, type=item_type), name)
+                for item_type in schema_type
+            ]
+
+        if schema_type == 'array':
+            items = schema.get('prefixItems', schema.get('items'))
+
+            if isinstance(items, list):
+                return [ir.Tuple(*(
+                    self.node(item, name + 'Item')
+                    for item in items
+                ))]
+
+            return [ir.Array(
+                self.node(items, name + 'Item')
+                if items is not None else
+                ir.ANY
+            )]
+
+        if schema_type == 'object':
+            additional = schema.get('additionalProperties')
+
+            if isinstance(additional, dict):
+                return [ir.Map(self.node(additional, name + 'Value'))]
+
+            return [ir.OBJECT]
+
+        return [_PRIMITIVE_NODES.get(schema_type, ir.ANY)]
+
+    def node(self, schema, name):
+        """
+        Return an ir node for a schema. `name` is used for the names of
+        interfaces made for objects defined inside of the schema.
+        """
+        # The boolean schema `true` accepts anything, and `false` accepts
+        # nothing, which can't be written in an interface either.
+        if isinstance(schema, bool):
+            return ir.ANY
+
+        if '$ref' in schema:
+            node = self.ref_node(schema['$ref'])
+        else:
+            node = ir.union(self._type_nodes(schema, name))
+
+        # OpenAPI 3.0 uses nullable instead of a null type.
+        if schema.get('nullable'):
+            node = ir.union([node, ir.NULL])
+
+        return node
+
+    def python_types(self):
+        """
+        Return a list of (name, field_dict_or_type) pairs for the schemas,
+        followed by the interfaces made for nested objects.
+        """
+        if not self._schemas_added:
+            self._schemas_added = True
+
+            for name, schema in six.iteritems(self.schemas):
+                if self._is_object(schema):
+                    self._add_interface(name, schema)
+                else:
+                    self._python_types.append((
+                        name,
+                        self.node(schema, name),
+                    ))
+
+        return self._python_types
+
+
+def openapi_python_types(fp):
+    """
+    Read the schemas from a binary file with an OpenAPI or JSON Schema
+    document, and return python types for generate_interfaces.
+    """
+    return SchemaConverter(read_schemas(fp)).python_types()
+
+
+def generate_interfaces_from_openapi(fp, options=None):
+    """
+    Generate TypeScript interfaces for every schema in a binary file with
+    an OpenAPI or JSON Schema document.
+    """
+    return generate_interfaces(openapi_python_types(fp), options=options)
@@ -0,0 +1,148 @@
+"""
+Functions for generating TypeScript interfaces for many serializers at once
+with a pool of processes. Python 3.7 or later is required.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals  # isort:skip # noqa
+
+import os
+
+from . import schema_store
+from .base import iter_interfaces
+from .drf import (
+    _depth_serializer,
+    _is_depth_serializer,
+    _serializer_key,
+    _uniq_classes,
+    serializer_schema,
+    walk_serializers,
+)
+
+try:
+    from concurrent.futures import ProcessPoolExecutor
+except ImportError:  # pragma: no cover
+    ProcessPoolExecutor = None
+
+
+def _setup_worker():
+    """
+    Set up Django once in each worker process.
+    """
+    # Forked workers inherit the SQLite connection for the schema_store,
+    # which can't be shared between processes, so workers don't use it.
+    schema_store.disable()
+
+    if os.environ.get('DJANGO_SETTINGS_MODULE'):
+        import django
+
+        django.setup()
+
+
+def _cpu_count():
+    # os.cpu_count was added in Python 3.4.
+    cpu_count = getattr(os, 'cpu_count', None)
+
+    return cpu_count() if cpu_count is not None else None
+
+
+def _chunk_size(item_count, max_workers):
+    # Send a few chunks to each worker, so work is spread out evenly
+    # without pickling each serializer class separately.
+    return max(1, item_count // ((max_workers or _cpu_count() or 1) * 4))
+
+
+def _worker_schema(serializer_class):
+    # The classes ModelSerializer builds for Meta.depth are local classes,
+    # which can't be pickled, so they are sent back as their keys.
+    schema = serializer_schema(serializer_class)
+
+    return schema._replace(nested_serializers=tuple(
+        _serializer_key(nested_class)
+        if _is_depth_serializer(nested_class) else
+        nested_class
+        for nested_class in schema.nested_serializers
+    ))
+
+
+def serializer_schemas_parallel(serializer_classes, max_workers=None):
+    """
+    Build the schemas for serializer classes and every serializer nested
+    inside of them in a pool of processes, and return a dictionary mapping
+    each class to its SerializerSchema.
+
+    The serializer classes must be importable by the worker processes.
+    Serializers built for Meta.depth are built again in this process.
+    """
+    schemas = {}
+    depth_classes = {}
+    pending = list(_uniq_classes(serializer_classes))
+
+    def nested_class_for(class_or_key):
+        if isinstance(class_or_key, tuple):
+            if class_or_key not in depth_classes:
+                depth_classes[class_or_key] = _depth_serializer(*class_or_key)
+
+            return depth_classes[class_or_key]
+
+        return class_or_key
+
+    with ProcessPoolExecutor(max_workers, initializer=_setup_worker) as pool:
+        while pending:
+            # Serializers for Meta.depth are only built from models, so
+            # their schemas are built here without a worker.
+            for serializer_class in pending:
+                if _is_depth_serializer(serializer_class):
+                    schemas[serializer_class] = serializer_schema(
+                        serializer_class,
+                    )
+
+            pending = [
+                serializer_class
+                for serializer_class in pending
+                if serializer_class not in schemas
+            ]
+            results = pool.map(
+                _worker_schema,
+                pending,
+                chunksize=_chunk_size(len(pending), max_workers),
+            )
+
+            for serializer_class, schema in zip(pending, results):
+                schemas[serializer_class] = schema._replace(
+                    nested_serializers=tuple(
+                        nested_class_for(class_or_key)
+                        for class_or_key in schema.nested_serializers
+                    ),
+                )
+
+            pending = list(_uniq_classes(
+                nested_class
+                for schema in schemas.values()
+                for nested_class in schema.nested_serializers
+                if nested_class not in schemas
+            ))
+
+    return schemas
+
+
+def generate_interfaces_from_serializers_parallel(
+    serializer_classes,
+    max_workers=None,
+    options=None,
+):
+    """
+    Generate the same output as drf.generate_interfaces_from_serializers,
+    while introspecting serializers in a pool of processes.
+    """
+    serializer_classes = list(serializer_classes)
+    schemas = serializer_schemas_parallel(serializer_classes, max_workers)
+
+    return ''.join(iter_interfaces(
+        (
+            (schema.name, schema.field_types)
+            for schema in walk_serializers(
+                serializer_classes,
+                schemas.__getitem__,
+            )
+        ),
+        options=options,
+    ))
@@ -0,0 +1,293 @@
+"""
+Optional instrumentation for finding where time is spent generating
+interfaces.
+
+Profiling is disabled by default, and costs almost nothing while disabled.
+
+For example:
+>>> profile = enable()
+>>> generate_interfaces_from_serializers(serializer_classes)
+>>> disable()
+>>> print(profile.report())
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals  # isort:skip # noqa
+
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+import six
+
+# The most precise clock available.
+timer = getattr(time, 'perf_counter', time.time)
+
+PhaseStats = namedtuple('PhaseStats', ['calls', 'seconds'])
+CacheStats = namedtuple('CacheStats', ['hits', 'misses'])
+
+# Functions returning CacheInfo for caches, keyed by the cache names.
+_caches = OrderedDict()
+
+# The Profile collecting timings, or None if profiling is disabled.
+active = None
+
+
+def register_cache(name, cache_info):
+    """
+    Register a function returning CacheInfo for a cache, so profiles can
+    report the hit rate for the cache.
+    """
+    _caches[name] = cache_info
+
+
+def _hit_rate(stats):
+    lookups = stats.hits + stats.misses
+
+    return stats.hits / lookups if lookups else 0.0
+
+
+class _NullContext(object):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+
+_NULL_CONTEXT = _NullContext()
+
+
+class _DisabledProfile(object):
+    """
+    A Profile which records nothing, for when profiling is disabled.
+    """
+    def phase(self, name):  # pylint: disable=unused-argument
+        return _NULL_CONTEXT
+
+    def serializer(self, cls):  # pylint: disable=unused-argument
+        return _NULL_CONTEXT
+
+    def timed(self, name, func):  # pylint: disable=unused-argument
+        return func
+
+
+_DISABLED_PROFILE = _DisabledProfile()
+
+
+class _Phase(object):
+    def __init__(self, profile, name):
+        self.profile = profile
+        self.name = name
+        self.start = None
+        self.child_seconds = 0.0
+
+    def __enter__(self):
+        self.profile._stack().append(self)
+        self.start = timer()
+
+        return self
+
+    def __exit__(self, *args):
+        seconds = timer() - self.start
+        stack = self.profile._stack()
+        stack.pop()
+
+        # Time spent in nested phases is only counted for those phases.
+        if stack:
+            stack[-1].child_seconds += seconds
+
+        self.profile.add(self.name, seconds - self.child_seconds)
+
+
+class _SerializerTimer(object):
+    def __init__(self, profile, cls):
+        self.profile = profile
+        self.cls = cls
+        self.start = None
+
+    def __enter__(self):
+        self.start = timer()
+
+        return self
+
+    def __exit__(self, *args):
+        self.profile.add_serializer(self.cls, timer() - self.start)
+
+
+class Profile(object):
+    """
+    Counters and timers for the phases of generating interfaces, and the
+    time spent introspecting each serializer class.
+
+    Times for phases exclude the time spent in phases nested inside them,
+    so the times for all phases add up to the total time measured.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._phases = {}
+        self._serializers = {}
+        self._cache_start = {
+            name: cache_info()
+            for name, cache_info in six.iteritems(_caches)
+        }
+
+    def _stack(self):
+        try:
+            return self._local.stack
+        except AttributeError:
+            stack = self._local.stack = []
+
+            return stack
+
+    def add(self, name, seconds):
+        """
+        Record one call for a phase taking some number of seconds.
+        """
+        with self._lock:
+            calls, total_seconds = self._phases.get(name, (0, 0.0))
+            self._phases[name] = PhaseStats(calls + 1, total_seconds + seconds)
+
+    def add_serializer(self, cls, seconds):
+        """
+        Record the time spent introspecting a serializer class.
+        """
+        with self._lock:
+            self._serializers[cls] = self._serializers.get(cls, 0.0) + seconds
+
+    def phase(self, name):
+        """
+        Return a context manager recording the time spent in a phase.
+        """
+        return _Phase(self, name)
+
+    def serializer(self, cls):
+        """
+        Return a context manager recording the time spent on a serializer.
+        """
+        return _SerializerTimer(self, cls)
+
+    def timed(self, name, func):
+        """
+        Wrap a function so every call is recorded as a phase.
+        """
+        def wrapper(*args):
+            with self.phase(name):
+                return func(*args)
+
+        return wrapper
+
+    @property
+    def phases(self):
+        """
+        A dictionary mapping phase names to PhaseStats.
+        """
+        with self._lock:
+            return dict(self._phases)
+
+    def cache_stats(self):
+        """
+        Return a dictionary mapping cache names to CacheStats for the hits
+        and misses since the profile was created.
+        """
+        stats = {}
+
+        for name, cache_info in six.iteritems(_caches):
+            info = cache_info()
+            start_info = self._cache_start.get(name)
+            stats[name] = (
+                CacheStats(
+                    info.hits - start_info.hits,
+                    info.misses - start_info.misses,
+                )
+                if start_info is not None else
+                CacheStats(info.hits, info.misses)
+            )
+
+        return stats
+
+    def slowest_serializers(self, count=10):
+        """
+        Return up to `count` (serializer_class, seconds) pairs for the
+        serializers which took the longest to introspect, slowest first.
+        """
+        with self._lock:
+            items = list(six.iteritems(self._serializers))
+
+        items.sort(key=lambda item: (-item[1], item[0].__name__))
+
+        return items[:count]
+
+    def report(self, count=10):
+        """
+        Return a plain text report of the phases, cache hit rates, and the
+        slowest serializers.
+        """
+        lines = ['{:<40} {:>8} {:>12}'.format('phase', 'calls', 'seconds')]
+
+        for name, stats in sorted(six.iteritems(self.phases)):
+            lines.append('{:<40} {:>8} {:>12.6f}'.format(
+                name,
+                stats.calls,
+                stats.seconds,
+            ))
+
+        lines.append('')
+        lines.append('{:<40} {:>8} {:>8} {:>8}'.format(
+            'cache',
+            'hits',
+            'misses',
+            'rate',
+        ))
+
+        for name, stats in sorted(six.iteritems(self.cache_stats())):
+            lines.append('{:<40} {:>8} {:>8} {:>7.1f}%'.format(
+                name,
+                stats.hits,
+                stats.misses,
+                _hit_rate(stats) * 100,
+            ))
+
+        serializers = self.slowest_serializers(count)
+
+        if serializers:
+            lines.append('')
+            lines.append('{:<53} {:>12}'.format('serializer', 'seconds'))
+
+            for cls, seconds in serializers:
+                lines.append('{:<53} {:>12.6f}'.format(
+                    '{}.{}'.format(cls.__module__, cls.__name__),
+                    seconds,
+                ))
+
+        return '\n'.join(lines) + '\n'
+
+
+def current():
+    """
+    Return the active Profile, or a profile which records nothing if
+    profiling is disabled.
+    """
+    return active if active is not None else _DISABLED_PROFILE
+
+
+def enable():
+    """
+    Start collecting timings in a new Profile, and return it.
+    """
+    global active  # pylint: disable=global-statement
+
+    active = Profile()
+
+    return active
+
+
+def disable():
+    """
+    Stop collecting timings, and return the Profile which was active.
+    """
+    global active  # pylint: disable=global-statement
+
+    profile = active
+    active = None
+
+    return profile
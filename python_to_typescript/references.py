@@ -0,0 +1,155 @@
+"""
+Functions for finding which interfaces reference which, so only the
+interfaces needed for some root interfaces have to be generated.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals  # isort:skip # noqa
+
+import re
+
+import six
+
+from . import ir
+from .base import OptionalMember, is_interface_fields, type_node
+
+# Names in references, like Book in 'Book[]'.
+_NAME_RE = re.compile(r'[A-Za-z_$][\w$]*')
+
+
+def _member_types(type_or_fields):
+    if not is_interface_fields(type_or_fields):
+        return [type_or_fields]
+
+    return [
+        type_or_tuple.type
+        if isinstance(type_or_tuple, OptionalMember) else
+        type_or_tuple
+        for type_or_tuple in six.itervalues(type_or_fields)
+    ]
+
+
+def referenced_names(type_or_fields):
+    """
+    Return a set of the names referenced by the types for an interface,
+    or by a type for a type alias.
+    """
+    names = set()
+
+    for some_type in _member_types(type_or_fields):
+        for node in ir.walk(type_node(some_type)):
+            if isinstance(node, ir.Reference):
+                names.update(_NAME_RE.findall(node.name))
+
+    return names
+
+
+def dependency_graph(python_types):
+    """
+    Return a dictionary mapping the name of each interface to the sorted
+    names of the other interfaces in python_types it references.
+
+    A ValueError will be raised if two interfaces have the same name.
+    """
+    python_types = list(python_types)
+    names = set()
+
+    for name, _ in python_types:
+        if name in names:
+            raise ValueError('More than one interface is named ' + name)
+
+        names.add(name)
+
+    return {
+        name: sorted((referenced_names(type_or_fields) & names) - {name})
+        for name, type_or_fields in python_types
+    }
+
+
+def _walk_graph(graph, names):
+    # Every name reachable from some names, including the names.
+    reached = set()
+    stack = list(names)
+
+    while stack:
+        name = stack.pop()
+
+        if name not in reached:
+            reached.add(name)
+            stack.extend(graph[name])
+
+    return reached
+
+
+class ReferenceGraph(object):
+    """
+    The references between interfaces, and an index of the references in
+    reverse, so both what an interface uses and what uses an interface can
+    be found quickly.
+
+    A ValueError will be raised if two interfaces have the same name.
+    """
+    def __init__(self, python_types):
+        self.graph = dependency_graph(python_types)
+        self.reverse_graph = {name: [] for name in self.graph}
+
+        for name, other_names in sorted(six.iteritems(self.graph)):
+            for other_name in other_names:
+                self.reverse_graph[other_name].append(name)
+
+    def _check_names(self, names):
+        for name in names:
+            if name not in self.graph:
+                raise ValueError('No interface is named ' + name)
+
+    def references(self, name):
+        """
+        Return the sorted names of the interfaces an interface references.
+        """
+        self._check_names([name])
+
+        return self.graph[name]
+
+    def dependents(self, name):
+        """
+        Return the sorted names of the interfaces which reference an
+        interface.
+        """
+        self._check_names([name])
+
+        return self.reverse_graph[name]
+
+    def reachable(self, roots):
+        """
+        Return a set of the names of the root interfaces, and every
+        interface they reference directly or indirectly.
+        """
+        self._check_names(roots)
+
+        return _walk_graph(self.graph, roots)
+
+    def affected(self, names):
+        """
+        Return a set of the names of some interfaces, and every interface
+        which references them directly or indirectly, such as the
+        interfaces which could change when the given interfaces change.
+        """
+        self._check_names(names)
+
+        return _walk_graph(self.reverse_graph, names)
+
+
+def tree_shake(python_types, roots):
+    """
+    Return a list of the python types needed for some root interfaces,
+    which are the roots and every interface they reference, in the order
+    they were given in.
+
+    A ValueError will be raised if any root isn't in python_types.
+    """
+    python_types = list(python_types)
+    reachable = ReferenceGraph(python_types).reachable(roots)
+
+    return [
+        (name, type_or_fields)
+        for name, type_or_fields in python_types
+        if name in reachable
+    ]
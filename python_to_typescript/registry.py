@@ -0,0 +1,92 @@
+"""
+A registry for looking up handlers for classes through their MRO.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals  # isort:skip # noqa
+
+from collections import OrderedDict
+
+
+class TypeRegistry(object):
+    """
+    A mapping from classes to handlers, where a handler registered for a
+    class also applies to its subclasses.
+
+    Handlers registered with predicates are for kinds of classes which
+    don't share a base class. Handlers are found by walking the MRO of a
+    class, so the most specific handler wins. A predicate which matches a
+    class wins over handlers for base classes it doesn't match, such as
+    int for an IntEnum, but not over handlers for classes it matches.
+    Abstract base classes, which can have virtual subclasses not listed in
+    an MRO, are checked with issubclass afterwards in the order they were
+    registered. The handler found for each class is cached, so each class
+    is only resolved once.
+    """
+    def __init__(self):
+        self._predicate_handlers = []
+        self._handlers = OrderedDict()
+        self._resolved = {}
+        # Increased whenever a handler is registered or removed, so
+        # anything computed from the handlers can tell it is out of date.
+        self.generation = 0
+
+    def __contains__(self, cls):
+        return cls in self._handlers
+
+    def register(self, cls, handler):
+        self._handlers[cls] = handler
+        self._resolved.clear()
+        self.generation += 1
+
+    def register_predicate(self, predicate, handler):
+        """
+        Register a handler for every class where predicate(cls) is true.
+        """
+        self._predicate_handlers.append((predicate, handler))
+        self._resolved.clear()
+        self.generation += 1
+
+    def unregister(self, cls):
+        if cls in self._handlers:
+            del self._handlers[cls]
+            self._resolved.clear()
+            self.generation += 1
+
+    def _matching_predicate(self, cls):
+        for predicate, handler in self._predicate_handlers:
+            if predicate(cls):
+                return predicate, handler
+
+        return None, None
+
+    def _find(self, cls):
+        predicate, predicate_handler = self._matching_predicate(cls)
+
+        for base in getattr(cls, '__mro__', (cls,)):
+            if base in self._handlers:
+                if predicate is None or predicate(base):
+                    return self._handlers[base]
+
+                break
+
+        if predicate is not None:
+            return predicate_handler
+
+        for registered_cls, handler in self._handlers.items():
+            try:
+                if issubclass(cls, registered_cls):
+                    return handler
+            except TypeError:
+                pass
+
+        return None
+
+    def resolve(self, cls, default=None):
+        """
+        Find the handler for a class, or return `default`.
+        """
+        try:
+            handler = self._resolved[cls]
+        except KeyError:
+            handler = self._resolved[cls] = self._find(cls)
+
+        return default if handler is None else handler
@@ -0,0 +1,244 @@
+"""
+A persistent cache of serializer schemas in a single SQLite file, so
+serializers which haven't changed aren't instantiated again in later runs.
+
+For example:
+>>> store = enable('.typescript-schemas.sqlite3')
+>>> generate_interfaces_from_serializers(serializer_classes)
+>>> disable().close()
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals  # isort:skip # noqa
+
+import hashlib
+import os
+import pickle
+import sys
+import threading
+
+from . import __version__, profiling
+from .cache import CacheInfo
+
+# The SchemaStore serializer schemas are saved in, or None.
+active = None
+
+# The number of bytes of the file SQLite may read through a memory map, so
+# pickled schemas are read without copying them into a separate buffer.
+MMAP_SIZE = 64 * 1024 * 1024
+
+_CREATE_TABLE_SQL = '''
+CREATE TABLE IF NOT EXISTS serializer_schema (
+    name TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    data BLOB NOT NULL
+)
+'''
+
+# Errors raised for pickled schemas which reference classes which can no
+# longer be found, or which were written by another version of Python.
+_LOAD_ERRORS = (
+    AttributeError,
+    EOFError,
+    ImportError,
+    IndexError,
+    TypeError,
+    ValueError,
+    pickle.UnpicklingError,
+)
+
+
+def qualified_name(cls):
+    """
+    Return the module and qualified name for a class, like
+    `myapp.serializers:BookSerializer`.
+    """
+    return '{}:{}'.format(
+        cls.__module__,
+        getattr(cls, '__qualname__', cls.__name__),
+    )
+
+
+def _source_classes(serializer_class):
+    # The fields for a serializer depend on its base classes, and for
+    # ModelSerializers, on the model and its base classes.
+    classes = list(serializer_class.__mro__)
+    model = getattr(getattr(serializer_class, 'Meta', None), 'model', None)
+
+    if isinstance(model, type):
+        classes.extend(model.__mro__)
+
+    return classes
+
+
+class SchemaStore(object):
+    """
+    Serializer schemas pickled in an SQLite database, keyed by the
+    qualified names of serializer classes.
+
+    Each schema is saved with a fingerprint of the source files for the
+    serializer, its base classes and its model, the version of DRF, and
+    the version of this library, and is only loaded again while the
+    fingerprint is the same.
+    """
+    def __init__(self, path):
+        import sqlite3
+
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._file_hashes = {}
+        self._binary = sqlite3.Binary
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute('PRAGMA mmap_size = {}'.format(MMAP_SIZE))
+
+        with self._connection:
+            self._connection.execute(_CREATE_TABLE_SQL)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self._connection.close()
+
+    def _file_hash(self, path):
+        # Files are only read again when they change, as many serializers
+        # share modules.
+        try:
+            stat = os.stat(path)
+            signature = (stat.st_mtime, stat.st_size)
+        except OSError:
+            return None
+
+        cached = self._file_hashes.get(path)
+
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        with open(path, 'rb') as source_file:
+            file_hash = hashlib.sha1(source_file.read()).hexdigest()
+
+        self._file_hashes[path] = (signature, file_hash)
+
+        return file_hash
+
+    def fingerprint(self, serializer_class):
+        """
+        Return a fingerprint of the sources a serializer's schema is
+        built from.
+        """
+        import rest_framework
+
+        paths = set()
+
+        for cls in _source_classes(serializer_class):
+            module = sys.modules.get(cls.__module__)
+            path = getattr(module, '__file__', None)
+
+            if path:
+                paths.add(path)
+
+        key = repr((
+            __version__,
+            rest_framework.VERSION,
+            [(path, self._file_hash(path)) for path in sorted(paths)],
+        ))
+
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+    def get(self, serializer_class):
+        """
+        Return the saved schema for a serializer class, or None if there
+        is no schema saved for the class as it is now.
+        """
+        fingerprint = self.fingerprint(serializer_class)
+
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT data FROM serializer_schema '
+                'WHERE name = ? AND fingerprint = ?',
+                (qualified_name(serializer_class), fingerprint),
+            ).fetchone()
+
+        schema = None
+
+        if row is not None:
+            try:
+                schema = pickle.loads(row[0])
+            except _LOAD_ERRORS:
+                pass
+
+        with self._lock:
+            if schema is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        return schema
+
+    def set(self, serializer_class, schema):
+        """
+        Save the schema for a serializer class. Schemas with types which
+        cannot be pickled aren't saved.
+        """
+        try:
+            data = pickle.dumps(schema, pickle.HIGHEST_PROTOCOL)
+        except (AttributeError, TypeError, pickle.PicklingError):
+            return
+
+        fingerprint = self.fingerprint(serializer_class)
+
+        with self._lock, self._connection:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO serializer_schema '
+                '(name, fingerprint, data) VALUES (?, ?, ?)',
+                (
+                    qualified_name(serializer_class),
+                    fingerprint,
+                    self._binary(data),
+                ),
+            )
+
+    def clear(self):
+        """
+        Remove every saved schema.
+        """
+        with self._lock, self._connection:
+            self._connection.execute('DELETE FROM serializer_schema')
+
+    def info(self):
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, None, None)
+
+
+def _active_info():
+    return active.info() if active is not None else CacheInfo(0, 0, None, None)
+
+
+profiling.register_cache('schema_store', _active_info)
+
+
+def enable(path):
+    """
+    Open a SchemaStore, and use it for serializer schemas until disable()
+    is called.
+    """
+    global active  # pylint: disable=global-statement
+
+    active = SchemaStore(path)
+
+    return active
+
+
+def disable():
+    """
+    Stop using the active SchemaStore, and return it.
+    """
+    global active  # pylint: disable=global-statement
+
+    store = active
+    active = None
+
+    return store
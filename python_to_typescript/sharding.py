@@ -0,0 +1,192 @@
+"""
+Functions for splitting generated TypeScript into several files, with
+`import type` statements between them, and a stable order.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals  # isort:skip # noqa
+
+import itertools
+from collections import OrderedDict
+
+import six
+
+from .base import (
+    _render_options,
+    alias_texts,
+    compile_renderer,
+    join_interfaces,
+)
+from .references import dependency_graph
+
+
+def _clusters(names, graph):
+    # Find groups of interfaces connected by references in either
+    # direction, each sorted by name, in order of their first names.
+    neighbours = {name: set() for name in names}
+
+    for name in names:
+        for other_name in graph[name]:
+            if other_name in neighbours:
+                neighbours[name].add(other_name)
+                neighbours[other_name].add(name)
+
+    seen = set()
+    clusters = []
+
+    for name in sorted(names):
+        if name in seen:
+            continue
+
+        seen.add(name)
+        cluster = []
+        stack = [name]
+
+        while stack:
+            cluster_name = stack.pop()
+            cluster.append(cluster_name)
+
+            for other_name in neighbours[cluster_name]:
+                if other_name not in seen:
+                    seen.add(other_name)
+                    stack.append(other_name)
+
+        clusters.append(sorted(cluster))
+
+    return clusters
+
+
+def _pack(names, graph, sizes, max_bytes):
+    # Fill shards with whole clusters where possible, so interfaces which
+    # reference each other end up in the same files.
+    shards = [[]]
+    shard_size = 0
+
+    for cluster in _clusters(names, graph):
+        # Start a new shard for a cluster which fits in one, but not in the
+        # space left in the current shard.
+        cluster_size = sum(sizes[name] for name in cluster)
+
+        if shards[-1] and shard_size + cluster_size > max_bytes:
+            shards.append([])
+            shard_size = 0
+
+        for name in cluster:
+            if shards[-1] and shard_size + sizes[name] > max_bytes:
+                shards.append([])
+                shard_size = 0
+
+            shards[-1].append(name)
+            shard_size += sizes[name]
+
+    return shards
+
+
+def plan_shards(python_types, shard_key=None, max_bytes=None, options=None):
+    """
+    Split interfaces into shards, and return an OrderedDict mapping shard
+    names to sorted lists of interface names, sorted by shard name.
+
+    shard_key(interface_name) can return the name of a group for each
+    interface, such as the name of a module, and defaults to 'types'.
+    Each group is split into shards of up to max_bytes of rendered text,
+    keeping interfaces which reference each other together where
+    possible. Shards after the first in a group are named `group-2`,
+    `group-3`, etc. The plan depends only on the interfaces, not on the
+    order they are given in.
+    """
+    python_types = list(python_types)
+    graph = dependency_graph(python_types)
+    groups = {}
+
+    for name, _ in python_types:
+        key = shard_key(name) if shard_key is not None else 'types'
+        groups.setdefault(key, []).append(name)
+
+    if max_bytes is not None:
+        render = compile_renderer(_render_options(2, '\n', options))
+        sizes = {
+            name: len(render(name, type_or_fields).encode('utf-8'))
+            for name, type_or_fields in python_types
+        }
+
+    shards = {}
+
+    for key, names in six.iteritems(groups):
+        if max_bytes is None:
+            shards[key] = sorted(names)
+        else:
+            for index, shard in enumerate(
+                _pack(names, graph, sizes, max_bytes),
+            ):
+                shards[key if index == 0 else '{}-{}'.format(
+                    key,
+                    index + 1,
+                )] = shard
+
+    return OrderedDict(sorted(six.iteritems(shards)))
+
+
+def _import_lines(shard_name, names, graph, shard_for_name):
+    imported = {}
+
+    for name in names:
+        for other_name in graph[name]:
+            other_shard_name = shard_for_name[other_name]
+
+            if other_shard_name != shard_name:
+                imported.setdefault(other_shard_name, set()).add(other_name)
+
+    return [
+        "import type {{ {} }} from './{}'".format(
+            ', '.join(sorted(imported_names)),
+            other_shard_name,
+        )
+        for other_shard_name, imported_names in sorted(
+            six.iteritems(imported),
+        )
+    ]
+
+
+def generate_shards(python_types, shard_key=None, max_bytes=None,
+                    indentation=2, newline='\n', options=None):
+    """
+    Generate TypeScript files for interfaces split with plan_shards, and
+    return an OrderedDict mapping file names, like `types.ts`, to the text
+    for the files, sorted by file name.
+
+    Every interface is exported, and each file imports the names it uses
+    from other files with `import type`. Aliases for wide unions are
+    written in each file which uses them.
+    """
+    # pylint: disable=too-many-arguments,too-many-locals
+    python_types = list(python_types)
+    options = _render_options(indentation, newline, options)._replace(
+        export=True,
+    )
+    render = compile_renderer(options)
+    types_by_name = dict(python_types)
+    graph = dependency_graph(python_types)
+    plan = plan_shards(python_types, shard_key, max_bytes, options)
+    shard_for_name = {
+        name: shard_name
+        for shard_name, names in six.iteritems(plan)
+        for name in names
+    }
+    files = OrderedDict()
+
+    for shard_name, names in six.iteritems(plan):
+        import_lines = _import_lines(shard_name, names, graph, shard_for_name)
+        header = (
+            options.newline.join(import_lines) + options.newline * 2
+            if import_lines else
+            ''
+        )
+        aliases = {}
+        files[shard_name + '.ts'] = header + ''.join(join_interfaces(
+            itertools.chain(
+                (render(name, types_by_name[name], aliases) for name in names),
+                alias_texts(aliases),
+            ),
+            options.newline,
+        ))
+
+    return files
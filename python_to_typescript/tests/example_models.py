@@ -0,0 +1,31 @@
+"""
+Models and ModelSerializers for tests, which can only be imported after
+Django has been set up.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals  # isort:skip # noqa
+
+from django.db import models
+from rest_framework.serializers import ModelSerializer, Serializer
+
+from .example_serializers import TagSerializer
+
+
+class Writer(models.Model):
+    name = models.CharField(max_length=100)
+
+
+class Novel(models.Model):
+    title = models.CharField(max_length=100)
+    writer = models.ForeignKey(Writer, on_delete=models.CASCADE)
+
+
+class NovelSerializer(ModelSerializer):  # pylint: disable=abstract-method
+    class Meta(object):
+        model = Novel
+        fields = ('title', 'writer')
+        depth = 1
+
+
+class ShelfSerializer(Serializer):  # pylint: disable=abstract-method
+    novels = NovelSerializer(many=True)
+    tags = TagSerializer(many=True)
@@ -0,0 +1,22 @@
+from __future__ import absolute_import, division, print_function, unicode_literals  # isort:skip # noqa
+
+from rest_framework.serializers import CharField, IntegerField, Serializer
+
+TYPESCRIPT_INTERFACES = [
+    ('Library', {'books': 'Book[]'}),
+]
+
+
+class TagSerializer(Serializer):  # pylint: disable=abstract-method
+    name = CharField()
+
+
+class AuthorSerializer(Serializer):  # pylint: disable=abstract-method
+    name = CharField()
+    tags = TagSerializer(many=True)
+
+
+class BookSerializer(Serializer):  # pylint: disable=abstract-method
+    title = CharField()
+    author = AuthorSerializer()
+    pages = IntegerField()
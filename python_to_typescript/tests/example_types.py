@@ -0,0 +1,6 @@
+from __future__ import absolute_import, division, print_function, unicode_literals  # isort:skip # noqa
+
+TYPESCRIPT_INTERFACES = [
+    ('Point', {'x': float, 'y': float}),
+    ('Path', {'points': 'Point[]'}),
+]
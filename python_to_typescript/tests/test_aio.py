@@ -0,0 +1,142 @@
+from __future__ import absolute_import, division, print_function, unicode_literals  # isort:skip # noqa
+
+import sys
+import threading
+import unittest
+
+from ..aio import (
+    GeneratedTypes,
+    InterfaceService,
+    default_service,
+    etag,
+    generate_interfaces_from_serializers_async,
+)
+from ..drf import generate_interfaces_from_serializers
+from .example_serializers import BookSerializer, TagSerializer
+
+try:
+    import asyncio
+except ImportError:  # pragma: no cover
+    asyncio = None
+
+
+class SlowGenerator(object):
+    """
+    A function for generating text, which blocks until released.
+    """
+    def __init__(self, error=None):
+        self.calls = []
+        self.error = error
+        self.release = threading.Event()
+
+    def __call__(self, serializer_classes, options):
+        self.calls.append((serializer_classes, options))
+        self.release.wait(5)
+
+        if self.error is not None:
+            raise self.error
+
+        return 'text for {}'.format(len(serializer_classes))
+
+
+@unittest.skipIf(sys.version_info < (3, 7), 'Python 3.7 is required')
+class AsyncGenerationTestCase(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def run_futures(self, futures):
+        return self.loop.run_until_complete(asyncio.gather(
+            *futures,
+            return_exceptions=True
+        ))
+
+    def test_concurrent_requests_are_coalesced(self):
+        generate = SlowGenerator()
+        service = InterfaceService(generate=generate)
+        futures = [
+            service.generate([BookSerializer], loop=self.loop)
+            for _ in range(5)
+        ]
+        other_future = service.generate([TagSerializer], 'x', loop=self.loop)
+        generate.release.set()
+
+        results = self.run_futures(futures + [other_future])
+
+        expected = GeneratedTypes('text for 1', etag('text for 1'))
+
+        assert results == [expected] * 6
+        assert sorted(generate.calls, key=repr) == [
+            ((BookSerializer,), None),
+            ((TagSerializer,), 'x'),
+        ]
+
+        cached_future = service.generate([BookSerializer], loop=self.loop)
+
+        assert cached_future.done()
+        assert cached_future.result() is results[0]
+        assert len(generate.calls) == 2
+
+        service.clear()
+        self.run_futures([service.generate([BookSerializer], loop=self.loop)])
+
+        assert len(generate.calls) == 3
+
+    def test_errors_are_not_cached(self):
+        generate = SlowGenerator(ValueError('bad'))
+        service = InterfaceService(generate=generate)
+        generate.release.set()
+
+        results = self.run_futures([
+            service.generate([BookSerializer], loop=self.loop)
+            for _ in range(2)
+        ])
+
+        assert [type(result) for result in results] == [ValueError] * 2
+
+        generate.error = None
+
+        assert self.run_futures([
+            service.generate([BookSerializer], loop=self.loop),
+        ])[0].text == 'text for 1'
+        assert len(generate.calls) == 2
+
+    def test_cancelling_one_request_does_not_cancel_others(self):
+        generate = SlowGenerator()
+        service = InterfaceService(generate=generate)
+        first_future = service.generate([BookSerializer], loop=self.loop)
+        second_future = service.generate([BookSerializer], loop=self.loop)
+        first_future.cancel()
+        generate.release.set()
+
+        results = self.run_futures([first_future, second_future])
+
+        assert isinstance(results[0], asyncio.CancelledError)
+        assert results[1].text == 'text for 1'
+
+    def test_default_service(self):
+        asyncio.set_event_loop(self.loop)
+
+        try:
+            result = self.run_futures([
+                generate_interfaces_from_serializers_async([BookSerializer]),
+            ])[0]
+        finally:
+            asyncio.set_event_loop(None)
+            default_service.clear()
+
+        assert result.text == \
+            generate_interfaces_from_serializers([BookSerializer])
+
+    def test_etags(self):
+        result = GeneratedTypes('text', etag('text'))
+
+        assert result.etag.startswith('"')
+        assert result.matches(result.etag)
+        assert result.matches('"other", W/' + result.etag)
+        assert result.matches('*')
+        assert not result.matches('"other"')
+        assert not result.matches(None)
+        assert not result.matches('')
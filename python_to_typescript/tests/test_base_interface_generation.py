@@ -1,29 +1,70 @@
 from __future__ import absolute_import, division, print_function, unicode_literals  # isort:skip # noqa
 
+import pickle
+import sys
 import unittest
 from textwrap import dedent
 from typing import (
     DefaultDict,
     Dict,
+    Generic,
     List,
     Mapping,
     Optional,
     Set,
     Tuple,
+    TypeVar,
     Union,
 )
 
 import six
+from six import StringIO
 
-from ..base import generate_interfaces
+from .. import ir
+from ..base import (
+    OptionalMember,
+    _generic_handlers,
+    _type_handlers,
+    RenderOptions,
+    compile_renderer,
+    generate_interface,
+    generate_interfaces,
+    group_type,
+    iter_interfaces,
+    register_generic_handler,
+    register_type_handler,
+    type_name,
+    type_node,
+    uniq,
+    write_interfaces,
+)
+
+try:
+    import enum
+except ImportError:  # pragma: no cover
+    enum = None
 
 LONG_TYPE = long if six.PY2 else int  # noqa
 
+T = TypeVar('T')
+
 
 class SomeOtherType(object):
     pass
 
 
+class SomeMoney(object):
+    pass
+
+
+class SomeCurrencyAmount(SomeMoney):
+    pass
+
+
+class SomeCustomGeneric(Generic[T]):
+    pass
+
+
 class BaseTypeConversionTestCase(unittest.TestCase):
     def test_basic_types(self):
         actual = generate_interfaces([
@@ -109,6 +150,7 @@ class BaseTypeConversionTestCase(unittest.TestCase):
                     List[int],
                 ),
                 'list_of_lists': List[List[str]],
+                'list_of_names': List['SomeOtherType'],
                 'map_to_numbers': Mapping[str, int],
                 'map_to_union': Mapping[int, Union[int, List[str]]],
                 'dict': Dict[int, List[str]],
@@ -127,6 +169,7 @@ class BaseTypeConversionTestCase(unittest.TestCase):
           dict: {[key: string]: string[]}
           float_list: number[]
           list_of_lists: string[][]
+          list_of_names: SomeOtherType[]
           map_to_numbers: {[key: string]: number}
           map_to_union: {[key: string]: number | string[]}
           number_or_string_list: (number | string)[]
@@ -137,3 +180,333 @@ class BaseTypeConversionTestCase(unittest.TestCase):
         """
 
         assert actual == dedent(expected)
+
+    def test_type_names_are_cached(self):
+        type_name.cache_clear()
+
+        assert type_name(Optional[List[int]]) == 'number[] | null'
+        assert type_name(Optional[List[int]]) == 'number[] | null'
+
+        info = type_name.cache_info()
+
+        assert info.hits == 1
+        # The outer type and the nested List[int] are both cached.
+        assert info.currsize == 2
+
+    def test_unhashable_types_are_not_cached(self):
+        type_name.cache_clear()
+
+        assert type_name((int, ['Foo'])) == 'any'
+        assert type_name.cache_info().currsize == 0
+
+    def test_registering_type_handlers(self):
+        assert type_name(SomeCurrencyAmount) == 'any'
+
+        # Cleanups run in reverse, so the cache is cleared last.
+        self.addCleanup(type_node.cache_clear)
+        self.addCleanup(_type_handlers.unregister, SomeMoney)
+        register_type_handler(SomeMoney, lambda some_type: ['string'])
+
+        assert type_name(SomeCurrencyAmount) == 'string'
+        assert type_name(List[SomeMoney]) == 'string[]'
+
+    @unittest.skipIf(enum is None, 'enum is not available')
+    def test_registering_handlers_for_enums(self):
+        class Colour(enum.Enum):
+            RED = 'r'
+
+        assert type_name(Colour) == '"r"'
+
+        self.addCleanup(type_node.cache_clear)
+        self.addCleanup(_type_handlers.unregister, Colour)
+        register_type_handler(Colour, lambda some_type: ['string'])
+
+        assert type_name(Colour) == 'string'
+
+    def test_registering_generic_handlers(self):
+        assert type_name(SomeCustomGeneric[int]) == 'any'
+
+        self.addCleanup(type_node.cache_clear)
+        self.addCleanup(_generic_handlers.unregister, SomeCustomGeneric)
+        register_generic_handler(
+            SomeCustomGeneric,
+            lambda some_type: [type_name(some_type.__args__[0]) + '[]'],
+        )
+
+        assert type_name(SomeCustomGeneric[int]) == 'number[]'
+
+    def test_streaming_interfaces(self):
+        python_types = [
+            ('FirstInterface', {'x': int}),
+            ('SecondInterface', {'y': List[str]}),
+        ]
+        expected = generate_interfaces(python_types, 4, '\r\n')
+
+        chunks = list(iter_interfaces(iter(python_types), 4, '\r\n'))
+
+        assert chunks == [
+            'interface FirstInterface {\r\n    x: number\r\n}\r\n',
+            '\r\n',
+            'interface SecondInterface {\r\n    y: string[]\r\n}\r\n',
+        ]
+        assert ''.join(chunks) == expected
+
+        fp = StringIO()
+        write_interfaces(iter(python_types), fp, 4, '\r\n')
+
+        assert fp.getvalue() == expected
+
+    def test_render_options(self):
+        python_types = [
+            ('Status', ('"open"', '"closed"')),
+            ('Issue', {
+                'status': 'Status',
+                'title': OptionalMember(str),
+                'labels': OptionalMember(Optional[List[str]]),
+            }),
+        ]
+        options = RenderOptions(
+            indentation=4,
+            newline='\r\n',
+            export=True,
+            readonly=True,
+            optional_members=True,
+        )
+        expected = (
+            'export type Status = "closed" | "open"\r\n'
+            '\r\n'
+            'export interface Issue {\r\n'
+            '    readonly labels?: string[] | null\r\n'
+            '    readonly status: Status\r\n'
+            '    readonly title?: string\r\n'
+            '}\r\n'
+        )
+
+        assert generate_interfaces(python_types, options=options) == expected
+
+        fp = StringIO()
+        write_interfaces(python_types, fp, options=options)
+
+        assert fp.getvalue() == expected
+
+    def test_optional_members_are_plain_members_by_default(self):
+        expected = """\
+        type Name = string
+
+        interface Person {
+          name: Name
+          nickname: string
+        }
+        """
+
+        assert generate_interfaces([
+            ('Name', str),
+            ('Person', {'name': 'Name', 'nickname': OptionalMember(str)}),
+        ]) == dedent(expected)
+        assert generate_interface('Name', str, 4, '\r\n') == \
+            'type Name = string\r\n'
+        assert type_name(OptionalMember(int)) == 'number'
+        assert type_name(List[int]) == type_name(OptionalMember(List[int]))
+
+    def test_member_names_are_quoted_when_needed(self):
+        expected = """\
+        interface Headers {
+          "\\"quoted\\"": string
+          $ref: string
+          "1st": number
+          _id: number
+          "content-type": string
+        }
+        """
+
+        assert generate_interfaces([('Headers', {
+            '1st': int,
+            '$ref': str,
+            'content-type': str,
+            '"quoted"': str,
+            '_id': int,
+        })]) == dedent(expected)
+
+    def test_collapsing_wide_unions(self):
+        wide_type = Union[int, str, bool]
+        alias_name = ir.alias_name(type_node(wide_type))
+        python_types = [
+            ('Wide', wide_type),
+            ('First', {'a': Optional[wide_type], 'b': List[wide_type]}),
+            ('Second', {'c': Dict[str, wide_type], 'd': Optional[int]}),
+        ]
+        options = RenderOptions(max_union_width=2)
+        expected = """\
+        type Wide = boolean | number | string
+
+        interface First {{
+          a: {0} | null
+          b: {0}[]
+        }}
+
+        interface Second {{
+          c: {{[key: string]: {0}}}
+          d: number | null
+        }}
+
+        type {0} = boolean | number | string
+        """.format(alias_name)
+
+        assert generate_interfaces(python_types, options=options) == \
+            dedent(expected)
+        assert generate_interface(
+            'Second',
+            python_types[2][1],
+            options=options,
+        ) == dedent("""\
+        interface Second {{
+          c: {{[key: string]: {0}}}
+          d: number | null
+        }}
+
+        type {0} = boolean | number | string
+        """.format(alias_name))
+
+        # The aliases can be collected instead of written.
+        aliases = {}
+
+        assert generate_interfaces(
+            python_types[1:2],
+            options=options,
+            aliases=aliases,
+        ) == dedent("""\
+        interface First {{
+          a: {0} | null
+          b: {0}[]
+        }}
+        """.format(alias_name))
+        assert aliases == {
+            alias_name: 'type {} = boolean | number | string\n'.format(
+                alias_name,
+            ),
+        }
+
+        with self.assertRaises(ValueError):
+            generate_interfaces(
+                python_types,
+                options=options,
+                aliases={alias_name: 'type {} = null\n'.format(alias_name)},
+            )
+
+        for width in (-1, 0, 1):
+            with self.assertRaises(ValueError):
+                RenderOptions(max_union_width=width)
+
+    def test_renderers_are_compiled_once(self):
+        assert compile_renderer(RenderOptions()) is \
+            compile_renderer(RenderOptions(2, '\n'))
+        assert compile_renderer(RenderOptions()) is not \
+            compile_renderer(RenderOptions(export=True))
+
+    def test_optional_member_values(self):
+        member = OptionalMember(List[int])
+
+        assert member == OptionalMember(List[int])
+        assert member != OptionalMember(int)
+        assert member != List[int]
+        assert hash(member) == hash(OptionalMember(List[int]))
+        assert repr(member) == 'OptionalMember({!r})'.format(List[int])
+        assert pickle.loads(pickle.dumps(member)) == member
+
+    def test_no_interfaces(self):
+        assert generate_interfaces([]) == '\n'
+
+    def test_helpers(self):
+        assert list(uniq([1, 1, 2, 1])) == [1, 2, 1]
+        assert group_type('string') == 'string'
+        assert group_type('number | string') == '(number | string)'
+
+    @unittest.skipIf(sys.version_info < (3, 8), 'Python 3.8 is required')
+    def test_modern_typing_constructs(self):
+        # pylint: disable=exec-used
+        namespace = {}
+        exec(dedent("""
+        import dataclasses
+        import enum
+        import typing
+        from typing import (
+            Annotated, Dict, List, Literal, NamedTuple, Tuple, TypedDict,
+        )
+
+        class Color(enum.Enum):
+            RED = 'red'
+            BLUE = 'blue'
+
+        class Size(enum.IntEnum):
+            SMALL = 1
+            LARGE = 2
+
+        class Movie(TypedDict):
+            title: str
+
+        @dataclasses.dataclass
+        class Actor:
+            name: str
+
+        class Point(NamedTuple):
+            x: int
+            y: float
+            label: 'Undefined'
+
+        class Pair(typing.NamedTuple):
+            first: str
+            second: bool
+
+        PlainPoint = __import__('collections').namedtuple('PlainPoint', 'x')
+
+        TYPES = {
+            'literal': Literal['a', 1, True, None, Color.RED],
+            'color': Color,
+            'size': Size,
+            'movie': Movie,
+            'actors': List[Actor],
+            'point': Point,
+            'pair': Pair,
+            'plain_point': PlainPoint,
+            'plain_tuple': tuple,
+            'variadic_tuple': Tuple[int, ...],
+            'annotated': Annotated[int, 'meta'],
+            'pep_585_list': list[int],
+            'pep_585_dict': dict[str, int],
+            'bare_list': List,
+            'bare_dict': Dict,
+        }
+        """), namespace)
+
+        if sys.version_info >= (3, 10):
+            namespace['TYPES']['pep_604_union'] = eval('int | str | None')
+
+        actual = generate_interfaces([('Modern', namespace['TYPES'])])
+        expected = """\
+        interface Modern {
+          actors: Actor[]
+          annotated: number
+          bare_dict: {[key: string]: any}
+          bare_list: any[]
+          color: "blue" | "red"
+          literal: "a" | "red" | 1 | true | null
+          movie: Movie
+          pair: [string, boolean]
+          pep_585_dict: {[key: string]: number}
+          pep_585_list: number[]
+          pep_604_union: number | string | null
+          plain_point: [any]
+          plain_tuple: any
+          point: [number, number, Undefined]
+          size: 1 | 2
+          variadic_tuple: number[]
+        }
+        """
+
+        if sys.version_info < (3, 10):  # pragma: no cover
+            expected = expected.replace(
+                '  pep_604_union: number | string | null\n',
+                '',
+            )
+
+        assert actual == dedent(expected)
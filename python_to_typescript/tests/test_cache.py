@@ -0,0 +1,97 @@
+from __future__ import absolute_import, division, print_function, unicode_literals  # isort:skip # noqa
+
+import unittest
+
+from ..cache import MISSING, CacheInfo, LRUCache, memoize
+
+
+class LRUCacheTestCase(unittest.TestCase):
+    def test_get_and_set(self):
+        cache = LRUCache(2)
+
+        assert cache.get('a') is MISSING
+        assert cache.get('a', None) is None
+
+        cache.set('a', 1)
+
+        assert cache.get('a') == 1
+        assert len(cache) == 1
+        assert cache.maxsize == 2
+        assert cache.info() == CacheInfo(1, 2, 2, 1)
+
+    def test_least_recently_used_items_are_evicted(self):
+        cache = LRUCache(2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        # Using 'a' makes 'b' the least recently used item.
+        cache.get('a')
+        cache.set('c', 3)
+
+        assert cache.get('a') == 1
+        assert cache.get('b') is MISSING
+        assert cache.get('c') == 3
+
+    def test_unbounded_cache(self):
+        cache = LRUCache(None)
+
+        for number in range(1000):
+            cache.set(number, number)
+
+        assert cache.get(0) == 0
+        assert len(cache) == 1000
+
+    def test_zero_size_cache_stores_nothing(self):
+        cache = LRUCache(0)
+        cache.set('a', 1)
+
+        assert cache.get('a') is MISSING
+
+    def test_pop_resize_and_clear(self):
+        cache = LRUCache(3)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.set('c', 3)
+
+        assert cache.pop('a') == 1
+        assert cache.pop('a') is None
+
+        cache.resize(1)
+
+        assert cache.get('b') is MISSING
+        assert cache.get('c') == 3
+
+        cache.resize(None)
+        cache.clear()
+
+        assert cache.info() == CacheInfo(0, 0, None, 0)
+
+
+class MemoizeTestCase(unittest.TestCase):
+    def test_memoize(self):
+        calls = []
+
+        @memoize(2)
+        def double(value):
+            calls.append(value)
+
+            return value * 2
+
+        assert double(2) == 4
+        assert double(2) == 4
+        assert calls == [2]
+        assert double.cache_info() == CacheInfo(1, 1, 2, 1)
+
+        # Unhashable arguments are computed every time.
+        assert double([1]) == [1, 1]
+        assert double([1]) == [1, 1]
+        assert calls == [2, [1], [1]]
+
+        double.cache_resize(0)
+        double(3)
+        double(3)
+
+        assert calls == [2, [1], [1], 3, 3]
+
+        double.cache_clear()
+
+        assert double.cache_info() == CacheInfo(0, 0, 0, 0)
@@ -0,0 +1,183 @@
+from __future__ import absolute_import, division, print_function, unicode_literals  # isort:skip # noqa
+
+import sys
+import types
+import unittest
+from textwrap import dedent
+from typing import Any
+
+from ..base import OptionalMember
+from ..classes import (
+    class_field_types,
+    clear_class_cache,
+    generate_interfaces_from_classes,
+    is_interface_class,
+    referenced_classes,
+)
+
+try:
+    import attr
+except ImportError:  # pragma: no cover
+    attr = None
+
+# Class annotations can't be parsed by Python 2, so the classes for the
+# tests are defined in a string.
+CLASSES_SOURCE = """
+import dataclasses
+from typing import Dict, List, Optional, TypedDict
+
+import attr
+
+
+@dataclasses.dataclass
+class Author:
+    name: str
+    books: List['Book']
+
+
+@dataclasses.dataclass
+class Book:
+    title: str
+    author: Optional[Author]
+    reviews: Dict[str, 'Review']
+    extra: 'Undefined' = None
+
+
+class Review(TypedDict):
+    score: int
+    publisher: 'Publisher'
+
+
+class Draft(TypedDict, total=False):
+    title: str
+    publisher: 'Publisher'
+
+
+@attr.s
+class Publisher:
+    name = attr.ib(type=str)
+    founded: int = attr.ib()
+
+
+@attr.s
+class Untyped:
+    value = attr.ib()
+"""
+
+
+@unittest.skipIf(
+    sys.version_info < (3, 8) or attr is None,
+    'Python 3.8 and attrs are required',
+)
+class ClassInterfaceGenerationTestCase(unittest.TestCase):
+    def setUp(self):
+        # pylint: disable=exec-used
+        module = types.ModuleType(str('example_classes'))
+        sys.modules[module.__name__] = module
+        exec(CLASSES_SOURCE, vars(module))
+        self.namespace = vars(module)
+
+    def tearDown(self):
+        del sys.modules['example_classes']
+
+    def test_classes_are_followed_transitively(self):
+        actual = generate_interfaces_from_classes([
+            self.namespace['Author'],
+            self.namespace['Book'],
+        ])
+        expected = """\
+        interface Author {
+          books: Book[]
+          name: string
+        }
+
+        interface Book {
+          author: Author | null
+          extra: Undefined
+          reviews: {[key: string]: Review}
+          title: string
+        }
+
+        interface Review {
+          publisher: Publisher
+          score: number
+        }
+
+        interface Publisher {
+          founded: number
+          name: string
+        }
+        """
+
+        assert actual == dedent(expected)
+
+    def test_conflicting_class_names(self):
+        # pylint: disable=exec-used
+        other_namespace = {}
+        exec(CLASSES_SOURCE, other_namespace)
+
+        with self.assertRaises(ValueError):
+            generate_interfaces_from_classes([
+                self.namespace['Publisher'],
+                other_namespace['Publisher'],
+            ])
+
+    def test_field_types_are_cached(self):
+        author_class = self.namespace['Author']
+        field_types = class_field_types(author_class)
+
+        assert class_field_types(author_class) is field_types
+
+        clear_class_cache(author_class)
+
+        assert class_field_types(author_class) is not field_types
+
+        clear_class_cache()
+
+    def test_optional_typed_dict_keys(self):
+        publisher_class = self.namespace['Publisher']
+
+        assert class_field_types(self.namespace['Draft']) == {
+            'title': OptionalMember(str),
+            'publisher': OptionalMember(publisher_class),
+        }
+        # Classes only used by optional keys are followed too.
+        assert generate_interfaces_from_classes([
+            self.namespace['Draft'],
+        ]) == dedent("""\
+        interface Draft {
+          publisher: Publisher
+          title: string
+        }
+
+        interface Publisher {
+          founded: number
+          name: string
+        }
+        """)
+
+    def test_fields_without_types(self):
+        assert class_field_types(self.namespace['Untyped']) == {
+            'value': Any,
+        }
+        assert generate_interfaces_from_classes([
+            self.namespace['Untyped'],
+        ]) == dedent("""\
+        interface Untyped {
+          value: any
+        }
+        """)
+
+    def test_is_interface_class(self):
+        assert is_interface_class(self.namespace['Review'])
+        assert is_interface_class(self.namespace['Publisher'])
+        assert not is_interface_class(dict)
+        assert not is_interface_class('Review')
+
+    def test_referenced_classes(self):
+        author_class = self.namespace['Author']
+        review_class = self.namespace['Review']
+
+        assert list(referenced_classes(
+            (int, author_class, 'List[Review]', review_class),
+        )) == [author_class, review_class]
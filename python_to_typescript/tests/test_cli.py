@@ -0,0 +1,432 @@
+from __future__ import absolute_import, division, print_function, unicode_literals  # isort:skip # noqa
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import types
+import unittest
+from textwrap import dedent
+
+from rest_framework.serializers import ListSerializer, ModelSerializer
+from six import StringIO
+
+from .. import ir, schema_store
+from ..cli import _setup_django, main
+from ..discovery import app_module_name, module_serializers
+from ..drf import clear_serializer_cache
+from ..incremental import read_file
+from . import example_serializers, example_types
+
+TYPES_MODULE = 'python_to_typescript.tests.example_types'
+SERIALIZERS_MODULE = 'python_to_typescript.tests.example_serializers'
+MODELS_MODULE = 'python_to_typescript.tests.example_models'
+
+EXPECTED_COMBINED_OUTPUT = """\
+interface Point {
+  x: number
+  y: number
+}
+
+interface Path {
+  points: Point[]
+}
+
+interface Library {
+  books: Book[]
+}
+
+interface Author {
+  name: string
+  tags: Tag[]
+}
+
+interface Tag {
+  name: string
+}
+
+interface Book {
+  author: Author
+  pages: number
+  title: string
+}
+"""
+
+
+class CommandLineTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.stdout = sys.stdout
+        self.stderr = sys.stderr
+        sys.stdout = StringIO()
+        sys.stderr = StringIO()
+
+    def tearDown(self):
+        sys.stdout = self.stdout
+        sys.stderr = self.stderr
+        shutil.rmtree(self.directory)
+
+    def test_discovery(self):
+        assert module_serializers(example_types) == []
+        assert module_serializers(example_serializers) == [
+            example_serializers.AuthorSerializer,
+            example_serializers.BookSerializer,
+            example_serializers.TagSerializer,
+        ]
+        assert app_module_name('python_to_typescript') == \
+            'python_to_typescript.serializers'
+
+    def test_discovery_without_drf(self):
+        rest_framework = sys.modules.pop('rest_framework')
+
+        try:
+            assert module_serializers(example_serializers) == []
+        finally:
+            sys.modules['rest_framework'] = rest_framework
+
+    def test_discovery_skips_abstract_serializers(self):
+        module = types.ModuleType(str('abstract_serializers'))
+
+        class User(object):
+            pass
+
+        class BaseModelSerializer(ModelSerializer):  # noqa # pylint: disable=abstract-method
+            pass
+
+        class BaseListSerializer(ListSerializer):  # noqa # pylint: disable=abstract-method
+            pass
+
+        class UserSerializer(ModelSerializer):  # noqa # pylint: disable=abstract-method
+            class Meta(object):
+                model = User
+                fields = ('username',)
+
+        for serializer_class in (
+            BaseModelSerializer,
+            BaseListSerializer,
+            UserSerializer,
+        ):
+            serializer_class.__module__ = module.__name__
+            setattr(module, serializer_class.__name__, serializer_class)
+
+        assert module_serializers(module) == [UserSerializer]
+
+    def test_combined_output_to_stdout(self):
+        cwd = os.getcwd()
+        os.chdir(self.directory)
+
+        try:
+            assert main([TYPES_MODULE, SERIALIZERS_MODULE]) == 0
+        finally:
+            os.chdir(cwd)
+            sys.path.remove(self.directory)
+
+        assert sys.stdout.getvalue() == EXPECTED_COMBINED_OUTPUT
+
+    def test_profile_report(self):
+        path = os.path.join(self.directory, 'types.ts')
+        clear_serializer_cache()
+
+        assert main([SERIALIZERS_MODULE, '-o', path, '--profile']) == 0
+
+        report = sys.stderr.getvalue()
+
+        assert report.startswith('phase ')
+        assert '\nrendering ' in report
+        assert '\nserializer_schema ' in report
+        assert '\n{}.BookSerializer '.format(SERIALIZERS_MODULE) in report
+
+    def test_schema_cache(self):
+        path = os.path.join(self.directory, 'types.ts')
+        cache_path = os.path.join(self.directory, 'schemas.sqlite3')
+        argv = [SERIALIZERS_MODULE, '-o', path, '--schema-cache', cache_path]
+        clear_serializer_cache()
+
+        assert main(argv) == 0
+        assert os.path.exists(cache_path)
+        assert schema_store.active is None
+
+        clear_serializer_cache()
+
+        assert main(argv + ['--check']) == 0
+
+    def test_render_options(self):
+        path = os.path.join(self.directory, 'types.ts')
+
+        assert main([
+            TYPES_MODULE,
+            '-o',
+            path,
+            '--export',
+            '--readonly',
+            '--optional-members',
+        ]) == 0
+        assert read_file(path).startswith(
+            'export interface Point {\n  readonly x: number\n'
+        )
+
+    def test_sharded_output(self):
+        assert main([
+            TYPES_MODULE,
+            SERIALIZERS_MODULE,
+            '--output-dir',
+            self.directory,
+            '--shard-size',
+            '150',
+        ]) == 0
+        assert sorted(os.listdir(self.directory)) == [
+            SERIALIZERS_MODULE + '-2.ts',
+            SERIALIZERS_MODULE + '.ts',
+            TYPES_MODULE + '.ts',
+        ]
+        assert read_file(os.path.join(
+            self.directory,
+            SERIALIZERS_MODULE + '-2.ts',
+        )) == dedent("""\
+        import type {{ Book }} from './{}'
+
+        export interface Library {{
+          books: Book[]
+        }}
+
+        export interface Tag {{
+          name: string
+        }}
+        """.format(SERIALIZERS_MODULE))
+
+    def test_output_to_one_file_and_checking_it(self):
+        path = os.path.join(self.directory, 'types.ts')
+        argv = [TYPES_MODULE, SERIALIZERS_MODULE, '-o', path]
+
+        assert main(argv + ['--check']) == 1
+        assert sys.stderr.getvalue() == '{} is out of date\n'.format(path)
+        assert main(argv) == 0
+        assert read_file(path) == EXPECTED_COMBINED_OUTPUT
+        assert main(argv + ['--check']) == 0
+
+    def test_output_to_one_file_per_module(self):
+        assert main([
+            TYPES_MODULE,
+            SERIALIZERS_MODULE,
+            '--output-dir',
+            self.directory,
+            '--indentation',
+            '4',
+        ]) == 0
+
+        types_output = read_file(os.path.join(
+            self.directory,
+            TYPES_MODULE + '.ts',
+        ))
+        expected = """\
+        interface Point {
+            x: number
+            y: number
+        }
+
+        interface Path {
+            points: Point[]
+        }
+        """
+
+        assert types_output == dedent(expected)
+        assert os.path.exists(os.path.join(
+            self.directory,
+            SERIALIZERS_MODULE + '.ts',
+        ))
+
+    def test_nested_serializers_from_other_modules(self):
+        models_path = os.path.join(self.directory, MODELS_MODULE + '.ts')
+
+        assert main([MODELS_MODULE, '--output-dir', self.directory]) == 0
+        assert read_file(models_path) == dedent("""\
+        interface Novel {
+          title: string
+          writer: NestedWriter
+        }
+
+        interface NestedWriter {
+          id: number
+          name: string
+        }
+
+        interface Shelf {
+          novels: Novel[]
+          tags: Tag[]
+        }
+
+        interface Tag {
+          name: string
+        }
+        """)
+
+        # Serializers from modules which are given are written with them.
+        assert main([
+            MODELS_MODULE,
+            SERIALIZERS_MODULE,
+            '--output-dir',
+            self.directory,
+        ]) == 0
+        assert 'interface Tag ' not in read_file(models_path)
+        assert 'interface Tag ' in read_file(os.path.join(
+            self.directory,
+            SERIALIZERS_MODULE + '.ts',
+        ))
+
+        shard_directory = os.path.join(self.directory, 'shards')
+
+        assert main([
+            MODELS_MODULE,
+            '--output-dir',
+            shard_directory,
+            '--shard-size',
+            '1000',
+        ]) == 0
+        assert 'export interface NestedWriter {' in read_file(os.path.join(
+            shard_directory,
+            MODELS_MODULE + '.ts',
+        ))
+
+    def test_openapi_files(self):
+        path = os.path.join(self.directory, 'schema.json')
+        output_dir = os.path.join(self.directory, 'output')
+        os.mkdir(output_dir)
+
+        with open(path, 'w') as fp:
+            json.dump(
+                {'definitions': {'Colour': {'enum': ['red', 'blue']}}},
+                fp,
+            )
+
+        assert main(['--openapi', path]) == 0
+        assert sys.stdout.getvalue() == 'type Colour = "blue" | "red"\n'
+        assert main([
+            TYPES_MODULE,
+            '--openapi',
+            path,
+            '--output-dir',
+            output_dir,
+        ]) == 0
+        assert read_file(os.path.join(output_dir, 'schema.ts')) == \
+            'type Colour = "blue" | "red"\n'
+        assert main([
+            '--openapi',
+            path,
+            '--output-dir',
+            output_dir,
+            '--shard-size',
+            '1000',
+        ]) == 0
+        assert read_file(os.path.join(output_dir, 'schema.ts')) == \
+            'export type Colour = "blue" | "red"\n'
+
+    def test_shared_aliases_for_wide_unions(self):
+        for name in ('first', 'second'):
+            with open(os.path.join(self.directory, name + '.json'), 'w') \
+                    as fp:
+                json.dump({'definitions': {name.title(): {
+                    'type': 'object',
+                    'properties': {'colour': {'enum': ['r', 'g', 'b']}},
+                    'required': ['colour'],
+                }}}, fp)
+
+        output_dir = os.path.join(self.directory, 'output')
+        argv = [
+            '--openapi',
+            os.path.join(self.directory, 'first.json'),
+            '--openapi',
+            os.path.join(self.directory, 'second.json'),
+            '--output-dir',
+            output_dir,
+            '--max-union-width',
+            '2',
+        ]
+        alias_name = ir.alias_name(ir.union([
+            ir.literal('r'),
+            ir.literal('g'),
+            ir.literal('b'),
+        ]))
+
+        assert main(argv) == 0
+        # Each alias is written once for every file, as the files are
+        # global scripts.
+        assert sorted(os.listdir(output_dir)) == [
+            'first.ts',
+            'second.ts',
+            'union-aliases.ts',
+        ]
+        assert read_file(os.path.join(output_dir, 'second.ts')) == \
+            'interface Second {{\n  colour: {}\n}}\n'.format(alias_name)
+        assert read_file(os.path.join(output_dir, 'union-aliases.ts')) == \
+            'type {} = "b" | "g" | "r"\n'.format(alias_name)
+
+        shutil.copy(
+            os.path.join(self.directory, 'first.json'),
+            os.path.join(self.directory, 'union-aliases.json'),
+        )
+
+        with self.assertRaises(SystemExit):
+            main(argv + [
+                '--openapi',
+                os.path.join(self.directory, 'union-aliases.json'),
+            ])
+
+    def test_roots(self):
+        assert main([TYPES_MODULE, SERIALIZERS_MODULE, '--root', 'Author']) \
+            == 0
+        assert sys.stdout.getvalue() == dedent("""\
+        interface Author {
+          name: string
+          tags: Tag[]
+        }
+
+        interface Tag {
+          name: string
+        }
+        """)
+        assert main([
+            TYPES_MODULE,
+            SERIALIZERS_MODULE,
+            '--root',
+            'Path',
+            '--output-dir',
+            self.directory,
+        ]) == 0
+        assert os.listdir(self.directory) == [TYPES_MODULE + '.ts']
+        assert main([
+            TYPES_MODULE,
+            '--root',
+            'Point',
+            '--output-dir',
+            self.directory,
+            '--shard-size',
+            '1000',
+        ]) == 0
+        assert read_file(os.path.join(
+            self.directory,
+            TYPES_MODULE + '.ts',
+        )) == 'export interface Point {\n  x: number\n  y: number\n}\n'
+
+        with self.assertRaises(SystemExit):
+            main([TYPES_MODULE, '--root', 'Nope'])
+
+        assert 'No interface is named Nope' in sys.stderr.getvalue()
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(SystemExit):
+            main([])
+
+        with self.assertRaises(SystemExit):
+            main([TYPES_MODULE, '--check'])
+
+        with self.assertRaises(SystemExit):
+            main([TYPES_MODULE, '-o', 'types.ts', '--shard-size', '100'])
+
+        with self.assertRaises(SystemExit):
+            main([TYPES_MODULE, '--max-union-width', '1'])
+
+    def test_django_setup(self):
+        _setup_django('settings')
+
+        assert os.environ['DJANGO_SETTINGS_MODULE'] == 'settings'
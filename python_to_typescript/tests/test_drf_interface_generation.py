@@ -1,11 +1,23 @@
 from __future__ import absolute_import, division, print_function, unicode_literals  # isort:skip # noqa
 
+import os
+import shutil
+import tempfile
 import unittest
 from textwrap import dedent
+from typing import List, Optional
 
 import django
+import six
 from django.contrib.postgres import fields as postgres_fields
 from django.db import models
+from rest_framework.relations import (
+    HyperlinkedIdentityField,
+    HyperlinkedRelatedField,
+    PrimaryKeyRelatedField,
+    SlugRelatedField,
+    StringRelatedField,
+)
 from rest_framework.serializers import (
     BooleanField,
     CharField,
@@ -29,13 +41,30 @@ from rest_framework.serializers import (
     NullBooleanField,
     RegexField,
     Serializer,
+    SerializerMethodField,
     SlugField,
     TimeField,
     URLField,
     UUIDField,
 )
 
-from ..drf import generate_interfaces_from_serializer
+from .. import schema_store
+from ..base import OptionalMember, RenderOptions
+from ..drf import (
+    clear_serializer_cache,
+    generate_interfaces_from_serializer,
+    generate_interfaces_from_serializers,
+    register_field_handler,
+    serializer_field_types,
+)
+
+
+class MoneyField(DecimalField):
+    pass
+
+
+class PriceField(MoneyField):
+    pass
 
 
 class DRFSerializerTestCase(unittest.TestCase):
@@ -199,3 +228,286 @@ class DRFSerializerTestCase(unittest.TestCase):
         """
 
         assert actual == dedent(expected)
+
+    def test_serializer_field_types_are_cached(self):
+        instances = []
+
+        class CountSerializer(Serializer):  # pylint: disable=abstract-method
+            name = CharField()
+
+            def __init__(self, *args, **kwargs):
+                instances.append(self)
+                super(CountSerializer, self).__init__(*args, **kwargs)
+
+        expected = """\
+        interface Count {
+          name: string
+        }
+        """
+
+        for _ in range(2):
+            actual = generate_interfaces_from_serializer(CountSerializer)
+
+            assert actual == dedent(expected)
+
+        assert len(instances) == 1
+        assert serializer_field_types(CountSerializer) == {
+            'name': six.text_type,
+        }
+
+        clear_serializer_cache(CountSerializer)
+        serializer_field_types(CountSerializer)
+
+        assert len(instances) == 2
+
+        clear_serializer_cache()
+        serializer_field_types(CountSerializer)
+
+        assert len(instances) == 3
+
+    def test_nested_serializers_and_relations(self):
+        class TagSerializer(Serializer):  # pylint: disable=abstract-method
+            name = CharField()
+
+        class UserSerializer(Serializer):  # pylint: disable=abstract-method
+            username = CharField()
+            tags = TagSerializer(many=True)
+
+        class PostSerializer(Serializer):  # pylint: disable=abstract-method
+            author = UserSerializer()
+            editor = UserSerializer(allow_null=True)
+            tags = TagSerializer(many=True)
+            pk = PrimaryKeyRelatedField(read_only=True)
+            uuid_pk = PrimaryKeyRelatedField(
+                read_only=True,
+                pk_field=UUIDField(),
+            )
+            pk_list = PrimaryKeyRelatedField(read_only=True, many=True)
+            slug = SlugRelatedField(read_only=True, slug_field='slug')
+            text = StringRelatedField()
+            link = HyperlinkedRelatedField(read_only=True, view_name='x')
+            url = HyperlinkedIdentityField(view_name='x')
+
+        actual = generate_interfaces_from_serializers([PostSerializer])
+        expected = """\
+        interface Post {
+          author: User
+          editor: User | null
+          link: string
+          pk: number | string
+          pk_list: (number | string)[]
+          slug: string
+          tags: Tag[]
+          text: string
+          url: string
+          uuid_pk: string
+        }
+
+        interface User {
+          tags: Tag[]
+          username: string
+        }
+
+        interface Tag {
+          name: string
+        }
+        """
+
+        assert actual == dedent(expected)
+
+    def test_serializer_cycles(self):
+        class NodeSerializer(Serializer):  # pylint: disable=abstract-method
+            name = CharField()
+
+            def get_fields(self):
+                fields = super(NodeSerializer, self).get_fields()
+                fields['children'] = NodeSerializer(many=True)
+
+                return fields
+
+        class TreeSerializer(Serializer):  # pylint: disable=abstract-method
+            root = NodeSerializer()
+
+        actual = generate_interfaces_from_serializers([
+            TreeSerializer,
+            NodeSerializer,
+        ])
+        expected = """\
+        interface Tree {
+          root: Node
+        }
+
+        interface Node {
+          children: Node[]
+          name: string
+        }
+        """
+
+        assert actual == dedent(expected)
+
+    def test_conflicting_serializer_names(self):
+        def make_serializer():
+            class ItemSerializer(Serializer):  # noqa # pylint: disable=abstract-method
+                name = CharField()
+
+            return ItemSerializer
+
+        with self.assertRaises(ValueError):
+            generate_interfaces_from_serializers([
+                make_serializer(),
+                make_serializer(),
+            ])
+
+    def test_model_serializers_with_depth(self):
+        django.setup()
+
+        class Person(models.Model):
+            name = models.CharField(max_length=100)
+
+        class Article(models.Model):
+            author = models.ForeignKey(Person, on_delete=models.CASCADE)
+            editor = models.ForeignKey(
+                Person,
+                on_delete=models.CASCADE,
+                related_name='+',
+            )
+
+        class ArticleSerializer(ModelSerializer):  # noqa # pylint: disable=abstract-method,no-init
+            class Meta(object):
+                model = Article
+                fields = ('author', 'editor')
+                depth = 2
+
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        store = schema_store.enable(os.path.join(directory, 'schemas.db'))
+
+        try:
+            actual = generate_interfaces_from_serializer(ArticleSerializer)
+        finally:
+            schema_store.disable().close()
+
+        expected = """\
+        interface Article {
+          author: NestedPersonDepth1
+          editor: NestedPersonDepth1
+        }
+
+        interface NestedPersonDepth1 {
+          id: number
+          name: string
+        }
+        """
+
+        assert actual == dedent(expected)
+        # Only the serializer which isn't built for Meta.depth is stored.
+        assert store.info().misses == 1
+
+    def test_serializer_method_fields(self):
+        def get_total(self, obj):  # pylint: disable=unused-argument
+            return 0
+
+        # Annotations are set directly, so they can be parsed by Python 2.
+        get_total.__annotations__ = {'return': Optional[int]}
+
+        class OrderSerializer(Serializer):  # pylint: disable=abstract-method
+            total = SerializerMethodField()
+            label = SerializerMethodField()
+
+            def get_label(self, obj):  # pylint: disable=no-self-use
+                return six.text_type(obj)
+
+        OrderSerializer.get_total = get_total
+
+        assert OrderSerializer('x').data == {'label': 'x', 'total': 0}
+
+        actual = generate_interfaces_from_serializer(OrderSerializer)
+        expected = """\
+        interface Order {
+          label: any
+          total: number | null
+        }
+        """
+
+        assert actual == dedent(expected)
+
+    def test_serializer_method_fields_with_string_annotations(self):
+        def get_names(self, obj):  # pylint: disable=unused-argument
+            return []
+
+        def get_count(self, obj):  # pylint: disable=unused-argument
+            return 0
+
+        # Strings are what `from __future__ import annotations` produces.
+        get_names.__annotations__ = {'return': 'List[str]'}
+        get_count.__annotations__ = {'return': 'Undefined'}
+
+        class TagListSerializer(Serializer):  # noqa # pylint: disable=abstract-method
+            names = SerializerMethodField()
+            count = SerializerMethodField()
+
+        TagListSerializer.get_names = get_names
+        TagListSerializer.get_count = get_count
+
+        assert TagListSerializer('x').data == {'names': [], 'count': 0}
+
+        actual = generate_interfaces_from_serializer(TagListSerializer)
+        expected = """\
+        interface TagList {
+          count: any
+          names: string[]
+        }
+        """
+
+        assert actual == dedent(expected)
+
+    def test_registering_field_handlers(self):
+        class PaymentSerializer(Serializer):  # noqa # pylint: disable=abstract-method
+            price = PriceField(max_digits=5, decimal_places=2)
+            prices = ListField(child=PriceField(
+                max_digits=5,
+                decimal_places=2,
+                allow_null=True,
+            ))
+
+        assert serializer_field_types(PaymentSerializer) == {
+            'price': six.text_type,
+            'prices': List[Optional[six.text_type]],
+        }
+
+        register_field_handler(MoneyField, lambda field, field_type: float)
+
+        actual = generate_interfaces_from_serializer(PaymentSerializer)
+        expected = """\
+        interface Payment {
+          price: number
+          prices: (number | null)[]
+        }
+        """
+
+        assert actual == dedent(expected)
+
+    def test_optional_members(self):
+        class ProfileSerializer(Serializer):  # noqa # pylint: disable=abstract-method
+            name = CharField()
+            nickname = CharField(required=False)
+            language = CharField(required=False, default='en')
+            id = IntegerField(read_only=True)
+
+        assert serializer_field_types(ProfileSerializer)['nickname'] == \
+            OptionalMember(six.text_type)
+
+        actual = generate_interfaces_from_serializers(
+            [ProfileSerializer],
+            options=RenderOptions(optional_members=True),
+        )
+        expected = """\
+        interface Profile {
+          id: number
+          language: string
+          name: string
+          nickname?: string
+        }
+        """
+
+        assert actual == dedent(expected)
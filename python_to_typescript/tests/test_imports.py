@@ -0,0 +1,35 @@
+from __future__ import absolute_import, division, print_function, unicode_literals  # isort:skip # noqa
+
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__),
+)))
+
+# Generate an interface in a new interpreter, and print the modules loaded.
+SCRIPT = """
+import sys
+from python_to_typescript.base import generate_interfaces
+import python_to_typescript.drf
+
+generate_interfaces([('Point', {'x': int, 'y': int})])
+
+print(' '.join(sorted(sys.modules)))
+"""
+
+
+class ImportTestCase(unittest.TestCase):
+    def test_django_is_not_imported_until_used(self):
+        output = subprocess.check_output(
+            [sys.executable, '-c', SCRIPT],
+            cwd=ROOT_DIRECTORY,
+        )
+        module_names = output.decode('utf-8').split()
+
+        assert 'python_to_typescript.drf' in module_names
+        assert 'django' not in module_names
+        assert 'rest_framework' not in module_names
+        assert 'dataclasses' not in module_names
@@ -0,0 +1,249 @@
+from __future__ import absolute_import, division, print_function, unicode_literals  # isort:skip # noqa
+
+import os
+import shutil
+import tempfile
+import unittest
+from typing import List, Optional, Union
+
+from .. import incremental
+from ..base import (
+    RenderOptions,
+    _type_handlers,
+    generate_interface,
+    generate_interfaces,
+    register_type_handler,
+    type_node,
+)
+from ..incremental import (
+    InterfaceManifest,
+    read_file,
+    write_if_changed,
+    write_interface_files,
+)
+
+try:
+    import enum
+except ImportError:  # pragma: no cover
+    enum = None
+
+
+class Money(object):
+    pass
+
+
+PYTHON_TYPES = [
+    ('First', {'a': int, 'b': Optional[str]}),
+    ('Second', {'c': List[int]}),
+]
+
+
+class IncrementalGenerationTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_manifest_output_matches_generate_interfaces(self):
+        manifest = InterfaceManifest()
+
+        assert manifest.generate_interfaces(PYTHON_TYPES, 4, '\r\n') == \
+            generate_interfaces(PYTHON_TYPES, 4, '\r\n')
+        assert manifest.generate_interfaces([]) == generate_interfaces([])
+
+    def test_manifest_output_with_render_options(self):
+        manifest = InterfaceManifest()
+        python_types = PYTHON_TYPES + [('Number', Optional[int])]
+        options = RenderOptions(export=True)
+
+        assert manifest.generate_interfaces(python_types, options=options) \
+            == generate_interfaces(python_types, options=options)
+        assert manifest.rendered == ['First', 'Second', 'Number']
+
+        manifest.rendered = []
+        manifest.generate_interfaces(python_types, options=options)
+
+        assert manifest.rendered == []
+
+        manifest.generate_interfaces(python_types)
+
+        assert manifest.rendered == ['First', 'Second', 'Number']
+
+    def test_manifest_output_with_wide_unions(self):
+        manifest = InterfaceManifest()
+        python_types = [
+            ('First', {'a': Union[int, str, bool]}),
+            ('Second', {'b': Union[int, str, float, None]}),
+        ]
+        options = RenderOptions(max_union_width=2)
+        expected = generate_interfaces(python_types, options=options)
+
+        for _ in range(2):
+            assert manifest.generate_interfaces(
+                python_types,
+                options=options,
+            ) == expected
+
+        assert manifest.rendered == ['First', 'Second']
+
+        aliases = {}
+
+        assert manifest.generate_interfaces(
+            python_types,
+            options=options,
+            aliases=aliases,
+        ) == generate_interfaces(python_types, options=options, aliases={})
+        assert len(aliases) == 1
+
+        with self.assertRaises(ValueError):
+            manifest.generate_interfaces(
+                python_types,
+                options=options,
+                aliases={name: 'type {} = null\n'.format(name)
+                         for name in aliases},
+            )
+
+        assert manifest.render_interface(
+            'First',
+            python_types[0][1],
+            options=options,
+        ) == generate_interface('First', python_types[0][1], options=options)
+
+    def test_only_changed_interfaces_are_rendered(self):
+        manifest = InterfaceManifest()
+        manifest.generate_interfaces(PYTHON_TYPES)
+
+        assert manifest.rendered == ['First', 'Second']
+
+        manifest.rendered = []
+        changed_types = [
+            ('First', {'a': int, 'b': Optional[str]}),
+            ('Second', {'c': List[str]}),
+        ]
+
+        assert manifest.generate_interfaces(changed_types) == \
+            generate_interfaces(changed_types)
+        assert manifest.rendered == ['Second']
+
+    def test_unchanged_types_are_not_hashed_again(self):
+        # pylint: disable=protected-access
+        hashed_names = []
+        input_hash = incremental._input_hash
+
+        def counting_input_hash(interface_name, *args):
+            hashed_names.append(interface_name)
+
+            return input_hash(interface_name, *args)
+
+        self.addCleanup(setattr, incremental, '_input_hash', input_hash)
+        incremental._input_hash = counting_input_hash
+
+        python_types = [('Price', {'amount': Money})]
+        manifest = InterfaceManifest()
+
+        assert manifest.generate_interfaces(python_types) == \
+            'interface Price {\n  amount: any\n}\n'
+        assert manifest.generate_interfaces(python_types) == \
+            'interface Price {\n  amount: any\n}\n'
+        assert hashed_names == ['Price']
+
+        # The types are hashed again when handlers are registered.
+        self.addCleanup(type_node.cache_clear)
+        self.addCleanup(_type_handlers.unregister, Money)
+        register_type_handler(Money, lambda some_type: ['string'])
+
+        assert manifest.generate_interfaces(python_types) == \
+            'interface Price {\n  amount: string\n}\n'
+        assert hashed_names == ['Price', 'Price']
+        assert manifest.rendered == ['Price', 'Price']
+
+    def test_the_same_names_can_be_used_for_different_paths(self):
+        manifest = InterfaceManifest()
+
+        for _ in range(2):
+            manifest.generate_interfaces(PYTHON_TYPES[:1], path='first.ts')
+            manifest.generate_interfaces(
+                [('First', {'c': bool})],
+                path='second.ts',
+            )
+
+        assert manifest.rendered == ['First', 'First']
+        assert sorted(manifest.entries) == [
+            'first.ts:First',
+            'second.ts:First',
+        ]
+
+        manifest.prune([('second.ts', 'First')])
+
+        assert sorted(manifest.entries) == ['second.ts:First']
+
+    @unittest.skipIf(enum is None, 'enum is not available')
+    def test_types_with_the_same_reprs_are_compared(self):
+        class Colour(enum.Enum):
+            RED = 'red'
+
+        manifest = InterfaceManifest()
+        manifest.generate_interfaces([('Paint', {'colour': Colour})])
+
+        # The class is redefined with another value, but the same repr.
+        class Colour(enum.Enum):  # pylint: disable=function-redefined
+            RED = 'red'
+            BLUE = 'blue'
+
+        changed_types = [('Paint', {'colour': Colour})]
+        manifest.rendered = []
+
+        assert manifest.generate_interfaces(changed_types) == \
+            generate_interfaces(changed_types)
+        assert manifest.rendered == ['Paint']
+
+    def test_manifests_can_be_saved_and_loaded(self):
+        path = os.path.join(self.directory, 'manifest.json')
+
+        assert InterfaceManifest.load(path).entries == {}
+
+        manifest = InterfaceManifest()
+        manifest.generate_interfaces(PYTHON_TYPES)
+
+        assert manifest.save(path)
+        assert not manifest.save(path)
+
+        loaded_manifest = InterfaceManifest.load(path)
+        loaded_manifest.generate_interfaces(PYTHON_TYPES)
+
+        assert loaded_manifest.entries == manifest.entries
+        assert loaded_manifest.rendered == []
+
+    def test_write_if_changed(self):
+        path = os.path.join(self.directory, 'nested', 'file.ts')
+
+        assert read_file(path) is None
+        assert write_if_changed(path, 'x\r\n')
+        assert not write_if_changed(path, 'x\r\n')
+        assert read_file(path) == 'x\r\n'
+
+    def test_write_interface_files(self):
+        manifest_path = os.path.join(self.directory, 'manifest.json')
+        first_path = os.path.join(self.directory, 'first.ts')
+        second_path = os.path.join(self.directory, 'second.ts')
+        files = {
+            first_path: [PYTHON_TYPES[0]],
+            second_path: [PYTHON_TYPES[1]],
+        }
+
+        assert write_interface_files(files, manifest_path) == [
+            first_path,
+            second_path,
+        ]
+        assert read_file(second_path) == generate_interfaces([
+            PYTHON_TYPES[1],
+        ])
+
+        files[second_path] = [('Third', {'d': bool})]
+
+        assert write_interface_files(files, manifest_path) == [second_path]
+        assert sorted(InterfaceManifest.load(manifest_path).entries) == [
+            first_path + ':First',
+            second_path + ':Third',
+        ]
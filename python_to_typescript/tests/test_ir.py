@@ -0,0 +1,143 @@
+from __future__ import absolute_import, division, print_function, unicode_literals  # isort:skip # noqa
+
+import pickle
+import unittest
+
+from .. import ir
+
+
+class IntermediateRepresentationTestCase(unittest.TestCase):
+    def test_nodes_are_hash_consed(self):
+        assert ir.Array(ir.STRING) is ir.Array(ir.STRING)
+        assert ir.Map(ir.Array(ir.NUMBER)) is ir.Map(ir.Array(ir.NUMBER))
+        assert ir.Tuple(ir.STRING, ir.NUMBER) is not \
+            ir.Tuple(ir.NUMBER, ir.STRING)
+        assert ir.name_node('string') is ir.STRING
+        assert ir.name_node('Foo') is ir.Reference('Foo')
+        assert pickle.loads(pickle.dumps(ir.Array(ir.STRING))) is \
+            ir.Array(ir.STRING)
+
+    def test_unions_are_flattened(self):
+        inner_union = ir.union([ir.STRING, ir.NUMBER])
+
+        assert ir.union([ir.NULL, inner_union]) is \
+            ir.union([ir.NUMBER, ir.NULL, ir.STRING, ir.STRING])
+        assert ir.union([ir.STRING, ir.STRING]) is ir.STRING
+        assert ir.union([inner_union]) is inner_union
+
+    def test_rendering(self):
+        assert ir.render(ir.union([
+            ir.NULL,
+            ir.Array(ir.union([ir.STRING, ir.NUMBER])),
+            ir.Map(ir.union([ir.STRING, ir.NULL])),
+            ir.Tuple(ir.NUMBER, ir.BOOLEAN),
+        ])) == (
+            '(number | string)[] | [number, boolean] | '
+            '{[key: string]: string | null} | null'
+        )
+        # Arrays of anything containing a union are grouped.
+        assert ir.render(ir.Array(ir.Map(ir.union([ir.STRING, ir.NULL])))) \
+            == '({[key: string]: string | null})[]'
+        assert ir.render(ir.Array(ir.Tuple(ir.union([ir.STRING, ir.NULL])))) \
+            == '([string | null])[]'
+        assert ir.render(ir.Array(ir.Reference('A | B'))) == '(A | B)[]'
+        # Members which render the same text only appear once.
+        assert ir.render(ir.Array(ir.union([
+            ir.STRING,
+            ir.Reference('string'),
+        ]))) == 'string[]'
+
+    def test_node_attributes(self):
+        union = ir.union([ir.STRING, ir.Reference('Foo')])
+
+        assert repr(ir.Reference('Foo')) == "Reference({!r})".format('Foo')
+        assert ir.Array(ir.STRING).item is ir.STRING
+        assert ir.Tuple(ir.STRING).items == (ir.STRING,)
+        assert ir.Map(ir.STRING).value is ir.STRING
+        assert union.members == frozenset([ir.STRING, ir.Reference('Foo')])
+        assert set(ir.walk(ir.Array(ir.Tuple(ir.Map(union))))) == {
+            ir.Array(ir.Tuple(ir.Map(union))),
+            ir.Tuple(ir.Map(union)),
+            ir.Map(union),
+            union,
+            ir.STRING,
+            ir.Reference('Foo'),
+        }
+
+    def test_literals(self):
+        assert ir.literal(None) is ir.NULL
+        assert ir.literal(object()) is ir.ANY
+        assert ir.literal(True) is not ir.literal(1)
+        assert ir.literal('red').value == 'red'
+        assert ir.render(ir.union([ir.literal(1), ir.literal('1')])) == \
+            '"1" | 1'
+
+    def test_unions_remove_subsumed_members(self):
+        assert ir.union([ir.STRING, ir.ANY, ir.Array(ir.NUMBER)]) is ir.ANY
+        assert ir.union([
+            ir.OBJECT,
+            ir.Array(ir.NUMBER),
+            ir.Map(ir.STRING),
+            ir.Tuple(ir.NUMBER),
+            ir.Reference('Foo'),
+        ]) is ir.union([ir.OBJECT, ir.Reference('Foo')])
+        assert ir.union([
+            ir.literal('red'),
+            ir.literal(1),
+            ir.literal(True),
+            ir.STRING,
+            ir.BOOLEAN,
+        ]) is ir.union([ir.literal(1), ir.STRING, ir.BOOLEAN])
+        assert ir.literal(1.5).primitive is ir.NUMBER
+        assert ir.literal(False).primitive is ir.BOOLEAN
+        assert ir.literal('x').primitive is ir.STRING
+
+    def test_transform(self):
+        node = ir.Tuple(
+            ir.Array(ir.NUMBER),
+            ir.Map(ir.union([ir.NUMBER, ir.STRING])),
+            ir.Array(ir.NUMBER),
+        )
+        visited = []
+
+        def number_to_string(node):
+            visited.append(node)
+
+            return ir.STRING if node is ir.NUMBER else node
+
+        assert ir.transform(node, number_to_string) is ir.Tuple(
+            ir.Array(ir.STRING),
+            ir.Map(ir.STRING),
+            ir.Array(ir.STRING),
+        )
+        # Each distinct node is only visited once.
+        assert visited.count(ir.NUMBER) == 1
+        assert ir.transform(node, lambda node: node) is node
+        assert ir.STRING.with_children(()) is ir.STRING
+
+    def test_collapsing_unions(self):
+        wide_union = ir.union([ir.NUMBER, ir.STRING, ir.BOOLEAN])
+        alias_name = ir.alias_name(wide_union)
+        aliases = {}
+
+        assert alias_name.startswith('Union')
+        assert alias_name == ir.alias_name(
+            ir.union([ir.BOOLEAN, ir.STRING, ir.NUMBER]),
+        )
+        assert ir.collapse_unions(
+            ir.Tuple(
+                ir.union([wide_union, ir.NULL]),
+                ir.Array(ir.union([ir.NUMBER, ir.NULL])),
+            ),
+            2,
+            aliases,
+        ) is ir.Tuple(
+            ir.union([ir.Reference(alias_name), ir.NULL]),
+            ir.Array(ir.union([ir.NUMBER, ir.NULL])),
+        )
+        assert aliases == {alias_name: wide_union}
+        assert ir.collapse_unions(wide_union, 3, aliases) is wide_union
+
+        # Different unions with the same alias name are never replaced.
+        with self.assertRaises(ValueError):
+            ir.collapse_unions(wide_union, 2, {alias_name: ir.STRING})
@@ -0,0 +1,345 @@
+from __future__ import absolute_import, division, print_function, unicode_literals  # isort:skip # noqa
+
+import json
+import unittest
+from collections import OrderedDict
+from io import BytesIO
+from textwrap import dedent
+
+from .. import ir, openapi
+from ..base import OptionalMember, RenderOptions, generate_interfaces
+from ..openapi import (
+    SchemaConverter,
+    generate_interfaces_from_openapi,
+    openapi_python_types,
+    read_schemas,
+)
+
+DOCUMENT = OrderedDict([
+    ('openapi', '3.0.3'),
+    ('paths', {'/books/': {'get': {'responses': {}}}}),
+    ('components', {'schemas': OrderedDict([
+        ('Book', {
+            'type': 'object',
+            'required': ['title', 'author', 'status'],
+            'properties': OrderedDict([
+                ('title', {'type': 'string'}),
+                ('pages', {'type': 'integer', 'nullable': True}),
+                ('author', {'$ref': '#/components/schemas/Author'}),
+                ('status', {'$ref': '#/components/schemas/Status'}),
+                ('tags', {
+                    'type': 'array',
+                    'items': {
+                        'type': 'object',
+                        'properties': {'name': {'type': 'string'}},
+                    },
+                }),
+                ('password', {'type': 'string', 'writeOnly': True}),
+            ]),
+        }),
+        ('Author', {
+            'type': 'object',
+            'required': ['name'],
+            'properties': {
+                'name': {'type': 'string'},
+                'books': {
+                    'type': 'array',
+                    'items': {'$ref': '#/components/schemas/Book'},
+                },
+            },
+        }),
+        ('Status', {'type': 'string', 'enum': ['draft', 'published']}),
+        ('BookTagsItem', {'type': 'string'}),
+    ])}),
+])
+
+EXPECTED_OUTPUT = """\
+interface Book {
+  author: Author
+  pages: number | null
+  status: Status
+  tags: BookTagsItem2[]
+  title: string
+}
+
+interface BookTagsItem2 {
+  name: string
+}
+
+interface Author {
+  books: Book[]
+  name: string
+}
+
+type Status = "draft" | "published"
+
+type BookTagsItem = string
+"""
+
+
+def _document_file(document):
+    return BytesIO(json.dumps(document).encode('utf-8'))
+
+
+class _UnseekableFile(BytesIO):
+    def seekable(self):
+        return False
+
+
+class OpenAPITestCase(unittest.TestCase):
+    @unittest.skipIf(openapi.ijson is None, 'ijson is not available')
+    def test_read_schemas_with_ijson(self):
+        schemas = read_schemas(_document_file(DOCUMENT))
+
+        assert list(schemas) == ['Book', 'Author', 'Status', 'BookTagsItem']
+        assert schemas['Status'] == DOCUMENT['components']['schemas']['Status']
+
+    def test_read_schemas_without_ijson(self):
+        ijson = openapi.ijson
+        openapi.ijson = None
+
+        try:
+            schemas = read_schemas(_document_file(DOCUMENT))
+        finally:
+            openapi.ijson = ijson
+
+        assert list(schemas) == ['Book', 'Author', 'Status', 'BookTagsItem']
+
+    def test_read_schemas_from_unseekable_files(self):
+        fp = _UnseekableFile(json.dumps(DOCUMENT).encode('utf-8'))
+
+        assert list(read_schemas(fp)) == [
+            'Book',
+            'Author',
+            'Status',
+            'BookTagsItem',
+        ]
+
+    def test_read_other_schema_locations(self):
+        for document in (
+            {'definitions': {'A': {'type': 'string'}}},
+            {'$defs': {'A': {'type': 'string'}}},
+        ):
+            for fp in (
+                _document_file(document),
+                _UnseekableFile(json.dumps(document).encode('utf-8')),
+            ):
+                assert read_schemas(fp) == {'A': {'type': 'string'}}
+
+            for fp in (
+                _document_file({}),
+                _UnseekableFile(b'{}'),
+            ):
+                assert read_schemas(fp) == {}
+
+    def test_read_root_schemas(self):
+        document = OrderedDict([
+            ('title', 'Person'),
+            ('type', 'object'),
+            ('properties', {
+                'name': {'type': 'string'},
+                'address': {'$ref': '#/$defs/Address'},
+            }),
+            ('required', ['name']),
+            ('$defs', {'Address': {'type': 'string'}}),
+        ])
+        ijson = openapi.ijson
+
+        for use_ijson in (True, False):
+            openapi.ijson = ijson if use_ijson else None
+
+            try:
+                schemas = read_schemas(_document_file(document))
+            finally:
+                openapi.ijson = ijson
+
+            assert list(schemas) == ['Person', 'Address']
+            assert '$defs' not in schemas['Person']
+            assert generate_interfaces_from_openapi(
+                _document_file(document),
+            ) == dedent("""\
+            interface Person {
+              address: Address
+              name: string
+            }
+
+            type Address = string
+            """)
+
+    def test_root_schema_names(self):
+        document = {'type': 'string', '$defs': {'Schema': {'type': 'null'}}}
+
+        assert list(read_schemas(_document_file(document))) == [
+            'Schema2',
+            'Schema',
+        ]
+
+        fp = _document_file({'type': 'string'})
+        fp.name = '/schemas/person-record.json'
+
+        assert list(read_schemas(fp)) == ['PersonRecord']
+        # Documents for OpenAPI are never schemas themselves.
+        assert read_schemas(_document_file({
+            'openapi': '3.0.0',
+            'type': 'string',
+        })) == {}
+
+    def test_generate_interfaces_from_openapi(self):
+        assert generate_interfaces_from_openapi(
+            _document_file(DOCUMENT),
+        ) == EXPECTED_OUTPUT
+
+    def test_optional_members(self):
+        python_types = dict(openapi_python_types(_document_file(DOCUMENT)))
+
+        assert python_types['Book']['pages'] == OptionalMember(
+            ir.union([ir.NUMBER, ir.NULL]),
+        )
+        assert generate_interfaces_from_openapi(
+            _document_file(DOCUMENT),
+            options=RenderOptions(optional_members=True),
+        ).startswith(dedent("""\
+        interface Book {
+          author: Author
+          pages?: number | null
+        """))
+
+    def test_schema_types(self):
+        converter = SchemaConverter(OrderedDict([
+            ('Pet', {
+                'oneOf': [
+                    {'$ref': '#/components/schemas/Cat'},
+                    {'$ref': '#/components/schemas/Dog'},
+                ],
+            }),
+            ('Cat', {'type': 'object', 'properties': {}}),
+            ('Dog', {
+                'allOf': [
+                    {'$ref': '#/components/schemas/Cat'},
+                    {
+                        'required': ['bark'],
+                        'properties': {'bark': {'type': 'boolean'}},
+                    },
+                ],
+            }),
+            ('Point', {
+                'type': 'array',
+                'prefixItems': [{'type': 'number'}, {'type': 'number'}],
+            }),
+            ('Anything', {'type': 'array'}),
+            ('Scores', {
+                'type': 'object',
+                'additionalProperties': {'type': 'integer'},
+            }),
+            ('Blob', {'type': 'object'}),
+            ('Maybe', {'type': ['string', 'null']}),
+            ('One', {'const': 1}),
+            ('Either', {'anyOf': [{'type': 'string'}, {'type': 'number'}]}),
+            ('Named', {'allOf': [{'$ref': '#/components/schemas/Pet'}]}),
+            ('External', {'$ref': 'other.json#/Pet'}),
+            ('Missing', {'$ref': '#/components/schemas/Missing/x'}),
+            ('Elsewhere', {'$ref': '#/paths/x'}),
+            ('Bark', {'$ref': '#/components/schemas/Dog/allOf/1'}),
+            ('Inline', {'$ref': '#/components/schemas/Blob2'}),
+            ('Blob2', {
+                'type': 'object',
+                'additionalProperties': {
+                    'properties': {'x': {'type': 'number'}},
+                },
+            }),
+            ('Unknown', {}),
+        ]))
+
+        assert dict(converter.python_types()) == {
+            'Pet': ir.union([ir.Reference('Cat'), ir.Reference('Dog')]),
+            'Cat': {},
+            'Dog': {'bark': ir.BOOLEAN},
+            'Point': ir.Tuple(ir.NUMBER, ir.NUMBER),
+            'Anything': ir.Array(ir.ANY),
+            'Scores': ir.Map(ir.NUMBER),
+            'Blob': ir.OBJECT,
+            'Maybe': ir.union([ir.STRING, ir.NULL]),
+            'One': ir.literal(1),
+            'Either': ir.union([ir.STRING, ir.NUMBER]),
+            'Named': ir.Reference('Pet'),
+            'External': ir.ANY,
+            'Missing': ir.ANY,
+            'Elsewhere': ir.ANY,
+            'Bark': ir.Reference('DogAllOf1'),
+            'DogAllOf1': {'bark': ir.BOOLEAN},
+            'Inline': ir.Reference('Blob2'),
+            'Blob2': ir.Map(ir.Reference('Blob2Value')),
+            'Blob2Value': {'x': OptionalMember(ir.NUMBER)},
+            'Unknown': ir.ANY,
+        }
+        # The types are only built once.
+        assert converter.python_types() is converter.python_types()
+
+    def test_boolean_schemas_and_property_names(self):
+        converter = SchemaConverter(OrderedDict([
+            ('Headers', {
+                'type': 'object',
+                'required': ['content-type'],
+                'properties': OrderedDict([
+                    ('content-type', {'type': 'string'}),
+                    ('@id', True),
+                    ('removed', False),
+                ]),
+                'additionalProperties': False,
+            }),
+            ('Anything', True),
+            ('Items', {'type': 'array', 'items': True}),
+            ('Extended', {'allOf': [True, {'$ref': '#/$defs/Headers'}]}),
+        ]))
+
+        headers = {
+            'content-type': ir.STRING,
+            '@id': OptionalMember(ir.ANY),
+        }
+
+        assert dict(converter.python_types()) == {
+            'Headers': headers,
+            'Anything': ir.ANY,
+            'Items': ir.Array(ir.ANY),
+            'Extended': headers,
+        }
+        assert generate_interfaces(converter.python_types()[:1]) == dedent("""\
+        interface Headers {
+          "@id": any
+          "content-type": string
+        }
+        """)
+
+    def test_nodes_before_python_types(self):
+        converter = SchemaConverter({'Item': {'type': 'string'}})
+        schema = {'type': 'object', 'properties': {'a': {'type': 'string'}}}
+
+        assert converter.node(schema, 'Item') == ir.Reference('Item2')
+        assert converter.ref_node('#/$defs/Item') == ir.Reference('Item')
+        assert [name for name, _ in converter.python_types()] == [
+            'Item2',
+            'Item',
+        ]
+
+    def test_refs_are_resolved_once(self):
+        converter = SchemaConverter(OrderedDict([
+            ('Tree', {
+                'type': 'object',
+                'properties': {
+                    'children': {
+                        'type': 'array',
+                        'items': {
+                            '$ref': '#/components/schemas/Tree/properties'
+                            '/children',
+                        },
+                    },
+                },
+            }),
+        ]))
+
+        assert converter.ref_node(
+            '#/components/schemas/Tree/properties/children',
+        ) == ir.Array(ir.ANY)
+        assert converter.ref_node(
+            '#/components/schemas/Tree/properties/children',
+        ) is ir.Array(ir.ANY)
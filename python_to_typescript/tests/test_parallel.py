@@ -0,0 +1,118 @@
+from __future__ import absolute_import, division, print_function, unicode_literals  # isort:skip # noqa
+
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import unittest
+from typing import List
+
+import django
+from rest_framework.serializers import (
+    CharField,
+    IntegerField,
+    Serializer,
+)
+
+from .. import schema_store
+from ..drf import generate_interfaces_from_serializers
+from ..parallel import (
+    _chunk_size,
+    _setup_worker,
+    _worker_schema,
+    generate_interfaces_from_serializers_parallel,
+    serializer_schemas_parallel,
+)
+
+
+class TagSerializer(Serializer):  # pylint: disable=abstract-method
+    name = CharField()
+
+
+class AuthorSerializer(Serializer):  # pylint: disable=abstract-method
+    name = CharField()
+    tags = TagSerializer(many=True)
+
+
+class BookSerializer(Serializer):  # pylint: disable=abstract-method
+    title = CharField()
+    pages = IntegerField()
+    author = AuthorSerializer()
+
+
+class ReviewSerializer(Serializer):  # pylint: disable=abstract-method
+    book = BookSerializer()
+    score = IntegerField()
+
+
+@unittest.skipIf(sys.version_info < (3, 7), 'Python 3.7 is required')
+class ParallelGenerationTestCase(unittest.TestCase):
+    def test_parallel_output_matches_serial_output(self):
+        serializer_classes = [ReviewSerializer, TagSerializer, BookSerializer]
+
+        actual = generate_interfaces_from_serializers_parallel(
+            serializer_classes,
+            max_workers=2,
+        )
+
+        assert actual == generate_interfaces_from_serializers(
+            serializer_classes,
+        )
+
+    def test_nested_serializers_are_found(self):
+        schemas = serializer_schemas_parallel([ReviewSerializer], 2)
+
+        assert set(schemas) == {
+            ReviewSerializer,
+            BookSerializer,
+            AuthorSerializer,
+            TagSerializer,
+        }
+        assert schemas[BookSerializer].name == 'Book'
+
+    def test_serializers_with_depth(self):
+        django.setup()
+
+        from .example_models import NovelSerializer, Writer
+
+        # Classes built for Meta.depth are sent back from workers as keys.
+        assert _worker_schema(NovelSerializer).nested_serializers == (
+            (Writer, 0),
+        )
+
+        actual = generate_interfaces_from_serializers_parallel(
+            [NovelSerializer],
+            max_workers=2,
+        )
+
+        assert actual == generate_interfaces_from_serializers(
+            [NovelSerializer],
+        )
+        assert 'interface NestedWriter {' in actual
+
+    def test_forward_refs_can_be_pickled(self):
+        list_type = List['TagSerializer']
+
+        assert pickle.loads(pickle.dumps(list_type)) == list_type
+
+    def test_chunk_size(self):
+        assert _chunk_size(0, 2) == 1
+        assert _chunk_size(100, 2) == 12
+        assert _chunk_size(100, None) >= 1
+
+    def test_setup_worker(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        store = schema_store.enable(os.path.join(directory, 'schemas.db'))
+        self.addCleanup(store.close)
+        _setup_worker()
+
+        assert schema_store.active is None
+
+        old_settings = os.environ.pop('DJANGO_SETTINGS_MODULE')
+
+        try:
+            _setup_worker()
+        finally:
+            os.environ['DJANGO_SETTINGS_MODULE'] = old_settings
@@ -0,0 +1,115 @@
+from __future__ import absolute_import, division, print_function, unicode_literals  # isort:skip # noqa
+
+import unittest
+
+from .. import profiling
+from ..base import type_name
+from ..cache import LRUCache
+from ..drf import clear_serializer_cache, generate_interfaces_from_serializers
+from .example_serializers import (
+    AuthorSerializer,
+    BookSerializer,
+    TagSerializer,
+)
+
+
+class FakeTimer(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class ProfilingTestCase(unittest.TestCase):
+    def setUp(self):
+        # pylint: disable=protected-access
+        self.timer = profiling.timer
+        self.caches = profiling._caches.copy()
+
+    def tearDown(self):
+        # pylint: disable=protected-access
+        profiling.disable()
+        profiling.timer = self.timer
+        profiling._caches.clear()
+        profiling._caches.update(self.caches)
+
+    def test_profiling_is_disabled_by_default(self):
+        profile = profiling.current()
+
+        assert profiling.active is None
+        assert profile.timed('type_resolution', type_name) is type_name
+
+        with profile.phase('rendering'):
+            with profile.serializer(BookSerializer):
+                pass
+
+    def test_profiling_serializers(self):
+        clear_serializer_cache()
+        type_name.cache_clear()
+        profile = profiling.enable()
+
+        assert profiling.current() is profile
+
+        generate_interfaces_from_serializers([BookSerializer])
+
+        assert profiling.disable() is profile
+        assert profiling.active is None
+        assert sorted(profile.phases) == [
+            'field_mapping',
+            'rendering',
+            'serializer_instantiation',
+            'type_resolution',
+        ]
+        assert profile.phases['serializer_instantiation'].calls == 3
+        assert profile.phases['rendering'].calls == 3
+        assert profile.phases['type_resolution'].calls == 6
+        assert profile.cache_stats()['serializer_schema'] == \
+            profiling.CacheStats(0, 3)
+        assert {
+            cls for cls, _ in profile.slowest_serializers()
+        } == {AuthorSerializer, BookSerializer, TagSerializer}
+        assert len(profile.slowest_serializers(1)) == 1
+
+    def test_nested_phases_are_not_counted_twice(self):
+        timer = profiling.timer = FakeTimer()
+        profile = profiling.enable()
+
+        with profile.serializer(BookSerializer):
+            with profile.phase('outer'):
+                timer.now += 1
+
+                with profile.phase('inner'):
+                    timer.now += 2
+
+                timer.now += 4
+
+        assert profile.phases == {
+            'inner': profiling.PhaseStats(1, 2.0),
+            'outer': profiling.PhaseStats(1, 5.0),
+        }
+        assert profile.slowest_serializers() == [(BookSerializer, 7.0)]
+
+    def test_report(self):
+        # pylint: disable=protected-access
+        profiling._caches.clear()
+        profiling.register_cache('other', LRUCache().info)
+        profile = profiling.Profile()
+        late_cache = LRUCache()
+        profiling.register_cache('late', late_cache.info)
+        late_cache.get('x')
+        late_cache.set('x', 1)
+        late_cache.get('x')
+        profile.add('rendering', 0.5)
+
+        lines = profile.report().splitlines()
+
+        assert profile.cache_stats()['late'] == profiling.CacheStats(1, 1)
+        assert [line.split() for line in lines] == [
+            ['phase', 'calls', 'seconds'],
+            ['rendering', '1', '0.500000'],
+            [],
+            ['cache', 'hits', 'misses', 'rate'],
+            ['late', '1', '1', '50.0%'],
+            ['other', '0', '0', '0.0%'],
+        ]
@@ -0,0 +1,83 @@
+from __future__ import absolute_import, division, print_function, unicode_literals  # isort:skip # noqa
+
+import unittest
+from typing import Dict, List, Optional
+
+from ..base import OptionalMember
+from ..references import (
+    ReferenceGraph,
+    dependency_graph,
+    referenced_names,
+    tree_shake,
+)
+
+# Names are kept in variables, so they aren't mistaken for annotations.
+BOOK = 'Book'
+TAG = 'Tag'
+
+PYTHON_TYPES = [
+    ('Book', {'author': 'Author', 'tags': List[TAG]}),
+    ('Author', {'name': str, 'books': 'Book[]'}),
+    ('Tag', {'name': str}),
+    ('Shelf', {'books': Dict[str, Optional[BOOK]]}),
+    ('Colour', ('"red"', '"blue"')),
+    ('Paint', {'colour': OptionalMember('Colour')}),
+]
+
+
+class ReferencesTestCase(unittest.TestCase):
+    def test_referenced_names(self):
+        assert referenced_names({
+            'a': 'Book[]',
+            'b': Optional[List[TAG]],
+            'c': int,
+        }) == {'Book', 'Tag'}
+        assert referenced_names(('Book', 'Tag | Shelf')) == {
+            'Book',
+            'Shelf',
+            'Tag',
+        }
+
+    def test_dependency_graph(self):
+        assert dependency_graph(PYTHON_TYPES + [
+            ('Node', {'children': 'Node[]', 'other': 'Unknown'}),
+        ]) == {
+            'Author': ['Book'],
+            'Book': ['Author', 'Tag'],
+            'Colour': [],
+            'Node': [],
+            'Paint': ['Colour'],
+            'Shelf': ['Book'],
+            'Tag': [],
+        }
+
+        with self.assertRaises(ValueError):
+            dependency_graph([('Tag', {}), ('Tag', {})])
+
+    def test_reference_graph(self):
+        graph = ReferenceGraph(PYTHON_TYPES)
+
+        assert graph.references('Book') == ['Author', 'Tag']
+        assert graph.dependents('Book') == ['Author', 'Shelf']
+        assert graph.dependents('Tag') == ['Book']
+        assert graph.dependents('Paint') == []
+        assert graph.reachable(['Shelf']) == {'Author', 'Book', 'Shelf', 'Tag'}
+        assert graph.reachable(['Paint', 'Tag']) == {'Colour', 'Paint', 'Tag'}
+        assert graph.affected(['Tag']) == {'Author', 'Book', 'Shelf', 'Tag'}
+        assert graph.affected(['Colour']) == {'Colour', 'Paint'}
+
+        for method in (graph.references, graph.dependents):
+            with self.assertRaises(ValueError):
+                method('Unknown')
+
+        for method in (graph.reachable, graph.affected):
+            with self.assertRaises(ValueError):
+                method(['Unknown'])
+
+    def test_tree_shake(self):
+        assert tree_shake(iter(PYTHON_TYPES), ['Paint', 'Tag']) == [
+            ('Tag', {'name': str}),
+            ('Colour', ('"red"', '"blue"')),
+            ('Paint', {'colour': OptionalMember('Colour')}),
+        ]
+        assert tree_shake(PYTHON_TYPES, []) == []
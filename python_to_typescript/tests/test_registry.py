@@ -0,0 +1,86 @@
+from __future__ import absolute_import, division, print_function, unicode_literals  # isort:skip # noqa
+
+import unittest
+from collections import OrderedDict
+from typing import Mapping
+
+from ..registry import TypeRegistry
+
+
+class Base(object):
+    pass
+
+
+class Child(Base):
+    pass
+
+
+class GrandChild(Child):
+    pass
+
+
+class TypeRegistryTestCase(unittest.TestCase):
+    def test_handlers_are_found_through_the_mro(self):
+        registry = TypeRegistry()
+        registry.register(Base, 'base')
+        registry.register(Child, 'child')
+
+        assert Base in registry
+        assert registry.resolve(Base) == 'base'
+        assert registry.resolve(Child) == 'child'
+        assert registry.resolve(GrandChild) == 'child'
+        assert registry.resolve(int) is None
+        assert registry.resolve(int, 'default') == 'default'
+
+    def test_abstract_base_classes_are_checked_with_issubclass(self):
+        registry = TypeRegistry()
+        registry.register(Mapping, 'mapping')
+
+        assert registry.resolve(OrderedDict) == 'mapping'
+        # Objects which aren't classes can be used as keys too.
+        assert registry.resolve('not a class') is None
+
+    def test_registering_handlers_resets_resolved_handlers(self):
+        registry = TypeRegistry()
+        registry.register(Base, 'base')
+
+        assert registry.resolve(GrandChild) == 'base'
+
+        registry.register(GrandChild, 'grandchild')
+
+        assert registry.resolve(GrandChild) == 'grandchild'
+
+        registry.unregister(GrandChild)
+        registry.unregister(GrandChild)
+
+        assert registry.resolve(GrandChild) == 'base'
+        assert registry.generation == 3
+
+        registry.register_predicate(bool, 'any class')
+
+        assert registry.generation == 4
+
+    def test_predicates_are_checked_before_the_mro(self):
+        registry = TypeRegistry()
+        registry.register(Base, 'base')
+        registry.register_predicate(
+            lambda cls: cls.__name__.startswith('Grand'),
+            'grand',
+        )
+
+        assert registry.resolve(Child) == 'base'
+        assert registry.resolve(GrandChild) == 'grand'
+
+    def test_handlers_for_classes_matching_predicates_win(self):
+        registry = TypeRegistry()
+        registry.register_predicate(
+            lambda cls: issubclass(cls, Child),
+            'child',
+        )
+        registry.register(Child, 'registered child')
+
+        assert registry.resolve(GrandChild) == 'registered child'
+
+        registry.register(GrandChild, 'registered grandchild')
+
+        assert registry.resolve(GrandChild) == 'registered grandchild'
@@ -0,0 +1,130 @@
+from __future__ import absolute_import, division, print_function, unicode_literals  # isort:skip # noqa
+
+import os
+import shutil
+import sys
+import tempfile
+import types
+import unittest
+
+from .. import schema_store
+from ..cache import CacheInfo
+from ..drf import (
+    SerializerSchema,
+    clear_serializer_cache,
+    generate_interfaces_from_serializers,
+    serializer_schema,
+)
+from ..schema_store import SchemaStore, qualified_name
+from .example_serializers import BookSerializer, TagSerializer
+
+
+class SchemaStoreTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'schemas.sqlite3')
+        clear_serializer_cache()
+
+    def tearDown(self):
+        store = schema_store.disable()
+
+        if store is not None:
+            store.close()
+
+        clear_serializer_cache()
+        shutil.rmtree(self.directory)
+        sys.modules.pop('schema_store_example', None)
+
+    def test_qualified_name(self):
+        assert qualified_name(BookSerializer) == \
+            'python_to_typescript.tests.example_serializers:BookSerializer'
+
+    def test_schemas_are_reused_between_runs(self):
+        # pylint: disable=protected-access
+        expected = generate_interfaces_from_serializers([BookSerializer])
+        store = schema_store.enable(self.path)
+
+        assert schema_store._active_info() == CacheInfo(0, 0, None, None)
+
+        clear_serializer_cache()
+
+        assert generate_interfaces_from_serializers([BookSerializer]) == \
+            expected
+        assert store.info() == CacheInfo(0, 3, None, None)
+
+        # A later run opens the same file.
+        schema_store.disable().close()
+        store = schema_store.enable(self.path)
+        clear_serializer_cache()
+
+        assert generate_interfaces_from_serializers([BookSerializer]) == \
+            expected
+        assert schema_store._active_info() == CacheInfo(3, 0, None, None)
+        assert serializer_schema(BookSerializer).nested_serializers == (
+            sys.modules[BookSerializer.__module__].AuthorSerializer,
+        )
+
+    def test_schemas_for_changed_files_are_not_reused(self):
+        source_path = os.path.join(self.directory, 'example.py')
+        module = types.ModuleType(str('schema_store_example'))
+        module.__file__ = source_path
+        sys.modules['schema_store_example'] = module
+
+        class Model(object):
+            pass
+
+        class ExampleSerializer(object):
+            class Meta:
+                model = Model
+
+        Model.__module__ = 'schema_store_example'
+        ExampleSerializer.__module__ = 'schema_store_example'
+        schema = SerializerSchema('Example', {'name': str}, ())
+
+        with open(source_path, 'w') as source_file:
+            source_file.write('name = 1\n')
+
+        with SchemaStore(self.path) as store:
+            fingerprint = store.fingerprint(ExampleSerializer)
+            store.set(ExampleSerializer, schema)
+
+            assert store.get(ExampleSerializer) == schema
+            assert store.fingerprint(ExampleSerializer) == fingerprint
+
+            with open(source_path, 'w') as source_file:
+                source_file.write('name = 22\n')
+
+            assert store.fingerprint(ExampleSerializer) != fingerprint
+            assert store.get(ExampleSerializer) is None
+
+            os.remove(source_path)
+
+            assert store.get(ExampleSerializer) is None
+
+    def test_unpicklable_and_invalid_schemas(self):
+        # pylint: disable=protected-access
+        with SchemaStore(self.path) as store:
+            store.set(TagSerializer, SerializerSchema(
+                'Tag',
+                {'name': lambda: None},
+                (),
+            ))
+
+            assert store.get(TagSerializer) is None
+
+            store.set(TagSerializer, serializer_schema(TagSerializer))
+            store._connection.execute(
+                'UPDATE serializer_schema SET data = ?',
+                (store._binary(b'not a pickle'),),
+            )
+
+            assert store.get(TagSerializer) is None
+
+            store.set(TagSerializer, serializer_schema(TagSerializer))
+
+            assert store.get(TagSerializer) == serializer_schema(TagSerializer)
+
+            store.clear()
+
+            assert store.get(TagSerializer) is None
+            assert store.info() == CacheInfo(1, 3, None, None)
@@ -0,0 +1,120 @@
+from __future__ import absolute_import, division, print_function, unicode_literals  # isort:skip # noqa
+
+import unittest
+from textwrap import dedent
+from typing import Dict, List, Optional, Union
+
+from .. import ir
+from ..base import OptionalMember, RenderOptions, type_node
+from ..sharding import generate_shards, plan_shards
+
+# Names are kept in variables, so they aren't mistaken for annotations.
+BOOK = 'Book'
+TAG = 'Tag'
+
+PYTHON_TYPES = [
+    ('Book', {'author': 'Author', 'tags': List[TAG]}),
+    ('Author', {'name': str, 'books': 'Book[]'}),
+    ('Tag', {'name': str}),
+    ('Shelf', {'books': Dict[str, Optional[BOOK]]}),
+    ('Colour', ('"red"', '"blue"')),
+    ('Paint', {'colour': OptionalMember('Colour')}),
+]
+
+
+class ShardingTestCase(unittest.TestCase):
+    def test_plans_do_not_depend_on_input_order(self):
+        plan = plan_shards(PYTHON_TYPES, max_bytes=110)
+
+        assert plan == plan_shards(reversed(PYTHON_TYPES), max_bytes=110)
+        # The cluster for Author is too big to fit in one shard, and the
+        # cluster for Colour starts a new one.
+        assert list(plan.items()) == [
+            ('types', ['Author', 'Book']),
+            ('types-2', ['Shelf', 'Tag']),
+            ('types-3', ['Colour', 'Paint']),
+        ]
+
+    def test_plans_with_keys(self):
+        modules = {
+            'Author': 'people',
+            'Book': 'books',
+            'Shelf': 'books',
+            'Tag': 'books',
+            'Colour': 'paint',
+            'Paint': 'paint',
+        }
+
+        assert list(plan_shards(PYTHON_TYPES, modules.get).items()) == [
+            ('books', ['Book', 'Shelf', 'Tag']),
+            ('paint', ['Colour', 'Paint']),
+            ('people', ['Author']),
+        ]
+
+    def test_generate_shards(self):
+        modules = {
+            'Author': 'people',
+            'Book': 'books',
+            'Shelf': 'books',
+            'Tag': 'tags',
+            'Colour': 'paint',
+            'Paint': 'paint',
+        }
+        files = generate_shards(PYTHON_TYPES, modules.get, indentation=4)
+
+        assert list(files) == [
+            'books.ts',
+            'paint.ts',
+            'people.ts',
+            'tags.ts',
+        ]
+        assert files['books.ts'] == dedent("""\
+        import type { Author } from './people'
+        import type { Tag } from './tags'
+
+        export interface Book {
+            author: Author
+            tags: Tag[]
+        }
+
+        export interface Shelf {
+            books: {[key: string]: Book | null}
+        }
+        """)
+        assert files['paint.ts'] == dedent("""\
+        export type Colour = "blue" | "red"
+
+        export interface Paint {
+            colour: Colour
+        }
+        """)
+        assert files['people.ts'] == dedent("""\
+        import type { Book } from './books'
+
+        export interface Author {
+            books: Book[]
+            name: string
+        }
+        """)
+
+    def test_wide_unions_are_written_in_each_file_using_them(self):
+        wide_type = Union[int, str, bool]
+        alias_name = ir.alias_name(type_node(wide_type))
+        modules = {'First': 'first', 'Second': 'second'}
+        files = generate_shards(
+            [('First', {'a': wide_type}), ('Second', {'b': wide_type})],
+            modules.get,
+            options=RenderOptions(max_union_width=2),
+        )
+
+        assert files['first.ts'] == dedent("""\
+        export interface First {{
+          a: {0}
+        }}
+
+        export type {0} = boolean | number | string
+        """.format(alias_name))
+        assert files['second.ts'] == files['first.ts'].replace(
+            'First {\n  a',
+            'Second {\n  b',
+        )
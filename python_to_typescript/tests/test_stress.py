@@ -0,0 +1,215 @@
+"""
+Stress tests for large inputs, with limits on time and memory.
+
+These tests are slow, and are deselected unless they are selected with
+`pytest -m stress`.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals  # isort:skip # noqa
+
+import unittest
+from typing import Dict, List, Optional
+
+import pytest
+from rest_framework.serializers import CharField, IntegerField, Serializer
+
+from .. import ir
+from ..base import generate_interfaces, type_name
+from ..drf import clear_serializer_cache, generate_interfaces_from_serializers
+from ..profiling import timer
+
+try:
+    import tracemalloc
+except ImportError:  # pragma: no cover
+    tracemalloc = None
+
+MEGABYTE = 1024 * 1024
+
+
+def _clear_caches():
+    type_name.cache_clear()
+    clear_serializer_cache()
+
+
+def _nested_type(depth):
+    # Alternate between lists and optional dictionaries, so each level
+    # has a union inside of it.
+    some_type = int
+
+    for level in range(depth):
+        some_type = (
+            List[some_type]
+            if level % 2 else
+            Optional[Dict[str, some_type]]
+        )
+
+    return some_type
+
+
+def _serializer_chain(length, field_count):
+    # Each serializer nests the one before it.
+    serializer_classes = []
+
+    for index in range(length):
+        attributes = {
+            'field_{}'.format(field_index): CharField()
+            for field_index in range(field_count)
+        }
+
+        if serializer_classes:
+            attributes['previous'] = serializer_classes[-1]()
+
+        serializer_classes.append(type(
+            str('Chain{}Serializer'.format(index)),
+            (Serializer,),
+            attributes,
+        ))
+
+    return serializer_classes
+
+
+@pytest.mark.stress
+@unittest.skipIf(tracemalloc is None, 'tracemalloc is not available')
+class StressTestCase(unittest.TestCase):
+    def setUp(self):
+        _clear_caches()
+
+    def tearDown(self):
+        _clear_caches()
+
+    def assert_within_budget(self, func, seconds, megabytes):
+        """
+        Call a function twice with empty caches, once to time it, and once
+        to measure its peak memory use, as tracing memory slows it down.
+        """
+        start = timer()
+        result = func()
+        elapsed = timer() - start
+        _clear_caches()
+
+        tracemalloc.start()
+
+        try:
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert elapsed < seconds, \
+            'Took {:.3f} seconds, over the {} second budget'.format(
+                elapsed,
+                seconds,
+            )
+        assert peak < megabytes * MEGABYTE, \
+            'Used {:.1f} MB at peak, over the {} MB budget'.format(
+                peak / MEGABYTE,
+                megabytes,
+            )
+
+        return result
+
+    def test_deeply_nested_types(self):
+        result = self.assert_within_budget(
+            lambda: type_name(_nested_type(50)),
+            seconds=1,
+            megabytes=10,
+        )
+
+        assert result.count('[]') == 25
+        assert result.count('{[key: string]: ') == 25
+
+    def test_deeply_nested_lists(self):
+        some_type = int
+
+        for _ in range(50):
+            some_type = List[some_type]
+
+        assert self.assert_within_budget(
+            lambda: type_name(some_type),
+            seconds=1,
+            megabytes=10,
+        ) == 'number' + '[]' * 50
+
+    def test_wide_unions(self):
+        literals = [
+            ir.literal('value {}'.format(index))
+            for index in range(500)
+        ]
+
+        result = self.assert_within_budget(
+            lambda: type_name(tuple(reversed(literals))),
+            seconds=1,
+            megabytes=10,
+        )
+
+        assert result.split(' | ') == sorted(
+            ir.render(literal)
+            for literal in literals
+        )
+
+    def test_many_interfaces(self):
+        count = 10000
+        names = ['Interface{}'.format(index) for index in range(count)]
+        python_types = [
+            (names[index], {
+                'count': int,
+                'next': names[(index + 1) % count],
+                'others': List[names[index * 7 % count]],
+                'label': Optional[str],
+                'colour': ('"red"', '"blue"'),
+            })
+            for index in range(count)
+        ]
+
+        output = self.assert_within_budget(
+            lambda: generate_interfaces(python_types),
+            seconds=5,
+            megabytes=50,
+        )
+
+        assert output.count('interface ') == count
+
+    def test_interfaces_with_many_fields(self):
+        python_types = [('Wide', {
+            'field_{}'.format(index): (
+                int,
+                str,
+                List[int],
+                'Name{}'.format(index),
+            )
+            for index in range(500)
+        })]
+
+        output = self.assert_within_budget(
+            lambda: generate_interfaces(python_types),
+            seconds=1,
+            megabytes=10,
+        )
+
+        assert output.count('\n  ') == 500
+
+    def test_many_nested_serializers(self):
+        serializer_classes = _serializer_chain(1000, 10)
+
+        output = self.assert_within_budget(
+            lambda: generate_interfaces_from_serializers(
+                serializer_classes[-1:],
+            ),
+            seconds=5,
+            megabytes=50,
+        )
+
+        assert output.count('interface ') == 1000
+
+    def test_serializers_with_many_fields(self):
+        serializer_class = type(str('WideSerializer'), (Serializer,), {
+            'field_{}'.format(index): IntegerField()
+            for index in range(500)
+        })
+
+        output = self.assert_within_budget(
+            lambda: generate_interfaces_from_serializers([serializer_class]),
+            seconds=1,
+            megabytes=20,
+        )
+
+        assert output.count(': number\n') == 500
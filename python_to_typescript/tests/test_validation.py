@@ -0,0 +1,220 @@
+from __future__ import absolute_import, division, print_function, unicode_literals  # isort:skip # noqa
+
+import random
+import unittest
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from .. import ir
+from ..base import OptionalMember
+from ..drf import compile_validators_from_serializers
+from ..validation import compile_validators
+from .example_serializers import BookSerializer
+
+# Names are kept in variables, so they aren't mistaken for annotations.
+NODE = 'Node'
+TAG = 'Tag'
+
+STATUS = ir.union([ir.literal('open'), ir.literal('closed')])
+
+
+class ValidationTestCase(unittest.TestCase):
+    def test_primitive_fields(self):
+        validator = compile_validators([('Thing', {
+            'flag': bool,
+            'count': int,
+            'name': str,
+            'nothing': None,
+            'anything': Any,
+            'data': dict,
+        })])['Thing']
+
+        assert validator.errors([
+            {
+                'flag': True,
+                'count': 1.5,
+                'name': 'x',
+                'nothing': None,
+                'anything': object(),
+                'data': {},
+            },
+            {
+                'flag': 1,
+                'count': True,
+                'name': b'x' if str is not bytes else 1,
+                'nothing': 0,
+                'anything': None,
+                'data': 'x',
+            },
+            [],
+        ]) == [
+            (1, 'count'),
+            (1, 'data'),
+            (1, 'flag'),
+            (1, 'name'),
+            (1, 'nothing'),
+            (2, None),
+        ]
+
+    def test_subclasses_of_primitive_types(self):
+        class Text(str):
+            pass
+
+        class Flag(int):
+            pass
+
+        validator = compile_validators([('Thing', {
+            'name': str,
+            'count': int,
+            'flag': bool,
+            'data': dict,
+        })])['Thing']
+
+        assert validator.is_valid([{
+            'name': Text('x'),
+            'count': Flag(1),
+            'flag': False,
+            'data': OrderedDict(),
+        }])
+
+    def test_missing_and_optional_fields(self):
+        validator = compile_validators([('Thing', {
+            'a': int,
+            'b': OptionalMember(int),
+            'c': Optional[int],
+        })])['Thing']
+
+        assert validator.errors([
+            {'a': 1, 'c': None},
+            {'a': 1, 'b': 'x', 'c': 2},
+            {'b': 2},
+            {'a': 1, 'b': 2, 'c': 3},
+        ]) == [(1, 'b'), (2, 'a'), (2, 'c')]
+
+    def test_nested_types(self):
+        validators = compile_validators([
+            ('Book', {
+                'tags': List[TAG],
+                'ratings': Dict[str, int],
+                'point': Tuple[int, str],
+                'grid': List[List[int]],
+                'status': STATUS,
+                'other': 'Unknown',
+            }),
+            ('Tag', {'name': str}),
+        ])
+
+        assert validators['Book'].errors([
+            {
+                'tags': [{'name': 'a'}, {'name': 'b'}],
+                'ratings': {'x': 1},
+                'point': [1, 'x'],
+                'grid': [[1, 2], [3]],
+                'status': 'open',
+                'other': object(),
+            },
+            {
+                'tags': [{'name': 'a'}, {'name': 1}],
+                'ratings': {'x': 'y'},
+                'point': [1, 2],
+                'grid': [[1], ['x']],
+                'status': 'other',
+                'other': None,
+            },
+            {
+                'tags': 'a',
+                'ratings': [],
+                'point': [1],
+                'grid': [1],
+                'status': True,
+                'other': 1,
+            },
+        ]) == [
+            (1, 'grid'),
+            (1, 'point'),
+            (1, 'ratings'),
+            (1, 'status'),
+            (1, 'tags'),
+            (2, 'grid'),
+            (2, 'point'),
+            (2, 'ratings'),
+            (2, 'status'),
+            (2, 'tags'),
+        ]
+        assert validators['Tag']([{'name': 'a'}, None]) == [1]
+
+    def test_unions_with_other_types(self):
+        validator = compile_validators([
+            ('Value', (int, 'Tag', List[int])),
+            ('Tag', {'name': str}),
+            ('Literal', ir.union([ir.literal(1), ir.literal(True)])),
+            ('Anything', (int, 'Unknown')),
+        ])
+
+        assert validator['Value'].errors([
+            1,
+            {'name': 'x'},
+            [1, 2],
+            {'name': 1},
+            ['x'],
+            'x',
+        ]) == [(3, None), (4, None), (5, None)]
+        assert validator['Value'].is_valid([1, 2])
+        assert validator['Literal'].errors([1, True, 1.0, 2, False, '1']) == [
+            (3, None),
+            (4, None),
+            (5, None),
+        ]
+        assert validator['Anything'].is_valid(['x', None])
+        assert compile_validators([('Anything', Any)])['Anything'].is_valid([
+            None,
+        ])
+
+    def test_recursive_interfaces(self):
+        validator = compile_validators([
+            ('Node', {'children': List[NODE], 'value': int}),
+        ])['Node']
+
+        assert validator.errors([
+            {'value': 1, 'children': [
+                {'value': 2, 'children': []},
+                {'value': 3, 'children': [{'value': 'x', 'children': []}]},
+            ]},
+            {'value': 4, 'children': []},
+        ]) == [(0, 'children')]
+
+    def test_sampling(self):
+        validator = compile_validators([('Thing', {'a': int})])['Thing']
+        records = [{'a': 1}] * 50 + [{'a': 'x'}] * 50
+        random.seed(0)
+        errors = validator.errors(records, sample_size=10)
+
+        assert len(errors) <= 10
+        assert all(index >= 50 for index, _ in errors)
+        assert validator.errors(records[:3], sample_size=10) == []
+        assert not validator.is_valid(records, sample_size=100)
+
+        type_validator = compile_validators([('A', int)])['A']
+        random.seed(0)
+        errors = type_validator.errors([1] * 50 + ['x'] * 50, sample_size=10)
+
+        assert len(errors) <= 10
+        assert all(index >= 50 for index, _ in errors)
+        assert type_validator.is_valid([1, 2, 3])
+
+    def test_serializer_validators(self):
+        validators = compile_validators_from_serializers([BookSerializer])
+
+        assert sorted(validators) == ['Author', 'Book', 'Tag']
+        assert validators['Book'].errors([
+            {
+                'title': 'A',
+                'pages': 1,
+                'author': {'name': 'B', 'tags': [{'name': 'C'}]},
+            },
+            {
+                'title': 'A',
+                'pages': 1,
+                'author': {'name': 'B', 'tags': [{}]},
+            },
+        ]) == [(1, 'author')]
@@ -0,0 +1,267 @@
+from __future__ import absolute_import, division, print_function, unicode_literals  # isort:skip # noqa
+
+import importlib
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from textwrap import dedent
+
+from six import StringIO
+
+from .. import watch
+from ..cli import _argument_parser, main
+from ..incremental import InterfaceManifest, read_file
+from ..watch import (
+    ModuleWatcher,
+    affected_modules,
+    regenerate,
+    reload_modules,
+    stale_modules,
+    watch_outputs,
+)
+
+TYPES_SOURCE = """\
+TYPESCRIPT_INTERFACES = [('Watched', {{'value': {}}})]
+"""
+
+USER_SOURCE = """\
+import watched_types
+"""
+
+ALIAS_SOURCE = """\
+from watched_types import TYPESCRIPT_INTERFACES
+"""
+
+SERIALIZERS_SOURCE = """\
+from rest_framework.serializers import CharField, Serializer
+
+
+class WatchedSerializer(Serializer):
+    name = CharField()
+"""
+
+ROOT_SOURCE = """\
+TYPESCRIPT_INTERFACES = [('Root', {'watched': 'Watched'})]
+"""
+
+BASE_SOURCE = """\
+import watched_types
+
+
+class Base(object):
+    value_type = watched_types.TYPESCRIPT_INTERFACES[0][1]['value']
+"""
+
+CHILD_SOURCE = """\
+from watched_base import Base
+
+TYPESCRIPT_INTERFACES = [('Child', {'value': Base.value_type})]
+"""
+
+MODULE_NAMES = [
+    'watched_types',
+    'watched_user',
+    'watched_alias',
+    'watched_serializers',
+]
+
+
+class WatchModeTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.output_directory = os.path.join(self.directory, 'output')
+        self.stderr = sys.stderr
+        sys.stderr = StringIO()
+        sys.path.insert(0, self.directory)
+        self.write_module('watched_types', TYPES_SOURCE.format('int'))
+        self.write_module('watched_user', USER_SOURCE)
+        self.write_module('watched_alias', ALIAS_SOURCE)
+        self.write_module('watched_serializers', SERIALIZERS_SOURCE)
+        importlib.import_module('watched_user')
+        importlib.import_module('watched_alias')
+        importlib.import_module('watched_serializers')
+
+    def tearDown(self):
+        sys.stderr = self.stderr
+        sys.path.remove(self.directory)
+
+        for module_name in MODULE_NAMES:
+            sys.modules.pop(module_name, None)
+        shutil.rmtree(self.directory)
+
+    def write_module(self, module_name, source, age=100):
+        path = os.path.join(self.directory, module_name + '.py')
+
+        with open(path, 'w') as source_file:
+            source_file.write(source)
+
+        # Set the modification time explicitly, so changes are always seen.
+        mtime = time.time() - age
+        os.utime(path, (mtime, mtime))
+
+    def test_polling_for_changes(self):
+        watcher = ModuleWatcher(self.directory)
+
+        assert watcher.poll() == []
+
+        self.write_module('watched_types', TYPES_SOURCE.format('str'), 50)
+
+        assert watcher.poll() == ['watched_types']
+        assert watcher.poll() == []
+
+        os.remove(os.path.join(self.directory, 'watched_types.py'))
+
+        assert watcher.poll() == []
+
+    def test_affected_modules(self):
+        assert affected_modules(['watched_types'], MODULE_NAMES) == [
+            'watched_types',
+            'watched_user',
+            'watched_alias',
+        ]
+        assert affected_modules(['os'], MODULE_NAMES) == []
+
+    def import_base_and_child(self):
+        self.write_module('watched_base', BASE_SOURCE)
+        self.write_module('watched_child', CHILD_SOURCE)
+
+        for module_name in ('watched_base', 'watched_child'):
+            self.addCleanup(sys.modules.pop, module_name, None)
+
+        importlib.import_module('watched_child')
+
+    def test_modules_using_changed_modules_through_other_modules(self):
+        self.import_base_and_child()
+
+        # The child only uses the changed module through the base module.
+        assert affected_modules(['watched_types'], ['watched_child']) == []
+        assert affected_modules(
+            ['watched_types'],
+            ['watched_child'],
+            ['watched_base'],
+        ) == ['watched_child']
+        assert stale_modules(
+            ['watched_types'],
+            ['watched_child', 'watched_base', 'watched_user', 'nope'],
+        ) == ['watched_types', 'watched_base', 'watched_child', 'watched_user']
+
+    def test_reload_modules(self):
+        self.write_module('watched_types', TYPES_SOURCE.format('str'))
+        reload_modules(MODULE_NAMES)
+
+        assert sys.modules['watched_alias'].TYPESCRIPT_INTERFACES == [
+            ('Watched', {'value': str}),
+        ]
+
+    def test_regenerate(self):
+        options = _argument_parser().parse_args([
+            'watched_types',
+            'watched_serializers',
+            '--output-dir',
+            self.output_directory,
+        ])
+        watcher = ModuleWatcher(self.directory)
+        manifest = InterfaceManifest()
+
+        assert regenerate(options, watcher, manifest, options.modules) == []
+
+        self.write_module('watched_types', TYPES_SOURCE.format('str'), 50)
+        path = os.path.join(self.output_directory, 'watched_types.ts')
+
+        assert regenerate(options, watcher, manifest, options.modules) == [
+            path,
+        ]
+        assert read_file(path) == dedent("""\
+        interface Watched {
+          value: string
+        }
+        """)
+        assert sys.stderr.getvalue() == 'Updated {}\n'.format(path)
+
+    def test_regenerate_through_other_modules(self):
+        self.import_base_and_child()
+        options = _argument_parser().parse_args([
+            'watched_child',
+            '--output-dir',
+            self.output_directory,
+        ])
+        watcher = ModuleWatcher(self.directory)
+        manifest = InterfaceManifest()
+        self.write_module('watched_types', TYPES_SOURCE.format('str'), 50)
+        path = os.path.join(self.output_directory, 'watched_child.ts')
+
+        assert regenerate(options, watcher, manifest, options.modules) == [
+            path,
+        ]
+        assert read_file(path) == dedent("""\
+        interface Child {
+          value: string
+        }
+        """)
+
+    def test_regenerate_with_roots(self):
+        self.write_module('watched_root', ROOT_SOURCE)
+        self.addCleanup(sys.modules.pop, 'watched_root', None)
+        importlib.import_module('watched_root')
+        options = _argument_parser().parse_args([
+            'watched_types',
+            'watched_root',
+            '--output-dir',
+            self.output_directory,
+            '--root',
+            'Root',
+        ])
+        watcher = ModuleWatcher(self.directory)
+        manifest = InterfaceManifest()
+        self.write_module('watched_types', TYPES_SOURCE.format('str'), 50)
+        path = os.path.join(self.output_directory, 'watched_types.ts')
+
+        # Only the changed module is written, but the root is found in the
+        # other module.
+        assert regenerate(options, watcher, manifest, options.modules) == [
+            path,
+        ]
+        assert read_file(path) == dedent("""\
+        interface Watched {
+          value: string
+        }
+        """)
+
+    def test_watch_outputs(self):
+        options = _argument_parser().parse_args([
+            'watched_types',
+            '--output-dir',
+            self.output_directory,
+            '--interval',
+            '0',
+        ])
+        watch_outputs(options, options.modules, max_polls=1)
+
+        assert os.path.exists(
+            os.path.join(self.output_directory, 'watched_types.ts'),
+        )
+
+    def test_watch_mode_stops_when_interrupted(self):
+        def interrupt(seconds):
+            raise KeyboardInterrupt
+
+        original_time = watch.time
+        watch.time = type(str('FakeTime'), (object,), {
+            'sleep': staticmethod(interrupt),
+        })
+
+        try:
+            assert main([
+                'watched_types',
+                '-o',
+                os.path.join(self.output_directory, 'types.ts'),
+                '--watch',
+            ]) == 0
+        finally:
+            watch.time = original_time
+
+        with self.assertRaises(SystemExit):
+            main(['watched_types', '--watch'])
@@ -0,0 +1,442 @@
+"""
+Validators for checking that Python data matches generated interfaces,
+such as for checking the responses for REST APIs.
+
+Validators are compiled from the same types interfaces are generated from,
+and check lists of records one column at a time. Each field is checked for
+every record at once with a check compiled for its type, and the values
+inside of arrays and maps are gathered into columns of their own, so the
+tree of types is only walked when validators are compiled.
+
+For example:
+>>> validators = compile_validators([('Book', {'title': str})])
+>>> validators['Book'].errors([{'title': 'A'}, {'title': 1}, {}])
+[(1, 'title'), (2, 'title')]
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals  # isort:skip # noqa
+
+import random
+
+import six
+
+from . import ir
+from .base import NUMBER_TYPES, OptionalMember, is_interface_fields, type_node
+from .registry import TypeRegistry
+
+
+class _Missing(object):
+    """
+    The value for fields missing from records.
+    """
+    __slots__ = ()
+
+
+_MISSING = _Missing()
+
+# Arrays and tuples can be lists or tuples in Python.
+_ARRAY_TYPES = (list, tuple)
+
+# The exact types of values which are always valid for a primitive, and a
+# check for any other values, such as for subclasses.
+_PRIMITIVE_CHECKS = {
+    ir.BOOLEAN: (
+        frozenset([bool]),
+        lambda value: isinstance(value, bool),
+    ),
+    ir.NULL: (
+        frozenset([type(None)]),
+        lambda value: value is None,
+    ),
+    ir.NUMBER: (
+        frozenset(NUMBER_TYPES),
+        lambda value: (
+            isinstance(value, NUMBER_TYPES)
+            and not isinstance(value, bool)
+        ),
+    ),
+    ir.OBJECT: (
+        frozenset([dict, list, tuple]),
+        lambda value: isinstance(value, (dict, list, tuple)),
+    ),
+    ir.STRING: (
+        frozenset(six.string_types),
+        lambda value: isinstance(value, six.string_types),
+    ),
+}
+
+
+def _value_check(fast_types, predicate):
+    # Checking the set of types in a column runs in C, so columns of
+    # values with the expected types are checked without a Python loop.
+    def check(values):
+        if fast_types.issuperset(map(type, values)):
+            return []
+
+        return [
+            index
+            for index, value in enumerate(values)
+            if type(value) not in fast_types and not predicate(value)
+        ]
+
+    check.fast_types = fast_types
+    check.predicate = predicate
+
+    return check
+
+
+def _literal_predicate(literal_value):
+    is_bool = isinstance(literal_value, bool)
+
+    return lambda value: (
+        value == literal_value
+        and isinstance(value, bool) == is_bool
+        and isinstance(value, ir.LITERAL_TYPES)
+    )
+
+
+def _merged_value_check(checks):
+    fast_types = frozenset().union(*(check.fast_types for check in checks))
+    predicates = [check.predicate for check in checks]
+
+    return _value_check(
+        fast_types,
+        lambda value: any(predicate(value) for predicate in predicates),
+    )
+
+
+def _first_positions(positions):
+    # Positions can be found more than once, such as for several items.
+    return sorted(set(positions))
+
+
+class _Compiler(object):
+    """
+    Compile checks for nodes, each taking a list of values and returning
+    the sorted positions of the invalid values. None is used for nodes
+    which accept every value.
+    """
+    def __init__(self, names, validators):
+        self.names = names
+        self.validators = validators
+        self._checks = {}
+
+    def check(self, node):
+        try:
+            return self._checks[node]
+        except KeyError:
+            pass
+
+        check = _node_compilers.resolve(type(node), None)(self, node)
+        self._checks[node] = check
+
+        return check
+
+    def primitive(self, node):
+        if node is ir.ANY:
+            return None
+
+        return _value_check(*_PRIMITIVE_CHECKS[node])
+
+    def literal(self, node):
+        value = node.value
+
+        return _value_check(frozenset(), _literal_predicate(value))
+
+    def reference(self, node):
+        # Names which aren't for any of the types accept every value.
+        if node.name not in self.names:
+            return None
+
+        validators = self.validators
+        name = node.name
+
+        return lambda values: validators[name](values)
+
+    def _items_check(self, item_check, value_types, get_items):
+        def check(values):
+            bad_positions = []
+            owners = []
+            items = []
+
+            for position, value in enumerate(values):
+                if isinstance(value, value_types):
+                    value_items = get_items(value)
+                    owners.extend([position] * len(value_items))
+                    items.extend(value_items)
+                else:
+                    bad_positions.append(position)
+
+            if item_check is not None and items:
+                bad_positions.extend(
+                    owners[item_position]
+                    for item_position in item_check(items)
+                )
+
+            return _first_positions(bad_positions)
+
+        return check
+
+    def array(self, node):
+        return self._items_check(
+            self.check(node.item),
+            _ARRAY_TYPES,
+            lambda value: value,
+        )
+
+    def map(self, node):
+        return self._items_check(
+            self.check(node.value),
+            dict,
+            lambda value: list(six.itervalues(value)),
+        )
+
+    def tuple(self, node):
+        item_checks = [self.check(item) for item in node.items]
+        length = len(item_checks)
+
+        def check(values):
+            bad_positions = []
+            good_positions = []
+
+            for position, value in enumerate(values):
+                if isinstance(value, _ARRAY_TYPES) and len(value) == length:
+                    good_positions.append(position)
+                else:
+                    bad_positions.append(position)
+
+            for index, item_check in enumerate(item_checks):
+                if item_check is not None and good_positions:
+                    bad_positions.extend(
+                        good_positions[item_position]
+                        for item_position in item_check([
+                            values[position][index]
+                            for position in good_positions
+                        ])
+                    )
+
+            return _first_positions(bad_positions)
+
+        return check
+
+    def union(self, node):
+        checks = [self.check(member) for member in node.members]
+
+        if None in checks:
+            return None
+
+        value_checks = [
+            check
+            for check in checks
+            if hasattr(check, 'fast_types')
+        ]
+        other_checks = [
+            check
+            for check in checks
+            if not hasattr(check, 'fast_types')
+        ]
+
+        # Simple members are merged into one check, which runs first.
+        if value_checks:
+            other_checks.insert(0, _merged_value_check(value_checks))
+
+        if len(other_checks) == 1:
+            return other_checks[0]
+
+        def check(values):
+            # Values only have to be checked against the next member if
+            # they didn't match the members before it.
+            positions = list(range(len(values)))
+
+            for member_check in other_checks:
+                positions = [
+                    positions[member_position]
+                    for member_position in member_check([
+                        values[position]
+                        for position in positions
+                    ])
+                ]
+
+                if not positions:
+                    break
+
+            return positions
+
+        return check
+
+
+_node_compilers = TypeRegistry()
+_node_compilers.register(ir.Primitive, _Compiler.primitive)
+_node_compilers.register(ir.Literal, _Compiler.literal)
+_node_compilers.register(ir.Reference, _Compiler.reference)
+_node_compilers.register(ir.Array, _Compiler.array)
+_node_compilers.register(ir.Map, _Compiler.map)
+_node_compilers.register(ir.Tuple, _Compiler.tuple)
+_node_compilers.register(ir.Union, _Compiler.union)
+
+
+def _sample(values, sample_size):
+    if sample_size is None or len(values) <= sample_size:
+        return values, None
+
+    positions = sorted(random.sample(range(len(values)), sample_size))
+
+    return [values[position] for position in positions], positions
+
+
+class InterfaceValidator(object):
+    """
+    Check lists of records against the fields for an interface.
+    """
+    def __init__(self, name, fields):
+        self.name = name
+        # [(field_name, optional, check), ...]
+        self.fields = fields
+
+    def _field_errors(self, records):
+        errors = []
+        rows = []
+        row_positions = []
+
+        for position, record in enumerate(records):
+            if isinstance(record, dict):
+                rows.append(record)
+                row_positions.append(position)
+            else:
+                errors.append((position, None))
+
+        for field_name, optional, check in self.fields:
+            column = [row.get(field_name, _MISSING) for row in rows]
+            present = [
+                position
+                for position, value in enumerate(column)
+                if value is not _MISSING
+            ]
+
+            if len(present) == len(column):
+                present = None
+            else:
+                if not optional:
+                    present_set = set(present)
+                    errors.extend(
+                        (row_positions[position], field_name)
+                        for position in range(len(column))
+                        if position not in present_set
+                    )
+
+                column = [column[position] for position in present]
+
+            if check is not None and column:
+                errors.extend(
+                    (
+                        row_positions[
+                            present[position]
+                            if present is not None else
+                            position
+                        ],
+                        field_name,
+                    )
+                    for position in check(column)
+                )
+
+        errors.sort(key=lambda error: error[0])
+
+        return errors
+
+    def __call__(self, records):
+        return _first_positions(
+            position
+            for position, _ in self._field_errors(records)
+        )
+
+    def errors(self, records, sample_size=None):
+        """
+        Return a list of (index, field_name) pairs for invalid fields in a
+        list of records, sorted by index. The field name is None for
+        records which aren't dictionaries.
+
+        If `sample_size` is given, at most that many records chosen at
+        random are checked, to limit the time spent checking long lists.
+        """
+        records, positions = _sample(records, sample_size)
+        errors = self._field_errors(records)
+
+        if positions is not None:
+            errors = [
+                (positions[position], field_name)
+                for position, field_name in errors
+            ]
+
+        return errors
+
+    def is_valid(self, records, sample_size=None):
+        """
+        Check if every record in a list of records is valid.
+        """
+        return not self.errors(records, sample_size)
+
+
+class TypeValidator(object):
+    """
+    Check lists of values against the type for a type alias.
+    """
+    def __init__(self, name, check):
+        self.name = name
+        self.check = check
+
+    def __call__(self, values):
+        return self.check(values) if self.check is not None else []
+
+    def errors(self, values, sample_size=None):
+        """
+        Return a list of (index, None) pairs for invalid values in a list
+        of values, like InterfaceValidator.errors.
+        """
+        values, positions = _sample(values, sample_size)
+
+        return [
+            (positions[position] if positions is not None else position, None)
+            for position in self(values)
+        ]
+
+    def is_valid(self, values, sample_size=None):
+        """
+        Check if every value in a list of values is valid.
+        """
+        return not self.errors(values, sample_size)
+
+
+def compile_validators(python_types):
+    """
+    Compile validators for python types in the format generate_interfaces
+    accepts, and return a dictionary mapping names to InterfaceValidators,
+    or to TypeValidators for type aliases.
+
+    Members which are OptionalMembers can be left out of records. Names
+    for types which aren't in python_types accept any value.
+    """
+    python_types = list(python_types)
+    validators = {}
+    compiler = _Compiler(
+        {name for name, _ in python_types},
+        validators,
+    )
+
+    for name, type_or_fields in python_types:
+        if is_interface_fields(type_or_fields):
+            validators[name] = InterfaceValidator(name, [
+                (
+                    field_name,
+                    isinstance(type_or_tuple, OptionalMember),
+                    compiler.check(type_node(type_or_tuple)),
+                )
+                for field_name, type_or_tuple in sorted(
+                    six.iteritems(type_or_fields),
+                )
+            ])
+        else:
+            validators[name] = TypeValidator(
+                name,
+                compiler.check(type_node(type_or_fields)),
+            )
+
+    return validators
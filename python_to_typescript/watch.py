@@ -0,0 +1,292 @@
+"""
+A watch mode which keeps modules loaded, and regenerates TypeScript files
+when the source files for modules change.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals  # isort:skip # noqa
+
+import os
+import sys
+import time
+import types
+
+import six
+from six.moves import reload_module
+
+from .discovery import module_serializers
+from .incremental import InterfaceManifest
+
+
+def _source_path(module):
+    path = getattr(module, '__file__', None)
+
+    if not path:
+        return None
+
+    # Python 2 sets __file__ to the compiled file.
+    if path.endswith(('.pyc', '.pyo')):  # pragma: no cover
+        path = path[:-1]
+
+    return os.path.abspath(path)
+
+
+class ModuleWatcher(object):
+    """
+    Poll the source files for loaded modules under a root directory for
+    changes, without any services outside of the process.
+    """
+    def __init__(self, root):
+        self.root = os.path.join(os.path.abspath(root), '')
+        self._file_stats = {}
+        self.poll()
+
+    def _watched_modules(self):
+        for module_name, module in list(sys.modules.items()):
+            path = _source_path(module) if module is not None else None
+
+            if path is not None and path.startswith(self.root):
+                yield module_name, path
+
+    def module_names(self):
+        """
+        Return a sorted list of the names of the loaded modules under the
+        root directory.
+        """
+        return sorted(
+            module_name for module_name, _ in self._watched_modules()
+        )
+
+    def poll(self):
+        """
+        Return a sorted list of the names of modules which have changed
+        since the last poll. Modules loaded since the last poll are
+        remembered, but not reported as changed.
+        """
+        changed_module_names = []
+
+        for module_name, path in self._watched_modules():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+
+            file_stat = (stat.st_mtime, stat.st_size)
+            old_file_stat = self._file_stats.get(module_name)
+            self._file_stats[module_name] = file_stat
+
+            if old_file_stat is not None and old_file_stat != file_stat:
+                changed_module_names.append(module_name)
+
+        return sorted(changed_module_names)
+
+
+# Values of these types are often shared between modules by accident.
+_IMMUTABLE_TYPES = (
+    type(None),
+    bool,
+    float,
+    six.binary_type,
+    six.text_type,
+) + six.integer_types
+
+
+def _public_values(module):
+    return (
+        value
+        for name, value in six.iteritems(vars(module))
+        if not name.startswith('__')
+    )
+
+
+def _refers_to_modules(value, module_names, shared_value_ids):
+    if isinstance(value, types.ModuleType):
+        return value.__name__ in module_names
+
+    return (
+        getattr(value, '__module__', None) in module_names
+        or id(value) in shared_value_ids
+    )
+
+
+def _shared_value_ids(module_names):
+    return {
+        id(value)
+        for module_name in module_names
+        for value in _public_values(sys.modules[module_name])
+        if not isinstance(value, _IMMUTABLE_TYPES)
+    }
+
+
+def _uses_modules(module_name, module_names, shared_value_ids):
+    return any(
+        _refers_to_modules(value, module_names, shared_value_ids)
+        for value in _public_values(sys.modules[module_name])
+    )
+
+
+def stale_modules(changed_module_names, loaded_module_names):
+    """
+    Return the changed module names, and the names from
+    `loaded_module_names` for modules which use something from one of the
+    changed modules, such as a class or a list imported from them, or
+    which use something from a module which does. Modules come after the
+    modules they use, so they can be reloaded in order.
+    """
+    # Modules are found in rounds, through the modules found in the round
+    # before, which tells which way values shared by modules were passed.
+    rounds = {module_name: 0 for module_name in changed_module_names}
+    new_module_names = set(rounds)
+    other_module_names = set(
+        module_name
+        for module_name in loaded_module_names
+        if module_name in sys.modules
+    ) - new_module_names
+
+    round_number = 0
+
+    while new_module_names:
+        round_number += 1
+        shared_value_ids = _shared_value_ids(new_module_names)
+        new_module_names = set(
+            module_name
+            for module_name in other_module_names
+            if _uses_modules(module_name, new_module_names, shared_value_ids)
+        )
+        other_module_names -= new_module_names
+
+        for module_name in new_module_names:
+            rounds[module_name] = round_number
+
+    stale_module_names = sorted(rounds)
+    value_ids = {
+        module_name: _shared_value_ids([module_name])
+        for module_name in stale_module_names
+    }
+    ordered_module_names = []
+    visited_module_names = set()
+
+    def visit(module_name):
+        if module_name in visited_module_names:
+            return
+
+        visited_module_names.add(module_name)
+
+        for other_module_name in stale_module_names:
+            if other_module_name != module_name and _uses_modules(
+                module_name,
+                {other_module_name},
+                value_ids[other_module_name]
+                if rounds[other_module_name] < rounds[module_name] else
+                (),
+            ):
+                visit(other_module_name)
+
+        ordered_module_names.append(module_name)
+
+    for module_name in stale_module_names:
+        visit(module_name)
+
+    return ordered_module_names
+
+
+def affected_modules(changed_module_names, module_names,
+                     loaded_module_names=()):
+    """
+    Return the module names from `module_names` which were changed, or
+    which use something from one of the changed modules, such as a class
+    or a list imported from them. Uses through the modules in
+    `loaded_module_names` are followed too, as for stale_modules.
+    """
+    stale_module_names = set(stale_modules(
+        changed_module_names,
+        list(module_names) + list(loaded_module_names),
+    ))
+
+    return [
+        module_name
+        for module_name in module_names
+        if module_name in stale_module_names
+    ]
+
+
+def reload_modules(module_names):
+    """
+    Reload modules in order, forgetting the schemas for serializers which
+    were defined in them.
+    """
+    for module_name in module_names:
+        module = sys.modules[module_name]
+        serializer_classes = module_serializers(module)
+
+        if serializer_classes:
+            from .drf import clear_serializer_cache
+
+            for serializer_class in serializer_classes:
+                clear_serializer_cache(serializer_class)
+
+        reload_module(module)
+
+
+def _log(message):
+    print(message, file=sys.stderr)
+
+
+def regenerate(options, watcher, manifest, module_names):
+    """
+    Reload any changed modules and the modules using them, and rewrite
+    only the outputs for those modules. Return the written paths.
+    """
+    from .cli import render_outputs, write_outputs
+
+    changed_module_names = watcher.poll()
+
+    if not changed_module_names:
+        return []
+
+    # Modules which aren't listed are reloaded too, if they pass on
+    # something from a changed module to a listed module.
+    stale_module_names = stale_modules(
+        changed_module_names,
+        list(module_names) + watcher.module_names(),
+    )
+    reload_modules(stale_module_names)
+    affected_module_names = [
+        module_name
+        for module_name in module_names
+        if module_name in stale_module_names
+    ]
+    written_paths = write_outputs(render_outputs(
+        options,
+        affected_module_names,
+        manifest,
+    ))
+
+    for path in written_paths:
+        _log('Updated {}'.format(path))
+
+    # Remember the files for any modules which were imported again.
+    watcher.poll()
+
+    return written_paths
+
+
+def watch_outputs(options, module_names, max_polls=None):
+    """
+    Write the outputs for parsed command line options, and then keep
+    regenerating them when modules under the current directory change,
+    until interrupted.
+    """
+    from .cli import render_outputs, write_outputs
+
+    manifest = InterfaceManifest()
+    write_outputs(render_outputs(options, module_names, manifest))
+    watcher = ModuleWatcher(os.getcwd())
+    _log('Watching for changes...')
+    polls = 0
+
+    try:
+        while max_polls is None or polls < max_polls:
+            time.sleep(options.interval)
+            polls += 1
+            regenerate(options, watcher, manifest, module_names)
+    except KeyboardInterrupt:
+        pass
@@ -21,6 +21,11 @@ setup(
         'six',
     ],
     packages=find_packages(),
+    entry_points={
+        'console_scripts': [
+            'python-to-typescript = python_to_typescript.cli:main',
+        ],
+    },
     include_package_data=True,
     license='BSD License',
     description='A Python library for generating TypeScript interfaces',